@@ -0,0 +1,82 @@
+"""
+Synthetic OpenAPI documents shared by the benchmark scripts.
+
+The generated specs mimic the shape of the FountainAI service specs: every path has a couple
+of operations with parameters, a JSON request body and responses pointing at component schemas.
+"""
+from typing import Any, Dict
+
+# Number of paths for each named benchmark size
+SIZES = {
+    "small": 10,
+    "medium": 500,
+    "large": 5000,
+}
+
+
+def make_schema(index: int) -> Dict[str, Any]:
+    return {
+        "type": "object",
+        "description": f"Schema number {index}",
+        "required": ["id", "name"],
+        "properties": {
+            "id": {"type": "integer", "minimum": 0},
+            "name": {"type": "string", "maxLength": 128},
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "status": {"type": "string", "enum": ["draft", "active", "archived"]},
+        },
+    }
+
+
+def make_operation(index: int, method: str, schema_count: int) -> Dict[str, Any]:
+    schema_ref = {"$ref": f"#/components/schemas/Schema{index % schema_count}"}
+    operation: Dict[str, Any] = {
+        "operationId": f"{method}Resource{index}",
+        "summary": f"{method.upper()} resource {index}",
+        "tags": [f"tag{index % 20}"],
+        "parameters": [
+            {"name": "id", "in": "path", "required": True, "schema": {"type": "integer"}},
+            {"name": "verbose", "in": "query", "schema": {"type": "boolean"}},
+        ],
+        "responses": {
+            "200": {
+                "description": "Successful response",
+                "content": {"application/json": {"schema": schema_ref}},
+            },
+            "404": {"description": "Not found"},
+        },
+    }
+    if method in ("post", "put"):
+        operation["requestBody"] = {
+            "required": True,
+            "content": {"application/json": {"schema": dict(schema_ref)}},
+        }
+    return operation
+
+
+def make_spec(path_count: int, schema_count: int = 0) -> Dict[str, Any]:
+    """
+    Builds an OpenAPI 3.1 document with the given number of paths.
+
+    Args:
+        path_count (int): Number of path items to generate.
+        schema_count (int, optional): Number of component schemas. Defaults to path_count // 2.
+
+    Returns:
+        Dict[str, Any]: The generated OpenAPI document.
+    """
+    schema_count = schema_count or max(1, path_count // 2)
+    paths = {}
+    for index in range(path_count):
+        methods = ("get", "put") if index % 2 else ("get", "post", "delete")
+        paths[f"/resources{index}/{{id}}"] = {
+            method: make_operation(index, method, schema_count) for method in methods
+        }
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Benchmark API", "version": "1.0.0"},
+        "paths": paths,
+        "components": {
+            "schemas": {f"Schema{index}": make_schema(index) for index in range(schema_count)}
+        },
+    }
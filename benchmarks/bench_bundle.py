@@ -0,0 +1,79 @@
+"""
+Compares the output size of bundle and resolve_references for specs with external fan-in.
+
+Run with ``python benchmarks/bench_bundle.py``. Every path refers to one of a few shared
+schema files, which in turn refer to each other, as the FountainAI service specs do.
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _specs import make_schema  # noqa: E402
+from fountainai_openapi_parser.bundle import bundle  # noqa: E402
+from fountainai_openapi_parser.utils import resolve_references  # noqa: E402
+
+# Number of shared schema files the paths refer to
+SHARED_FILES = 10
+
+
+def write_sources(directory: Path, path_count: int):
+    for i in range(SHARED_FILES):
+        schema = make_schema(i)
+        schema["properties"]["related"] = {
+            "type": "array",
+            "items": {"$ref": f"shared{(i + 1) % SHARED_FILES}.yaml#/Leaf"},
+        }
+        document = {f"Schema{i}": schema, "Leaf": make_schema(100 + i)}
+        (directory / f"shared{i}.yaml").write_text(json.dumps(document))
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Gateway", "version": "1.0.0"},
+        "paths": {
+            f"/resources{i}": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "OK",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": f"shared{i % SHARED_FILES}.yaml#/Schema"
+                                                f"{i % SHARED_FILES}"
+                                    }
+                                }
+                            },
+                        }
+                    }
+                }
+            }
+            for i in range(path_count)
+        },
+    }
+
+
+def main() -> None:
+    print(f"{'paths':<8}{'sources':>10}{'inlined':>12}{'bundled':>12}{'bundle time':>14}")
+    for path_count in (10, 100, 1000):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            document = write_sources(directory, path_count)
+            base_path = directory / "openapi.yaml"
+            sources = len(json.dumps(document)) + sum(
+                path.stat().st_size for path in directory.glob("shared*.yaml")
+            )
+            inlined = len(json.dumps(resolve_references(document, base_path)))
+            start = time.perf_counter()
+            bundled = len(json.dumps(bundle(document, base_path)))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{path_count:<8}{sources / 1024:>8.0f}KB{inlined / 1024:>10.0f}KB"
+                f"{bundled / 1024:>10.0f}KB{elapsed * 1000:>12.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measures the start-up cost of schema validators: compiled closures, generated source on the
+first start, and cached generated modules on later starts.
+
+Run with ``python benchmarks/bench_codegen.py``. Each size builds validators for every
+component schema of a lazily parsed synthetic spec, as a worker does when it starts. The
+cached start imports the module written by the first start, from its bytecode. The last
+columns compare validating an array of 100 objects with the closures and the generated code.
+"""
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _specs import make_spec  # noqa: E402
+from fountainai_openapi_parser.codegen import GeneratedValidators  # noqa: E402
+from fountainai_openapi_parser.parser import parse_openapi_lazy  # noqa: E402
+from fountainai_openapi_parser.validators import SchemaCompiler  # noqa: E402
+
+# Number of component schemas for each benchmark size
+SIZES = {
+    "small": 50,
+    "medium": 500,
+    "large": 2500,
+}
+
+# Seconds spent measuring each validator
+BUDGET = 0.5
+
+
+def compile_closures(document, names):
+    compiler = SchemaCompiler(document)
+    return {name: compiler.compile({"$ref": f"#/components/schemas/{name}"}) for name in names}
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def throughput(validator, payload):
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < BUDGET:
+        validator.errors(payload)
+        calls += 1
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    warnings.simplefilter("ignore")
+    payload = [{"id": index, "name": f"Character {index}", "tags": ["hero"], "status": "active"}
+               for index in range(100)]
+    print(f"{'size':<8}{'schemas':>8}{'closures':>11}{'generate':>11}{'cached':>10}"
+          f"{'validate: closures':>20}{'generated':>11}")
+    for name, count in SIZES.items():
+        document = parse_openapi_lazy(make_spec(count, count))
+        names = list(document.components.schemas)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            closures_time, closures = timed(compile_closures, document, names)
+            generate_time, generated = timed(GeneratedValidators, document, cache_dir)
+            cached_time, cached = timed(GeneratedValidators, document, cache_dir)
+            assert not generated.cached and cached.cached
+        wrapped = {"type": "array", "items": {"$ref": "#/components/schemas/Schema0"}}
+        closure = SchemaCompiler(document).compile(wrapped)
+        fast = SchemaCompiler(document, generated=cached).compile(wrapped)
+        for instance in (payload, payload + [{"id": -1, "name": 3}]):
+            assert fast.errors(instance) == closure.errors(instance)
+        assert all(closures[key].errors(payload[0]) == cached[key].errors(payload[0])
+                   for key in names)
+        print(f"{name:<8}{count:>8}{closures_time * 1000:>9.1f}ms{generate_time * 1000:>9.1f}ms"
+              f"{cached_time * 1000:>8.1f}ms{throughput(closure, payload) * 1e6:>18.1f}us"
+              f"{throughput(fast, payload) * 1e6:>9.1f}us")
+
+
+if __name__ == "__main__":
+    main()
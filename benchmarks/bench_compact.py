@@ -0,0 +1,80 @@
+"""
+Measures the memory held by component schemas as pydantic models and in compact form.
+
+Run with ``python benchmarks/bench_compact.py``. Each component schema of the synthetic spec is
+an object schema with four properties, six schema nodes in all. The schemas are loaded from
+JSON text, and memory is what stays on the traced heap once the parsed content is dropped,
+divided by the number of component schemas: every subschema, list and string a schema holds
+on to is counted, and strings repeated across schemas are counted once for the compact form,
+which interns them. Load times are measured separately, without tracing.
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _specs import make_schema  # noqa: E402
+from fountainai_openapi_parser.compact import compact_schemas  # noqa: E402
+from fountainai_openapi_parser.models import Schema  # noqa: E402
+
+# Number of component schemas for each benchmark size
+SIZES = {
+    "small": 500,
+    "medium": 2500,
+    "large": 12000,
+}
+
+
+def measure(load, text):
+    # Returns (seconds, traced bytes held by the result, result)
+    start = time.perf_counter()
+    load(text)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = load(text)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, size, result
+
+
+def load_raw(text):
+    return json.loads(text)
+
+
+def load_models(text):
+    return {name: Schema.model_validate(schema) for name, schema in json.loads(text).items()}
+
+
+def load_compact(text):
+    return compact_schemas({"components": {"schemas": json.loads(text)}})
+
+
+def main() -> None:
+    warnings.simplefilter("ignore")
+    print(f"{'size':<8}{'schemas':>8}{'raw dicts':>12}{'models':>12}{'compact':>12}"
+          f"{'saved':>8}{'load: models':>14}{'from models':>13}{'from raw':>10}")
+    for name, count in SIZES.items():
+        text = json.dumps({f"Schema{index}": make_schema(index) for index in range(count)})
+        _, raw_size, _ = measure(load_raw, text)
+        model_time, model_size, models = measure(load_models, text)
+        start = time.perf_counter()
+        compact = compact_schemas({"components": {"schemas": models}})
+        from_models = time.perf_counter() - start
+        assert all(compact[key].to_model() == models[key] for key in models)
+        del compact, models
+        from_raw, compact_size, _ = measure(load_compact, text)
+        print(f"{name:<8}{count:>8}{raw_size / count:>11.0f}B{model_size / count:>11.0f}B"
+              f"{compact_size / count:>11.0f}B{1 - compact_size / model_size:>8.0%}"
+              f"{model_time * 1000:>12.1f}ms{from_models * 1000:>11.1f}ms"
+              f"{from_raw * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compares the document loaders used by load_openapi_from_yaml.
+
+Run with ``python benchmarks/bench_loaders.py``. For every spec size the same document is
+serialized as YAML and JSON and decoded with the pure-Python YAML loader, the libyaml-backed
+loader (when available) and the JSON fast path.
+"""
+import json
+import sys
+import timeit
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _specs import SIZES, make_spec  # noqa: E402
+from fountainai_openapi_parser.loader import HAS_LIBYAML, load_content  # noqa: E402
+
+
+def best_of(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    print(f"libyaml available: {HAS_LIBYAML}")
+    print(f"{'size':<8}{'bytes':>12}{'SafeLoader':>14}{'CSafeLoader':>14}{'JSON':>12}")
+    for name, path_count in SIZES.items():
+        spec = make_spec(path_count)
+        yaml_text = yaml.safe_dump(spec, sort_keys=False)
+        json_text = json.dumps(spec)
+        repeat = 5 if path_count < 1000 else 1
+
+        pure = best_of(lambda: yaml.load(yaml_text, Loader=yaml.SafeLoader), repeat)
+        if HAS_LIBYAML:
+            fast = best_of(lambda: load_content(yaml_text), repeat)
+            fast_column = f"{fast * 1000:>12.1f}ms"
+        else:
+            fast_column = f"{'n/a':>14}"
+        json_time = best_of(lambda: load_content(json_text), repeat)
+
+        print(
+            f"{name:<8}{len(yaml_text):>12}{pure * 1000:>12.1f}ms"
+            f"{fast_column}{json_time * 1000:>10.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
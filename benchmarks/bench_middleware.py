@@ -0,0 +1,126 @@
+"""
+Measures the per-request overhead of the validation middleware at several sampling rates.
+
+Run with ``python benchmarks/bench_middleware.py``. A minimal WSGI and ASGI application
+answers requests for the operations of a synthetic spec: GET requests with path and query
+parameters, and PUT/POST requests with a JSON body, each answered with a JSON object. Every
+request is timed through the bare application and through the middleware; the overhead is
+the difference per request. Validators are compiled on first use, so a warm-up pass runs
+before timing.
+"""
+import asyncio
+import io
+import json
+import sys
+import time
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _specs import make_spec  # noqa: E402
+from fountainai_openapi_parser.middleware import (  # noqa: E402
+    ASGIValidationMiddleware,
+    WSGIValidationMiddleware,
+)
+from fountainai_openapi_parser.parser import parse_openapi_lazy  # noqa: E402
+
+# Sampling rates to compare
+SAMPLE_RATES = (0.0, 0.1, 1.0)
+
+# Number of paths in the spec, and of requests per measurement
+PATHS = 200
+REQUESTS = 5000
+
+BODY = json.dumps({"id": 7, "name": "Character 7", "tags": ["hero", "lead"],
+                   "status": "active"}).encode("utf-8")
+
+
+def make_requests():
+    requests = []
+    for index in range(REQUESTS):
+        path_index = index % PATHS
+        path = f"/resources{path_index}/{index}"
+        if index % 2:
+            method = "PUT" if path_index % 2 else "POST"
+            requests.append((method, path, "", BODY))
+        else:
+            requests.append(("GET", path, "verbose=true", b""))
+    return requests
+
+
+def wsgi_app(environ, start_response):
+    environ["wsgi.input"].read(int(environ.get("CONTENT_LENGTH") or 0))
+    start_response("200 OK", [("Content-Type", "application/json"),
+                              ("Content-Length", str(len(BODY)))])
+    return [BODY]
+
+
+async def asgi_app(scope, receive, send):
+    await receive()
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": BODY})
+
+
+def run_wsgi(app, requests):
+    def start_response(status, headers, exc_info=None):
+        return None
+
+    start = time.perf_counter()
+    for method, path, query, body in requests:
+        environ = {"REQUEST_METHOD": method, "PATH_INFO": path, "QUERY_STRING": query,
+                   "CONTENT_TYPE": "application/json", "CONTENT_LENGTH": str(len(body)),
+                   "wsgi.input": io.BytesIO(body)}
+        result = app(environ, start_response)
+        for _ in result:
+            pass
+    return (time.perf_counter() - start) / len(requests)
+
+
+def run_asgi(app, requests):
+    async def send(message):
+        pass
+
+    async def main():
+        start = time.perf_counter()
+        for method, path, query, body in requests:
+            async def receive(body=body):
+                return {"type": "http.request", "body": body}
+
+            scope = {"type": "http", "method": method, "path": path,
+                     "query_string": query.encode("latin-1"),
+                     "headers": [(b"content-type", b"application/json")]}
+            await app(scope, receive, send)
+        return (time.perf_counter() - start) / len(requests)
+
+    return asyncio.run(main())
+
+
+def main() -> None:
+    warnings.simplefilter("ignore")
+    document = parse_openapi_lazy(make_spec(PATHS))
+    requests = make_requests()
+    violations = []
+    print(f"{'server':<8}{'sampling':>10}{'responses':>11}{'per request':>14}{'overhead':>12}")
+    for name, app, middleware, run in (("WSGI", wsgi_app, WSGIValidationMiddleware, run_wsgi),
+                                       ("ASGI", asgi_app, ASGIValidationMiddleware, run_asgi)):
+        run(app, requests)
+        bare = run(app, requests)
+        print(f"{name:<8}{'bare':>10}{'':>11}{bare * 1e6:>12.1f}us")
+        for rate in SAMPLE_RATES:
+            for responses in (True, False):
+                if rate == 0 and not responses:
+                    continue
+                wrapped = middleware(app, document, sample_rate=rate,
+                                     validate_responses=responses,
+                                     on_violation=violations.append)
+                run(wrapped, requests)
+                elapsed = run(wrapped, requests)
+                print(f"{name:<8}{rate:>10.0%}{'on' if responses else 'off':>11}"
+                      f"{elapsed * 1e6:>12.1f}us{(elapsed - bare) * 1e6:>10.1f}us")
+    assert not violations, violations[:3]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compares the single-pass and the legacy two-pass modes of parse_openapi.
+
+Run with ``python benchmarks/bench_parse.py``. For every spec size the script reports the
+wall-clock time and the peak memory allocated while parsing (measured with tracemalloc). A
+second table compares loading a JSON spec file cold with loading it from the parse cache, and a
+third one compares a full parse with reparse after a single path item was edited.
+"""
+import copy
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _specs import SIZES, make_spec  # noqa: E402
+from fountainai_openapi_parser.incremental import reparse  # noqa: E402
+from fountainai_openapi_parser.parser import load_openapi_from_file, parse_openapi  # noqa: E402
+
+
+def measure(content, single_pass: bool):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    parse_openapi(content, single_pass=single_pass)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_cache() -> None:
+    print(f"\n{'size':<8}{'cold load':>12}{'cache hit':>12}")
+    for name, path_count in SIZES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            spec_path = Path(tmp) / "openapi.json"
+            spec_path.write_text(json.dumps(make_spec(path_count)))
+            cache_dir = Path(tmp) / "cache"
+            timings = []
+            for _ in range(2):
+                start = time.perf_counter()
+                load_openapi_from_file(spec_path, cache_dir=cache_dir)
+                timings.append(time.perf_counter() - start)
+            print(f"{name:<8}{timings[0] * 1000:>10.1f}ms{timings[1] * 1000:>10.1f}ms")
+
+
+def bench_reparse() -> None:
+    print(f"\n{'size':<8}{'full parse':>12}{'reparse':>12}{'chained':>12}")
+    for name, path_count in SIZES.items():
+        content = make_spec(path_count, schema_count=max(1, path_count // 2))
+        previous = parse_openapi(content, track_changes=True)
+        edited = copy.deepcopy(content)
+        operation = next(iter(edited["paths"].values()))["get"]
+        operation["summary"] = "Edited"
+        start = time.perf_counter()
+        parse_openapi(edited)
+        full = time.perf_counter() - start
+        # Both reparses compare digests of the raw content recorded for their previous result
+        start = time.perf_counter()
+        current = reparse(previous, edited)
+        first = time.perf_counter() - start
+        edited = copy.deepcopy(edited)
+        operation = next(iter(edited["paths"].values()))["get"]
+        operation["summary"] = "Edited again"
+        start = time.perf_counter()
+        reparse(current, edited)
+        chained = time.perf_counter() - start
+        print(f"{name:<8}{full * 1000:>10.1f}ms{first * 1000:>10.1f}ms{chained * 1000:>10.1f}ms")
+
+
+def main() -> None:
+    warnings.simplefilter("ignore")
+    print(f"{'size':<8}{'mode':<12}{'time':>12}{'peak memory':>16}")
+    for name, path_count in SIZES.items():
+        content = make_spec(path_count)
+        results = {}
+        for label, single_pass in (("two-pass", False), ("single", True)):
+            elapsed, peak = measure(content, single_pass)
+            results[label] = (elapsed, peak)
+            print(f"{name:<8}{label:<12}{elapsed * 1000:>10.1f}ms{peak / 2**20:>13.1f}MiB")
+        (old_time, old_peak), (new_time, new_peak) = results["two-pass"], results["single"]
+        print(
+            f"{'':<8}{'saved':<12}{(1 - new_time / old_time) * 100:>11.0f}%"
+            f"{(1 - new_peak / old_peak) * 100:>15.0f}%"
+        )
+    bench_cache()
+    bench_reparse()
+
+
+if __name__ == "__main__":
+    main()
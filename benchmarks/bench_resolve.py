@@ -0,0 +1,129 @@
+"""
+Benchmarks resolve_references on deep and wide documents.
+
+Run with ``python benchmarks/bench_resolve.py``. The explicit-stack resolver is compared with
+the previous recursive implementation, which built a path string for every node and is kept
+here only as a baseline. A second table shows the effect of prefetching external documents
+when every file read has a fixed latency, as on a slow network filesystem.
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _specs import make_spec  # noqa: E402
+from fountainai_openapi_parser.cache import DocumentCache  # noqa: E402
+from fountainai_openapi_parser.source import Source  # noqa: E402
+from fountainai_openapi_parser.utils import resolve_references  # noqa: E402
+
+# Simulated latency of every file read in the prefetch benchmark, in seconds
+READ_LATENCY = 0.02
+
+
+def recursive_resolve(openapi_instance):
+    # The original recursive resolver (local references only)
+    def resolve(node, path=""):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                resolved_node = openapi_instance
+                for part in node["$ref"][2:].split("/"):
+                    resolved_node = resolved_node.get(part, {})
+                return resolve(resolved_node, path)
+            return {key: resolve(value, path + f"/{key}") for key, value in node.items()}
+        elif isinstance(node, list):
+            return [resolve(item, path + f"/[{i}]") for i, item in enumerate(node)]
+        return node
+
+    return resolve(openapi_instance)
+
+
+def deep_document(depth):
+    schema = {"$ref": "#/components/schemas/Leaf"}
+    for level in range(depth):
+        schema = {"type": "object", "properties": {f"level{level}": schema}}
+    return {"components": {"schemas": {"Deep": schema, "Leaf": {"type": "string"}}}}
+
+
+def wide_document(node_count):
+    # Each entry contributes about 10 nodes
+    return {
+        "components": {
+            "schemas": {
+                f"Schema{i}": {
+                    "type": "object",
+                    "properties": {"id": {"type": "integer"}, "name": {"type": "string"}},
+                    "required": ["id", "name"],
+                }
+                for i in range(node_count // 10)
+            }
+        }
+    }
+
+
+def timed(func, document):
+    start = time.perf_counter()
+    try:
+        func(document)
+    except RecursionError:
+        return "RecursionError"
+    except Exception as e:  # ReferenceResolutionError wrapping a RecursionError
+        return type(e).__name__
+    return f"{(time.perf_counter() - start) * 1000:.1f}ms"
+
+
+def slow_loader(path):
+    time.sleep(READ_LATENCY)
+    return Source.from_path(path).load()
+
+
+def external_document(directory, file_count):
+    # Every schema lives in its own file and refers to one of a few shared files
+    for i in range(file_count):
+        (directory / f"schema{i}.yaml").write_text(
+            f"type: object\nproperties:\n  shared:\n    $ref: 'shared{i % 5}.yaml'\n"
+        )
+    for i in range(5):
+        (directory / f"shared{i}.yaml").write_text("type: string\n")
+    return {
+        "components": {
+            "schemas": {f"Schema{i}": {"$ref": f"schema{i}.yaml"} for i in range(file_count)}
+        }
+    }
+
+
+def bench_prefetch() -> None:
+    print(f"\n{'external files':<22}{'sequential':>16}{'4 workers':>14}{'16 workers':>14}")
+    for file_count in (20, 100):
+        with tempfile.TemporaryDirectory() as tmp:
+            base_path = Path(tmp) / "openapi.yaml"
+            document = external_document(Path(tmp), file_count)
+            row = f"{file_count + 5:<22}"
+            for workers, width in ((0, 16), (4, 14), (16, 14)):
+                cache = DocumentCache(loader=slow_loader)
+                start = time.perf_counter()
+                resolve_references(document, base_path, cache=cache, prefetch_workers=workers)
+                row += f"{(time.perf_counter() - start) * 1000:.0f}ms".rjust(width)
+            print(row)
+
+
+def main() -> None:
+    documents = {
+        "deep (depth 500)": deep_document(500),
+        "deep (depth 5000)": deep_document(5000),
+        "wide (100k nodes)": wide_document(100_000),
+        "spec (5000 paths)": make_spec(5000),
+    }
+    print(f"{'document':<22}{'recursive':>16}{'explicit stack':>18}{'identity':>14}")
+    for name, document in documents.items():
+        print(
+            f"{name:<22}{timed(recursive_resolve, document):>16}"
+            f"{timed(resolve_references, document):>18}"
+            f"{timed(lambda d: resolve_references(d, preserve_identity=True), document):>14}"
+        )
+    bench_prefetch()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compares the segment-trie Router with a linear list of regexes for matching request paths.
+
+Run with ``python benchmarks/bench_router.py``. The regex baseline compiles one pattern per
+path template, literal templates first, and tries them in order, as request routing was done
+before. Both are timed on the same request paths, which hit templates spread over the whole
+spec, including misses.
+"""
+import re
+import sys
+import time
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fountainai_openapi_parser.parser import parse_openapi  # noqa: E402
+from fountainai_openapi_parser.router import Router  # noqa: E402
+
+# Number of path templates for each benchmark size
+SIZES = {
+    "small": 50,
+    "medium": 500,
+    "large": 5000,
+}
+
+# Request paths matched per measurement
+REQUESTS = 2000
+
+
+def make_document(template_count: int):
+    # A mix of templates shaped like the FountainAI services
+    shapes = ("/service{i}/characters", "/service{i}/characters/{{id}}",
+              "/service{i}/characters/{{id}}/actions/{{actionId}}", "/service{i}/characters/me",
+              "/service{i}/files/{{name}}.{{ext}}")
+    templates = [shape.format(i=i // len(shapes)) for i, shape in
+                 zip(range(template_count), shapes * template_count)]
+    operation = {"responses": {"200": {"description": "OK"}}}
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Router Benchmark", "version": "1.0.0"},
+        "paths": {template: {"get": operation} for template in templates},
+    }, templates
+
+
+def compile_regexes(templates):
+    # Literal templates first, so that they win over templated ones
+    def to_regex(template):
+        pattern = re.sub(r"\\\{([^{}/]+)\\\}", r"(?P<\1>[^/]+)", re.escape(template))
+        return re.compile(pattern + "$")
+
+    ordered = sorted(templates, key=lambda template: "{" in template)
+    return [(to_regex(template), template) for template in ordered]
+
+
+def regex_match(regexes, path):
+    for regex, template in regexes:
+        match = regex.match(path)
+        if match is not None:
+            return template, match.groupdict()
+    return None
+
+
+def request_paths(templates):
+    paths = []
+    step = max(1, len(templates) // REQUESTS)
+    for index in range(0, len(templates), step):
+        template = templates[index]
+        paths.append(template.replace("{id}", "42").replace("{actionId}", "7")
+                     .replace("{name}", "report").replace("{ext}", "pdf"))
+    paths.append("/unknown/path")
+    return (paths * (REQUESTS // len(paths) + 1))[:REQUESTS]
+
+
+def timed(function, paths):
+    start = time.perf_counter()
+    for path in paths:
+        function(path)
+    return (time.perf_counter() - start) / len(paths)
+
+
+def main() -> None:
+    warnings.simplefilter("ignore")
+    print(f"{'size':<8}{'templates':>10}{'build':>12}{'regex list':>14}{'trie':>12}{'speedup':>10}")
+    for name, count in SIZES.items():
+        content, templates = make_document(count)
+        document = parse_openapi(content)
+        start = time.perf_counter()
+        router = Router(document)
+        build = time.perf_counter() - start
+        regexes = compile_regexes(templates)
+        paths = request_paths(templates)
+        for path in paths:
+            expected = regex_match(regexes, path)
+            match = router.match("get", path)
+            assert (match.template if match else None) == (expected[0] if expected else None)
+        linear = timed(lambda path: regex_match(regexes, path), paths)
+        trie = timed(lambda path: router.match("get", path), paths)
+        print(f"{name:<8}{len(router):>10}{build * 1000:>10.1f}ms{linear * 1e6:>12.1f}us"
+              f"{trie * 1e6:>10.1f}us{linear / trie:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Measures how long parse_openapi takes over a corpus of specs, to compare the ways the
+Union[X, Reference] fields of the models are validated.
+
+Run with ``python benchmarks/bench_unions.py [SPEC ...]``. The corpus is two synthetic specs of
+each size plus every spec file given on the command line, so that real service specs can be
+compared as well. The "inline" specs declare parameters, request bodies and responses in place. The
+"referenced" specs move them into components and point at them with $ref, as most large
+service specs do. Each spec is parsed repeatedly for a fixed budget and the best time is
+reported.
+"""
+import gc
+import sys
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _specs import make_spec  # noqa: E402
+from fountainai_openapi_parser.loader import load_source  # noqa: E402
+from fountainai_openapi_parser.parser import parse_openapi  # noqa: E402
+
+# Number of paths of the synthetic specs
+SIZES = {
+    "small": 10,
+    "medium": 500,
+    "large": 2500,
+}
+
+# Seconds spent parsing each spec
+BUDGET = 1.0
+
+
+def make_referenced_spec(path_count: int) -> Dict[str, Any]:
+    # The synthetic spec, with parameters, request bodies and responses moved into components
+    content = make_spec(path_count)
+    components = content["components"]
+    parameters = components["parameters"] = {}
+    bodies = components["requestBodies"] = {}
+    responses = components["responses"] = {}
+    for path_item in content["paths"].values():
+        for operation in path_item.values():
+            name = operation["operationId"]
+            for parameter in operation["parameters"]:
+                parameters.setdefault(parameter["name"], parameter)
+            operation["parameters"] = [{"$ref": f"#/components/parameters/{parameter['name']}"}
+                                       for parameter in operation["parameters"]]
+            if "requestBody" in operation:
+                bodies[name] = operation["requestBody"]
+                operation["requestBody"] = {"$ref": f"#/components/requestBodies/{name}"}
+            for status, response in operation["responses"].items():
+                key = f"{name}{status}" if "content" in response else f"Status{status}"
+                responses[key] = response
+                operation["responses"][status] = {"$ref": f"#/components/responses/{key}"}
+    return content
+
+
+def corpus() -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for name, path_count in SIZES.items():
+        yield f"inline {name}", make_spec(path_count)
+        yield f"referenced {name}", make_referenced_spec(path_count)
+    for path in sys.argv[1:]:
+        yield Path(path).name, load_source(path)
+
+
+def best_time(content: Dict[str, Any]) -> float:
+    best = float("inf")
+    deadline = time.perf_counter() + BUDGET
+    while True:
+        # Collections triggered by earlier runs would add noise to the timings
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            parse_openapi(content)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+        if time.perf_counter() > deadline:
+            return best
+
+
+def main() -> None:
+    warnings.simplefilter("ignore")
+    print(f"{'spec':<24}{'paths':>8}{'parse':>12}")
+    total = 0.0
+    for name, content in corpus():
+        elapsed = best_time(content)
+        total += elapsed
+        print(f"{name:<24}{len(content['paths']):>8}{elapsed * 1000:>10.2f}ms")
+    print(f"{'total':<24}{'':>8}{total * 1000:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
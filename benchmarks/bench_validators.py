@@ -0,0 +1,83 @@
+"""
+Compares the compiled schema validators with jsonschema for validating request bodies.
+
+Run with ``python benchmarks/bench_validators.py``. Both validators check the same payloads
+against a component schema of the synthetic spec, reached through a '$ref' as in a request
+body: a single object, and arrays of objects, each in a valid and an invalid variant. The
+jsonschema validator is built once and reused, like the compiled one.
+"""
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import jsonschema
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _specs import make_spec  # noqa: E402
+from fountainai_openapi_parser.parser import parse_openapi  # noqa: E402
+from fountainai_openapi_parser.validators import SchemaCompiler  # noqa: E402
+
+# Number of objects in each payload
+PAYLOADS = {
+    "object": 1,
+    "array-100": 100,
+    "array-1000": 1000,
+}
+
+# Seconds spent measuring each validator on each payload
+BUDGET = 0.5
+
+
+def make_payload(count: int, valid: bool):
+    items = [
+        {"id": index, "name": f"Character {index}", "tags": ["hero", "lead"],
+         "status": "active"}
+        for index in range(count)
+    ]
+    if not valid:
+        items[-1] = {"id": -1, "name": 7, "status": "retired"}
+    return items[0] if count == 1 else items
+
+
+def timed(function, payload):
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        function(payload)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed > BUDGET:
+            return elapsed / calls
+
+
+def main() -> None:
+    warnings.simplefilter("ignore")
+    content = make_spec(10)
+    reference = {"$ref": "#/components/schemas/Schema0"}
+    compiler = SchemaCompiler(parse_openapi(content))
+    start = time.perf_counter()
+    single = compiler.compile(reference)
+    many = compiler.compile({"type": "array", "items": reference})
+    build = time.perf_counter() - start
+    components = content["components"]
+    baseline_single = jsonschema.Draft202012Validator(dict(reference, components=components))
+    baseline_many = jsonschema.Draft202012Validator(
+        {"type": "array", "items": reference, "components": components})
+    print(f"compiled in {build * 1000:.2f}ms")
+    print(f"{'payload':<12}{'valid':>7}{'jsonschema':>14}{'compiled':>12}{'speedup':>10}")
+    for name, count in PAYLOADS.items():
+        validator, baseline = (single, baseline_single) if count == 1 else (many, baseline_many)
+        for valid in (True, False):
+            payload = make_payload(count, valid)
+            assert validator.is_valid(payload) is baseline.is_valid(payload) is valid
+            # Collect every error, as a request validator reports them all
+            slow = timed(lambda value: list(baseline.iter_errors(value)), payload)
+            fast = timed(validator.errors, payload)
+            print(f"{name:<12}{str(valid):>7}{slow * 1e6:>12.1f}us{fast * 1e6:>10.1f}us"
+                  f"{slow / fast:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+__version__ = "0.1.0"
+
+
 __all__ = [
 
     "parse_openapi",
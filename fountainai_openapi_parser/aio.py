@@ -0,0 +1,212 @@
+import asyncio
+import functools
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from .cache import DocumentCache
+from .exceptions import ParsingError, ReferenceResolutionError
+from .loader import load_bytes, load_content
+from .models import OpenAPI
+from .parser import (
+    load_openapi_from_bytes,
+    load_openapi_from_yaml,
+    load_openapi_sections,
+    parse_openapi,
+)
+from .remote import is_url, shared_http_fetcher
+from .utils import (
+    DEFAULT_PREFETCH_WORKERS,
+    Location,
+    base_location,
+    external_documents,
+    resolve_references,
+)
+
+# Coroutine function returning the raw content (str or bytes) of the document at a location
+AsyncFetcher = Callable[[Location], Awaitable[Union[str, bytes]]]
+
+
+async def fetch_file(path: Location) -> bytes:
+    """
+    Default fetcher: reads a file, or downloads a URL, in the event loop's default executor.
+
+    URLs are downloaded with the pooled, revalidating remote.shared_http_fetcher.
+
+    Args:
+        path (Location): The file path or HTTP(S) URL.
+
+    Returns:
+        bytes: The raw content.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        requests.RequestException: If the URL cannot be downloaded.
+    """
+    loop = asyncio.get_running_loop()
+    if is_url(path):
+        return await loop.run_in_executor(None, shared_http_fetcher.fetch, path)
+    return await loop.run_in_executor(None, Path(path).read_bytes)
+
+
+def _decode(content: Union[str, bytes], name: str) -> Any:
+    if isinstance(content, str):
+        return load_content(content)
+    return load_bytes(content, name)
+
+
+def _decode_and_scan(content: Union[str, bytes], path: Location) -> Tuple[Any, List[Location]]:
+    # Decoding and scanning for references are both CPU-bound, so they share one executor job
+    document = _decode(content, str(path))
+    return document, list(external_documents(document, path))
+
+
+async def aparse_openapi(content: Dict[str, Any], single_pass: bool = True,
+                         executor: Optional[Executor] = None) -> OpenAPI:
+    """
+    Async counterpart of parser.parse_openapi; validation runs in an executor.
+
+    Args:
+        content (Dict[str, Any]): The decoded OpenAPI document.
+        single_pass (bool, optional): Passed on to parse_openapi. Defaults to True.
+        executor (Optional[Executor], optional): Executor for the validation. Defaults to the
+            event loop's default executor.
+
+    Returns:
+        OpenAPI: The validated model.
+
+    Raises:
+        ParsingError: If the document is not a valid OpenAPI specification.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(parse_openapi, content, single_pass=single_pass)
+    )
+
+
+async def aload_openapi_from_file(file_path: Union[str, Path],
+                                  select: Optional[Sequence[str]] = None,
+                                  fetcher: AsyncFetcher = fetch_file,
+                                  executor: Optional[Executor] = None) -> OpenAPI:
+    """
+    Async counterpart of parser.load_openapi_from_file.
+
+    The file is read with the fetcher, then decoded and validated in an executor, so the
+    event loop is never blocked.
+
+    Args:
+        file_path (Union[str, Path]): The path of the document.
+        select (Optional[Sequence[str]], optional): JSON Pointers of the sections to load, as
+            for load_openapi_sections. Defaults to None (the whole document).
+        fetcher (AsyncFetcher, optional): Coroutine function that reads the document. Defaults
+            to fetch_file.
+        executor (Optional[Executor], optional): Executor for decoding and validation. Defaults
+            to the event loop's default executor.
+
+    Returns:
+        OpenAPI: The validated model.
+
+    Raises:
+        ParsingError: If the file cannot be read or is not a valid OpenAPI specification.
+    """
+    try:
+        content = await fetcher(Path(file_path))
+    except FileNotFoundError as e:
+        raise ParsingError(f"File not found: {e}")
+    except IOError as e:
+        raise ParsingError(f"IO error while reading the file: {e}")
+    if select is not None:
+        load = functools.partial(load_openapi_sections, content, select)
+    elif isinstance(content, str):
+        load = functools.partial(load_openapi_from_yaml, content)
+    else:
+        load = functools.partial(load_openapi_from_bytes, content, str(file_path))
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, load)
+
+
+async def aresolve_references(openapi_instance: Dict[str, Any],
+                              base_path: Union[str, Path] = "",
+                              preserve_identity: bool = False,
+                              fetcher: AsyncFetcher = fetch_file,
+                              executor: Optional[Executor] = None,
+                              max_concurrency: int = DEFAULT_PREFETCH_WORKERS) -> Dict[str, Any]:
+    """
+    Async counterpart of utils.resolve_references.
+
+    Every external document reachable through $ref is fetched first, with at most
+    max_concurrency fetches in flight; each one is decoded and scanned for further references
+    in the executor as soon as it arrives. The document is then resolved in the executor
+    against the fetched documents only, so a custom fetcher (HTTP, object storage, an
+    in-memory store) fully replaces filesystem access. Every call keeps its own state, so any
+    number of specs can be resolved concurrently.
+
+    Args:
+        openapi_instance (Dict[str, Any]): The parsed OpenAPI document as a dictionary.
+        base_path (Union[str, Path], optional): The base path to resolve external references,
+            as for resolve_references. Defaults to "".
+        preserve_identity (bool, optional): Passed on to resolve_references. Defaults to False.
+        fetcher (AsyncFetcher, optional): Coroutine function that returns the raw content of
+            the external document at a path. Defaults to fetch_file.
+        executor (Optional[Executor], optional): Executor for decoding and resolution. Defaults
+            to the event loop's default executor.
+        max_concurrency (int, optional): Maximum number of concurrent fetches. Defaults to 8.
+
+    Returns:
+        Dict[str, Any]: The OpenAPI document with references resolved.
+
+    Raises:
+        ReferenceResolutionError: If there is an issue resolving references, including an
+            external document that could not be fetched or decoded.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    failures: Dict[str, Exception] = {}
+    seen: Set[str] = set()
+
+    def not_fetched(path: Location) -> Any:
+        # Only reached for documents whose fetch failed; the walk reports them with a location
+        error = failures.get(DocumentCache.key(path))
+        if error is not None:
+            raise error
+        raise ReferenceResolutionError(f"External document was not fetched: {path}")
+
+    cache = DocumentCache(max_entries=None, check_stat=False, loader=not_fetched)
+
+    async def fetch_all(paths: List[Location]) -> None:
+        new_paths = []
+        for path in paths:
+            key = DocumentCache.key(path)
+            if key not in seen:
+                seen.add(key)
+                new_paths.append(path)
+        await asyncio.gather(*(fetch(path) for path in new_paths))
+
+    async def fetch(path: Location) -> None:
+        try:
+            async with semaphore:
+                content = await fetcher(path)
+            document, references = await loop.run_in_executor(
+                executor, _decode_and_scan, content, path
+            )
+        except Exception as e:
+            failures[DocumentCache.key(path)] = e
+            return
+        cache.put(path, document)
+        await fetch_all(references)
+
+    root_references = await loop.run_in_executor(
+        executor, lambda: list(external_documents(openapi_instance, base_location(base_path)))
+    )
+    await fetch_all(root_references)
+    return await loop.run_in_executor(
+        executor,
+        functools.partial(
+            resolve_references,
+            openapi_instance,
+            base_path,
+            cache=cache,
+            preserve_identity=preserve_identity,
+            prefetch_workers=0,
+        ),
+    )
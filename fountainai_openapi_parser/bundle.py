@@ -0,0 +1,274 @@
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from .cache import DocumentCache
+from .exceptions import ReferenceResolutionError
+from .fingerprint import Fingerprints
+from .models import Components
+from .pointer import PointerIndex, escape_token, parse_fragment
+from .utils import (
+    DEFAULT_PREFETCH_WORKERS,
+    Location,
+    base_location,
+    frame_location,
+    join_location,
+    prefetch_documents,
+)
+
+# Sections of the Components Object, in specification order
+COMPONENT_SECTIONS = tuple(Components.model_fields)
+
+# Keys whose value is a single schema
+_SCHEMA_KEYS = frozenset((
+    "schema", "items", "not", "additionalProperties", "contains", "propertyNames", "if", "then",
+    "else", "unevaluatedItems", "unevaluatedProperties", "contentSchema",
+))
+
+# Keys of maps and lists whose entries belong to a components section
+_SECTION_BY_CONTAINER = {
+    "properties": "schemas",
+    "patternProperties": "schemas",
+    "$defs": "schemas",
+    "dependentSchemas": "schemas",
+    "allOf": "schemas",
+    "anyOf": "schemas",
+    "oneOf": "schemas",
+    "prefixItems": "schemas",
+    "parameters": "parameters",
+    "responses": "responses",
+    "headers": "headers",
+    "examples": "examples",
+    "links": "links",
+    "callbacks": "callbacks",
+    "paths": "pathItems",
+    "webhooks": "pathItems",
+    "schemas": "schemas",
+    "requestBodies": "requestBodies",
+    "securitySchemes": "securitySchemes",
+    "pathItems": "pathItems",
+}
+
+# Characters allowed in component names by the OpenAPI specification
+_INVALID_NAME_CHARACTERS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _section_for(key: Any, parent_key: Any, tokens: Tuple[str, ...]) -> str:
+    """
+    Picks the components section for a hoisted $ref target.
+
+    Args:
+        key (Any): The key of the $ref object in its container.
+        parent_key (Any): The key of that container.
+        tokens (Tuple[str, ...]): The parsed fragment of the reference.
+
+    Returns:
+        str: The section, e.g. 'schemas' or 'parameters'.
+    """
+    # A target that already lives in a components section keeps that section
+    if len(tokens) >= 3 and tokens[0] == "components" and tokens[1] in COMPONENT_SECTIONS:
+        return tokens[1]
+    if key == "requestBody":
+        return "requestBodies"
+    if key in _SCHEMA_KEYS:
+        return "schemas"
+    return _SECTION_BY_CONTAINER.get(parent_key, "schemas")
+
+
+def _component_name(location: Location, tokens: Tuple[str, ...]) -> str:
+    if tokens and tokens[-1]:
+        name = tokens[-1]
+    else:
+        name = Path(str(location).rstrip("/").rsplit("/", 1)[-1]).stem
+    return _INVALID_NAME_CHARACTERS.sub("_", name).strip("_") or "Component"
+
+
+def _rename_references(node: Any, aliases: Dict[str, str]) -> None:
+    # Points every $ref to a deduplicated component at the component that was kept
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref in aliases:
+                node["$ref"] = aliases[ref]
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(value for value in node if isinstance(value, (dict, list)))
+
+
+def bundle(openapi_instance: Dict[str, Any],
+           base_path: Union[str, Path] = "",
+           cache: Optional[DocumentCache] = None,
+           prefetch_workers: int = DEFAULT_PREFETCH_WORKERS) -> Dict[str, Any]:
+    """
+    Bundles an OpenAPI document and its external references into a single document.
+
+    Unlike resolve_references, targets are not inlined at each use site. Every external $ref
+    target is copied once into the matching components section (schemas, parameters,
+    responses, ...) and each reference to it is rewritten to a local '#/components/...'
+    pointer, so the output grows linearly with the inputs. Local references of the main
+    document are kept as they are; local references inside external documents are hoisted
+    like external ones.
+
+    A target is hoisted under its own name (the last token of its pointer, or the file name);
+    a name that is already taken gets a numeric suffix. Targets with identical content are
+    stored once, and references back into the main document become local references. Without
+    a base_path, the main document is recognised as a file in the working directory with the
+    same content.
+
+    Args:
+        openapi_instance (Dict[str, Any]): The parsed OpenAPI document as a dictionary.
+        base_path (Union[str, Path], optional): The path or URL of the document, used to
+            resolve external references. Defaults to "".
+        cache (Optional[DocumentCache], optional): Cache of parsed external documents. Defaults
+            to a new cache that lives for this call only.
+        prefetch_workers (int, optional): Threads used to load external documents up front, as
+            for resolve_references. Defaults to 8.
+
+    Returns:
+        Dict[str, Any]: The bundled document. The input is not modified.
+
+    Raises:
+        ReferenceResolutionError: If a reference cannot be resolved.
+    """
+    if cache is None:
+        cache = DocumentCache(max_entries=None, check_stat=False)
+    if prefetch_workers > 0:
+        prefetch_documents(openapi_instance, base_path, cache, prefetch_workers)
+    root_location = base_location(base_path)
+    # Whether each document key refers to the main document. Without a base path, relative
+    # references are resolved against the working directory, but the main document's file
+    # name is unknown: a file is recognised as the main document by its content instead.
+    unnamed = str(root_location) in ("", ".")
+    is_root: Dict[str, bool] = {DocumentCache.key(root_location): not unnamed}
+    indexes: Dict[int, PointerIndex] = {}
+    # (document key, fragment) -> local reference of the hoisted copy
+    hoisted: Dict[Tuple[str, str], str] = {}
+    existing = openapi_instance.get("components") or {}
+    sections: Dict[str, Dict[str, Any]] = {}
+    taken: Dict[str, Set[str]] = {
+        section: set(existing.get(section) or ()) for section in COMPONENT_SECTIONS
+    }
+    # Fingerprint of each hoisted component -> its local reference, per section
+    contents: Dict[str, Dict[bytes, str]] = {section: {} for section in COMPONENT_SECTIONS}
+    aliases: Dict[str, str] = {}
+
+    def hoist(ref: str, node_key: Any, parent_key: Any, document: Any,
+              document_path: Location) -> Tuple[str, Optional[Tuple[Any, ...]]]:
+        """
+        Finds the local reference that replaces a $ref, registering a new component if needed.
+
+        Returns:
+            Tuple[str, Optional[Tuple[Any, ...]]]: The local reference, and (target, its
+                document, its location, section, name) if the target still has to be copied.
+        """
+        location, _, fragment = ref.partition("#")
+        target_path = join_location(document_path, location) if location else document_path
+        target_key = DocumentCache.key(target_path)
+        if target_key not in is_root:
+            is_root[target_key] = unnamed and cache.get(target_path) == openapi_instance
+        if is_root[target_key]:
+            # A reference back into the main document
+            return "#" + fragment, None
+        known = hoisted.get((target_key, fragment))
+        if known is not None:
+            return known, None
+        target_document = cache.get(target_path) if location else document
+        tokens = parse_fragment(fragment)
+        index = indexes.get(id(target_document))
+        if index is None:
+            index = indexes[id(target_document)] = PointerIndex(target_document)
+        target = index.resolve(tokens)
+        section = _section_for(node_key, parent_key, tokens)
+        base_name = name = _component_name(target_path, tokens)
+        suffix = 1
+        while name in taken[section]:
+            suffix += 1
+            name = f"{base_name}_{suffix}"
+        taken[section].add(name)
+        local = f"#/components/{section}/{escape_token(name)}"
+        hoisted[(target_key, fragment)] = local
+        return local, (target, target_document, target_path, section, name)
+
+    # Frames are (raw node, its document, the document's location, output container, key in
+    # the output container, parent frame), as in resolve_references. Children are pushed in
+    # reverse so that components are named in document order.
+    root: List[Any] = [None]
+    root_frame = (openapi_instance, openapi_instance, root_location, root, 0, None)
+    stack: List[Tuple[Any, ...]] = [root_frame]
+    try:
+        while stack:
+            frame = stack.pop()
+            node, document, document_path, container, key, parent = frame
+            if node is _END_COMPONENT:
+                # frame[1:3] hold the section and the name of a component that is complete
+                section, name = document, document_path
+                component = sections[section][name]
+                _rename_references(component, aliases)
+                local = f"#/components/{section}/{escape_token(name)}"
+                kept = contents[section].setdefault(Fingerprints(component).digest(), local)
+                if kept != local:
+                    # The name stays taken, so the alias can never point at another component
+                    del sections[section][name]
+                    aliases[local] = kept
+                continue
+            if isinstance(node, dict):
+                ref = node.get("$ref")
+                if isinstance(ref, str) and (document is not openapi_instance
+                                             or not ref.startswith("#")):
+                    parent_key = parent[4] if parent is not None else None
+                    try:
+                        local, new = hoist(ref, key, parent_key, document, document_path)
+                    except Exception as e:
+                        raise ReferenceResolutionError(
+                            f"Failed to bundle references at {frame_location(frame)}: {e}")
+                    # Sibling keys such as summary and description are kept
+                    container[key] = dict(node, **{"$ref": local})
+                    if new is not None:
+                        target, target_document, target_path, section, name = new
+                        # Copy the target into its section, under synthetic parent frames
+                        # so that errors report its location in the bundled document
+                        section_frame = (None, None, None, None, section,
+                                         (None, None, None, None, "components", root_frame))
+                        components = sections.setdefault(section, {})
+                        stack.append((_END_COMPONENT, section, name, None, None, None))
+                        stack.append((target, target_document, target_path, components, name,
+                                      section_frame))
+                    continue
+                result = dict.fromkeys(node)
+                container[key] = result
+                for child_key, value in reversed(node.items()):
+                    if isinstance(value, (dict, list)):
+                        stack.append((value, document, document_path, result, child_key, frame))
+                    else:
+                        result[child_key] = value
+            elif isinstance(node, list):
+                items = node.copy()
+                container[key] = items
+                for index in reversed(range(len(node))):
+                    if isinstance(node[index], (dict, list)):
+                        stack.append((node[index], document, document_path, items, index, frame))
+            else:
+                container[key] = node
+    except ReferenceResolutionError:
+        raise
+    except Exception as e:
+        raise ReferenceResolutionError(f"Failed to bundle references: {e}")
+
+    output = root[0]
+    if aliases:
+        _rename_references(output, aliases)
+        for section in sections.values():
+            _rename_references(section, aliases)
+    if any(sections.values()):
+        components = dict(output.get("components") or {})
+        for section in COMPONENT_SECTIONS:
+            if sections.get(section):
+                components[section] = {**(components.get(section) or {}), **sections[section]}
+        output["components"] = components
+    return output
+
+
+# Stack marker that ends the copy of a hoisted component
+_END_COMPONENT = object()
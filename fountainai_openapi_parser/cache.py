@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .remote import HttpFetcher, is_url, shared_http_fetcher
+from .source import Source
+
+# Identifies one version of a file on disk: (mtime in nanoseconds, size in bytes). URL
+# entries use (load time in seconds, 0) instead.
+FileStamp = Optional[Tuple[float, int]]
+
+# Seconds a cached URL document is used before it is revalidated (with check_stat)
+DEFAULT_URL_TTL = 60.0
+
+
+class DocumentCache:
+    """
+    LRU cache of parsed external documents, keyed by absolute path or URL.
+
+    resolve_references creates a private cache for every call, so a file referenced many
+    times is read and parsed once per resolution. Passing a long-lived instance (such as
+    shared_document_cache) keeps documents across calls; with check_stat enabled an entry is
+    reloaded whenever the file's mtime or size changes. URLs are downloaded with an
+    HttpFetcher; with check_stat enabled, an entry older than url_ttl seconds is revalidated
+    with a conditional request, which costs a 304 reply and no parsing when it is unchanged.
+
+    Cached documents are shared between callers and must be treated as read-only.
+
+    Attributes:
+        max_entries (Optional[int]): Maximum number of documents kept, or None for no limit.
+        check_stat (bool): Whether to compare mtime and size (or revalidate an old URL entry)
+            before returning an entry.
+        url_ttl (float): Seconds a URL entry is used without revalidation.
+        http (HttpFetcher): The fetcher used for URLs.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to load the document.
+        evictions (int): Number of entries dropped to respect max_entries.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 256, check_stat: bool = True,
+                 loader: Optional[Callable[[Union[Path, str]], Any]] = None,
+                 http: Optional[HttpFetcher] = None, url_ttl: float = DEFAULT_URL_TTL):
+        self.max_entries = max_entries
+        self.check_stat = check_stat
+        self.url_ttl = url_ttl
+        self.http = http if http is not None else shared_http_fetcher
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._loader = loader if loader is not None else self._load
+        self._entries: "OrderedDict[str, Tuple[FileStamp, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, (str, Path)) and self.key(path) in self._entries
+
+    @staticmethod
+    def key(path: Union[str, Path]) -> str:
+        """Returns the cache key (the URL, or the absolute, normalized path) for a location."""
+        if is_url(path):
+            return path  # type: ignore[return-value]
+        return os.path.abspath(path)
+
+    def _is_current(self, cached: FileStamp, stamp: FileStamp, remote: bool) -> bool:
+        if not remote:
+            return cached == stamp
+        return not self.check_stat or stamp[0] - cached[0] < self.url_ttl  # type: ignore
+
+    def _load(self, location: Union[Path, str]) -> Any:
+        if is_url(location):
+            return self.http.load(location)  # type: ignore[arg-type]
+        return Source.from_path(location).load()
+
+    def _stamp(self, key: str) -> FileStamp:
+        if not self.check_stat:
+            return None
+        stat = os.stat(key)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: Union[str, Path]) -> Any:
+        """
+        Returns the parsed document at a path or URL, loading it on a miss.
+
+        Args:
+            path (Union[str, Path]): The document's file path or HTTP(S) URL.
+
+        Returns:
+            Any: The parsed document.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            requests.RequestException: If the URL cannot be downloaded.
+            yaml.YAMLError: If the file is neither valid JSON nor valid YAML.
+        """
+        key = self.key(path)
+        remote = is_url(key)
+        # URL entries are stamped with the time they were loaded
+        stamp = (time.monotonic(), 0) if remote else self._stamp(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_current(entry[0], stamp, remote):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        # Load outside the lock so that different files can be parsed concurrently
+        document = self._loader(key if remote else Path(key))
+        self.put(key, document, stamp)
+        return document
+
+    def put(self, path: Union[str, Path], document: Any, stamp: FileStamp = None) -> None:
+        """
+        Stores a parsed document, evicting the least recently used entries if needed.
+
+        Args:
+            path (Union[str, Path]): The document's file path.
+            document (Any): The parsed document.
+            stamp (FileStamp, optional): The file's (mtime_ns, size) when it was read.
+        """
+        key = self.key(path)
+        with self._lock:
+            self._entries[key] = (stamp, document)
+            self._entries.move_to_end(key)
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drops every entry and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit, miss and eviction counters and the current number of entries."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+        }
+
+
+# Opt-in cache shared across resolve_references calls
+shared_document_cache = DocumentCache()
@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .cache import DocumentCache, shared_document_cache
+from .parse_cache import ParseCache
+from .parser import parse_openapi
+from .remote import shared_http_fetcher
+from .source import Source
+from .utils import resolve_references
+
+# File name patterns treated as specs when a directory is validated
+DEFAULT_PATTERNS = ("*.yaml", "*.yml", "*.json")
+
+# Exit codes of the command line tool
+EXIT_OK = 0
+EXIT_INVALID = 1
+
+# External documents of the current process, see _init_worker
+_documents: DocumentCache = shared_document_cache
+
+
+def find_specs(paths: Sequence[str], patterns: Sequence[str] = DEFAULT_PATTERNS) -> List[Path]:
+    """
+    Collects the spec files to validate.
+
+    Args:
+        paths (Sequence[str]): Files and directories; directories are searched recursively.
+        patterns (Sequence[str], optional): File name patterns for directory searches.
+
+    Returns:
+        List[Path]: The files, sorted and without duplicates.
+    """
+    found = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            for pattern in patterns:
+                found.update(file for file in path.rglob(pattern) if file.is_file())
+        else:
+            found.add(path)
+    return sorted(found)
+
+
+def _init_worker(http_cache_dir: Optional[str], cache_dir: Optional[str]) -> None:
+    # Runs once per worker process. Each process keeps its own decoded documents in memory;
+    # the disk caches are what workers share
+    global _documents
+    if http_cache_dir is not None:
+        shared_http_fetcher.cache_dir = Path(http_cache_dir)
+    if cache_dir is None:
+        _documents = shared_document_cache
+    else:
+        _documents = DocumentCache(loader=ParseCache(cache_dir).load_document)
+
+
+def validate_file(path: Path, resolve: bool = False) -> Dict[str, Any]:
+    """
+    Validates one spec file.
+
+    Files that decode to something other than a mapping with a top-level 'openapi' field
+    (shared schema files, for instance) are reported as skipped.
+
+    Args:
+        path (Path): The file to validate.
+        resolve (bool, optional): Also check that every $ref can be resolved. External
+            documents are kept in memory for the rest of the process. Defaults to False.
+
+    Returns:
+        Dict[str, Any]: The result: path, status ('ok', 'invalid' or 'skipped'), seconds and,
+            for invalid files, the error message.
+    """
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"path": str(path), "status": "ok"}
+    try:
+        content = Source.from_path(path).load()
+        if not isinstance(content, dict) or "openapi" not in content:
+            result["status"] = "skipped"
+        else:
+            parse_openapi(content)
+            if resolve:
+                resolve_references(content, path, cache=_documents)
+    except Exception as e:
+        result["status"] = "invalid"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def validate_files(files: Sequence[Path], jobs: int = 1, resolve: bool = False,
+                   http_cache_dir: Optional[str] = None,
+                   cache_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Validates many spec files, in parallel when jobs is greater than 1.
+
+    Files are handed to a pool of worker processes in contiguous chunks, so files from the
+    same directory tend to reuse the external documents their worker already holds in memory.
+    Workers only share documents through cache_dir and http_cache_dir: with cache_dir, a
+    file referenced from specs in several workers is decoded once and unpickled by the others.
+
+    Args:
+        files (Sequence[Path]): The files to validate.
+        jobs (int, optional): Number of worker processes. Defaults to 1 (no pool).
+        resolve (bool, optional): Also check that every $ref can be resolved. Defaults to False.
+        http_cache_dir (Optional[str], optional): Disk cache for remote documents, shared by
+            all workers. Defaults to None.
+        cache_dir (Optional[str], optional): ParseCache directory for decoded local documents,
+            shared by all workers. Defaults to None.
+
+    Returns:
+        List[Dict[str, Any]]: One result per file (see validate_file), in the order given.
+    """
+    global _documents
+    if jobs <= 1 or len(files) <= 1:
+        # Validated in this process: the caches are put back afterwards, so that a call from
+        # library code does not change them for the rest of the process
+        previous = shared_http_fetcher.cache_dir, _documents
+        _init_worker(http_cache_dir, cache_dir)
+        try:
+            return [validate_file(path, resolve) for path in files]
+        finally:
+            shared_http_fetcher.cache_dir, _documents = previous
+    jobs = min(jobs, len(files))
+    chunksize = max(1, len(files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(http_cache_dir, cache_dir)) as executor:
+        return list(executor.map(validate_file, files, [resolve] * len(files),
+                                 chunksize=chunksize))
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="fountainai-openapi",
+                                     description="FountainAI OpenAPI Parser tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    validate = commands.add_parser(
+        "validate", help="Validate spec files and print a JSON summary.",
+        description="Validate OpenAPI specs and print a JSON summary with per-file timings. "
+                    "The exit code is 1 if any spec is invalid.")
+    validate.add_argument("paths", nargs="+", metavar="PATH",
+                          help="Spec files, or directories searched recursively.")
+    validate.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                          help="Number of worker processes (default: number of CPUs).")
+    validate.add_argument("--pattern", action="append", dest="patterns",
+                          help="File name pattern for directories (repeatable; default: "
+                               + ", ".join(DEFAULT_PATTERNS) + ").")
+    validate.add_argument("--resolve", action="store_true",
+                          help="Also check that every $ref can be resolved.")
+    validate.add_argument("--http-cache", metavar="DIR",
+                          help="Disk cache for remote $ref documents, shared by all workers.")
+    validate.add_argument("--cache-dir", metavar="DIR",
+                          help="Disk cache for decoded local $ref documents, shared by all "
+                               "workers and later runs.")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Entry point of the fountainai-openapi command.
+
+    Args:
+        argv (Optional[Sequence[str]], optional): Arguments without the program name. Defaults
+            to sys.argv[1:].
+
+    Returns:
+        int: The exit code: 0 if every spec is valid, 1 otherwise.
+    """
+    args = _build_parser().parse_args(argv)
+    start = time.perf_counter()
+    files = find_specs(args.paths, args.patterns or DEFAULT_PATTERNS)
+    results = validate_files(files, args.jobs, args.resolve, args.http_cache,
+                             args.cache_dir)
+    counts = {status: 0 for status in ("ok", "invalid", "skipped")}
+    for result in results:
+        counts[result["status"]] += 1
+    summary = {
+        "files": results,
+        "summary": {
+            "total": len(results),
+            **counts,
+            "jobs": args.jobs,
+            "seconds": round(time.perf_counter() - start, 6),
+        },
+    }
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return EXIT_INVALID if counts["invalid"] else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
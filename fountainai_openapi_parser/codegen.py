@@ -0,0 +1,636 @@
+import ast
+import hashlib
+import importlib.util
+import json
+import logging
+import py_compile
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from . import __version__
+from .exceptions import ParsingError, ReferenceResolutionError
+from .fingerprint import DIGEST_SIZE, Fingerprints
+from .lazy import LazyMapping
+from .nodes import object_items, unwrap_root
+from .remote import write_atomic
+from .validators import (
+    TYPE_TESTS,
+    SchemaCompiler,
+    SchemaValidator,
+    compile_pattern,
+    component_schema,
+    number_bounds,
+    schema_keywords,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the generated code changes
+CODEGEN_FORMAT = 2
+
+# Everything besides the schemas that decides what a generated module looks like
+_VERSION_TAG = (
+    f"format {CODEGEN_FORMAT}|parser {__version__}|"
+    f"python {sys.version_info[0]}.{sys.version_info[1]}"
+).encode("utf-8")
+
+# Nesting at which a subschema gets a function of its own instead of being inlined: Python
+# allows at most 20 nested loops and 100 levels of indentation
+_MAX_LOOPS = 8
+_MAX_INDENT = 40
+
+# JSON Schema type name -> expression testing a value, equivalent to validators.TYPE_TESTS
+_TYPE_EXPRESSIONS = {
+    "null": "{0} is None",
+    "boolean": "isinstance({0}, bool)",
+    "object": "isinstance({0}, dict)",
+    "array": "isinstance({0}, list)",
+    "string": "isinstance({0}, str)",
+    "number": "isinstance({0}, (int, float)) and not isinstance({0}, bool)",
+    "integer": "is_integer({0})",
+}
+
+_HEADER = '''\
+# Generated by {package}.codegen from the component schemas of an OpenAPI document.
+# Do not edit: a new module is generated whenever the schemas change.
+import json as _json
+import re
+
+from {package}.validators import (
+    add_error,
+    is_integer,
+    json_equal,
+    json_key,
+    value_repr,
+)
+'''
+
+_PACKAGE = __name__.rpartition(".")[0]
+
+Lines = List[str]
+
+
+def _indent(lines: Lines, levels: int = 1) -> Lines:
+    prefix = "    " * levels
+    return [prefix + line for line in lines]
+
+
+def _literal(value: Any) -> str:
+    # Python source for a JSON value
+    text = repr(value)
+    try:
+        if ast.literal_eval(text) == value:
+            return text
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        pass
+    # Infinities, NaN and values that do not print as literals
+    return f"_json.loads({json.dumps(value)!r})"
+
+
+class _Generator:
+    """
+    Writes the source of a module with one validator function per component schema.
+
+    Every schema is turned into straight-line checks that mirror the closures built by
+    SchemaCompiler, keyword by keyword and message by message. Subschemas are inlined into the
+    function of their schema; references become direct calls to the function of their target.
+
+    Attributes:
+        functions (Dict[str, str]): Component schema name -> function name.
+        external (Dict[str, str]): Other references -> hex fingerprint of their target.
+    """
+
+    def __init__(self, section: Dict[str, Any], compiler: SchemaCompiler):
+        self.section = section
+        self.compiler = compiler
+        self.functions = {name: f"_schema{index}" for index, name in enumerate(section)}
+        self.external: Dict[str, str] = {}
+        self._references: Dict[str, str] = {}
+        self._pending: List[Tuple[str, str, Any]] = [
+            (self.functions[name], f"Schema {name!r}", schema) for name, schema in section.items()
+        ]
+        self._constants: Lines = []
+        self._counter = 0
+
+    def source(self) -> str:
+        """Generates the module."""
+        functions: Lines = []
+        # Functions may queue more functions, for references and deeply nested subschemas
+        while self._pending:
+            name, comment, schema = self._pending.pop(0)
+            body = self._body(schema, "value", "location", "errors", 1, 0)
+            functions += ["", "", f"# {comment}", f"def {name}(value, location, errors):"]
+            functions += _indent(body or ["pass"])
+        lines = [_HEADER.format(package=_PACKAGE)] + self._constants + functions + ["", ""]
+        lines.append("VALIDATORS = {")
+        lines += [f"    {name!r}: {function}," for name, function in self.functions.items()]
+        lines += ["}", "", "EXTERNAL = {"]
+        lines += [f"    {ref!r}: {digest!r}," for ref, digest in self.external.items()]
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    def _variable(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def _constant(self, source: str) -> str:
+        name = f"_K{len(self._constants)}"
+        self._constants.append(f"{name} = {source}")
+        return name
+
+    def _reference(self, ref: str) -> str:
+        name = component_schema(ref)
+        if name is not None and name in self.functions:
+            return self.functions[name]
+        function = self._references.get(ref)
+        if function is None:
+            target = self.compiler.resolve(ref)
+            function = self._references[ref] = f"_ref{len(self._references)}"
+            # The module is only current while the target is unchanged
+            self.external[ref] = Fingerprints(target).digest().hex()
+            self._pending.append((function, f"Reference {ref!r}", target))
+        return function
+
+    def _nested(self, schema: Any, value: str, location: str, errors: str, indent: int,
+                loops: int) -> Lines:
+        if indent <= _MAX_INDENT and loops <= _MAX_LOOPS:
+            return self._body(schema, value, location, errors, indent, loops)
+        function = self._variable("_check")
+        self._pending.append((function, "Nested schema", schema))
+        return [f"{function}({value}, {location}, {errors})"]
+
+    def _body(self, schema: Any, value: str, location: str, errors: str, indent: int,
+              loops: int) -> Lines:
+        """
+        Generates the checks of a schema.
+
+        Args:
+            schema (Any): The schema.
+            value (str): Name of the variable holding the value.
+            location (str): Expression for the location of the value; only evaluated when an
+                error is reported, or passed to another function.
+            errors (str): Name of the list errors are appended to.
+            indent (int): Indentation level the lines are placed at.
+            loops (int): Number of loops the lines are placed in.
+
+        Returns:
+            Lines: The statements, without indentation; empty if the schema accepts anything.
+        """
+        schema = unwrap_root(schema)
+        if schema is True or schema is None:
+            return []
+        if schema is False:
+            return [f"add_error({errors}, {location}, 'False schema does not allow any value')"]
+        keywords = schema_keywords(schema)
+        nullable = keywords.get("nullable") is True
+        if nullable:
+            indent += 1
+        context = (value, location, errors, indent, loops)
+        lines: Lines = []
+        ref = keywords.get("$ref")
+        if isinstance(ref, str):
+            lines.append(f"{self._reference(ref)}({value}, {location}, {errors})")
+        if "type" in keywords:
+            lines += self._type(keywords["type"], value, location, errors)
+        if "enum" in keywords:
+            lines += self._enum(keywords["enum"], value, location, errors)
+        if "const" in keywords:
+            constant = keywords["const"]
+            message = f"{constant!r} was expected"
+            lines += [f"if not json_equal({value}, {self._constant(_literal(constant))}):",
+                      f"    add_error({errors}, {location}, {message!r})"]
+        lines += self._number(keywords, value, location, errors)
+        lines += self._string(keywords, value, location, errors)
+        lines += self._array(keywords, *context)
+        lines += self._object(keywords, *context)
+        lines += self._logic(keywords, *context)
+        if nullable and lines:
+            return [f"if {value} is not None:"] + _indent(lines)
+        return lines
+
+    @staticmethod
+    def _fail(errors: str, location: str, value: str, message: str) -> str:
+        # Reports the shortened value followed by a fixed message
+        return f"add_error({errors}, {location}, value_repr.repr({value}) + {message!r})"
+
+    def _type(self, names: Union[str, List[str]], value: str, location: str,
+              errors: str) -> Lines:
+        names = [names] if isinstance(names, str) else list(names)
+        unknown = [name for name in names if name not in TYPE_TESTS]
+        if unknown:
+            raise ParsingError(f"Invalid schema: unknown type {unknown[0]!r}")
+        expected = names[0] if len(names) == 1 else names
+        tests = [_TYPE_EXPRESSIONS[name].format(value) for name in names]
+        test = tests[0] if len(tests) == 1 else " or ".join(f"({test})" for test in tests)
+        return [f"if not ({test}):",
+                "    " + self._fail(errors, location, value, f" is not of type {expected!r}")]
+
+    def _enum(self, options: List[Any], value: str, location: str, errors: str) -> Lines:
+        options = list(options)
+        if all(isinstance(option, str) for option in options):
+            strings = self._constant(f"frozenset({_literal(options)})")
+            test = f"isinstance({value}, str) and {value} in {strings}"
+        else:
+            constant = self._constant(_literal(options))
+            test = f"any(json_equal({value}, option) for option in {constant})"
+        return [f"if not ({test}):",
+                "    " + self._fail(errors, location, value, f" is not one of {options!r}")]
+
+    def _number(self, keywords: Dict[str, Any], value: str, location: str,
+                errors: str) -> Lines:
+        minimum, maximum, exclusive_minimum, exclusive_maximum, multiple_of = (
+            number_bounds(keywords))
+        bounds = [
+            (minimum, "<", "is less than the minimum of"),
+            (maximum, ">", "is greater than the maximum of"),
+            (exclusive_minimum, "<=", "is less than or equal to the minimum of"),
+            (exclusive_maximum, ">=", "is greater than or equal to the maximum of"),
+        ]
+        lines: Lines = []
+        for bound, operator, text in bounds:
+            if bound is not None:
+                message = f" {text} {bound!r}"
+                lines += [f"if {value} {operator} {_literal(bound)}:",
+                          f"    add_error({errors}, {location}, repr({value}) + {message!r})"]
+        if multiple_of is not None:
+            divisor = _literal(multiple_of)
+            failed, quotient = self._variable("f"), self._variable("q")
+            division = [f"{quotient} = {value} / {divisor}",
+                        "try:",
+                        f"    {failed} = int({quotient}) != {quotient}",
+                        "except OverflowError:",
+                        f"    {failed} = True"]
+            if isinstance(multiple_of, int):
+                lines += [f"if isinstance({value}, int):",
+                          f"    {failed} = {value} % {divisor} != 0",
+                          "else:"] + _indent(division)
+            else:
+                lines += division
+            message = f" is not a multiple of {multiple_of!r}"
+            lines += [f"if {failed}:",
+                      f"    add_error({errors}, {location}, repr({value}) + {message!r})"]
+        if not lines:
+            return []
+        return [f"if isinstance({value}, (int, float)) and not isinstance({value}, bool):"] + (
+            _indent(lines))
+
+    def _string(self, keywords: Dict[str, Any], value: str, location: str,
+                errors: str) -> Lines:
+        min_length = keywords.get("minLength")
+        max_length = keywords.get("maxLength")
+        pattern = keywords.get("pattern")
+        lines: Lines = []
+        if min_length is not None:
+            lines += [f"if len({value}) < {_literal(min_length)}:",
+                      "    " + self._fail(errors, location, value, " is too short")]
+        if max_length is not None:
+            lines += [f"if len({value}) > {_literal(max_length)}:",
+                      "    " + self._fail(errors, location, value, " is too long")]
+        if pattern is not None:
+            # Invalid patterns fail here, as they do when compiling closures
+            compile_pattern(pattern)
+            regex = self._constant(f"re.compile({pattern!r})")
+            lines += [f"if not {regex}.search({value}):",
+                      "    " + self._fail(errors, location, value, f" does not match {pattern!r}")]
+        if not lines:
+            return []
+        return [f"if isinstance({value}, str):"] + _indent(lines)
+
+    def _array(self, keywords: Dict[str, Any], value: str, location: str, errors: str,
+               indent: int, loops: int) -> Lines:
+        items = keywords.get("items")
+        prefix = keywords.get("prefixItems")
+        if isinstance(items, list):
+            # The tuple form of items, before prefixItems existed
+            prefix, items = items, keywords.get("additionalItems")
+        prefix = list(prefix or ())
+        contains = keywords.get("contains")
+        min_items = keywords.get("minItems")
+        max_items = keywords.get("maxItems")
+        lines: Lines = []
+        if min_items is not None:
+            lines += [f"if len({value}) < {_literal(min_items)}:",
+                      "    " + self._fail(errors, location, value, " is too short")]
+        if max_items is not None:
+            lines += [f"if len({value}) > {_literal(max_items)}:",
+                      "    " + self._fail(errors, location, value, " is too long")]
+        for index, schema in enumerate(prefix):
+            item = self._variable("v")
+            body = self._nested(schema, item, f"({location}, {index})", errors, indent + 2, loops)
+            if body:
+                lines += [f"if len({value}) > {index}:", f"    {item} = {value}[{index}]"]
+                lines += _indent(body)
+        if items is not None:
+            index, item = self._variable("i"), self._variable("v")
+            body = self._nested(items, item, f"({location}, {index})", errors, indent + 2,
+                                loops + 1)
+            if body and prefix:
+                lines += [f"for {index} in range({len(prefix)}, len({value})):",
+                          f"    {item} = {value}[{index}]"] + _indent(body)
+            elif body:
+                lines += [f"for {index}, {item} in enumerate({value}):"] + _indent(body)
+        if contains is not None:
+            found, item, trial = self._variable("n"), self._variable("v"), self._variable("t")
+            body = self._nested(contains, item, location, trial, indent + 2, loops + 1)
+            if body:
+                lines += [f"{found} = 0", f"for {item} in {value}:", f"    {trial} = []"]
+                lines += _indent(body) + [f"    {found} += not {trial}"]
+            else:
+                lines.append(f"{found} = len({value})")
+            lines += [f"if {found} < {_literal(keywords.get('minContains', 1))}:",
+                      "    " + self._fail(errors, location, value,
+                                          " does not contain enough items matching 'contains'")]
+            max_contains = keywords.get("maxContains")
+            if max_contains is not None:
+                lines += [f"if {found} > {_literal(max_contains)}:",
+                          "    " + self._fail(errors, location, value,
+                                              " contains too many items matching 'contains'")]
+        if keywords.get("uniqueItems") is True:
+            distinct = self._variable("d")
+            lines += ["try:",
+                      f"    {distinct} = len({{json_key(item) for item in {value}}})",
+                      "except TypeError:",
+                      f"    {distinct} = len({value})",
+                      f"if {distinct} < len({value}):",
+                      "    " + self._fail(errors, location, value, " has non-unique elements")]
+        if not lines:
+            return []
+        return [f"if isinstance({value}, list):"] + _indent(lines)
+
+    def _object(self, keywords: Dict[str, Any], value: str, location: str, errors: str,
+                indent: int, loops: int) -> Lines:
+        lines: Lines = []
+        for name in keywords.get("required") or ():
+            message = f"{name!r} is a required property"
+            lines += [f"if {name!r} not in {value}:",
+                      f"    add_error({errors}, {location}, {message!r})"]
+        min_properties = keywords.get("minProperties")
+        if min_properties is not None:
+            lines += [f"if len({value}) < {_literal(min_properties)}:",
+                      "    " + self._fail(errors, location, value,
+                                          " does not have enough properties")]
+        max_properties = keywords.get("maxProperties")
+        if max_properties is not None:
+            lines += [f"if len({value}) > {_literal(max_properties)}:",
+                      "    " + self._fail(errors, location, value, " has too many properties")]
+        # Listed properties are checked in the order of the schema, as the closures do
+        properties = list(object_items(unwrap_root(keywords.get("properties"))) or ())
+        for name, schema in properties:
+            item = self._variable("v")
+            body = self._nested(schema, item, f"({location}, {name!r})", errors, indent + 2,
+                                loops)
+            if body:
+                lines += [f"if {name!r} in {value}:", f"    {item} = {value}[{name!r}]"]
+                lines += _indent(body)
+        lines += self._entries(keywords, [name for name, _ in properties], value, location,
+                               errors, indent, loops)
+        for name, needed in dict(keywords.get("dependentRequired") or {}).items():
+            for other in needed:
+                message = f"{other!r} is a dependency of {name!r}"
+                lines += [f"if {name!r} in {value} and {other!r} not in {value}:",
+                          f"    add_error({errors}, {location}, {message!r})"]
+        for name, schema in object_items(unwrap_root(keywords.get("dependentSchemas"))) or ():
+            body = self._nested(schema, value, location, errors, indent + 2, loops)
+            if body:
+                lines += [f"if {name!r} in {value}:"] + _indent(body)
+        if not lines:
+            return []
+        return [f"if isinstance({value}, dict):"] + _indent(lines)
+
+    def _entries(self, keywords: Dict[str, Any], known: List[str], value: str, location: str,
+                 errors: str, indent: int, loops: int) -> Lines:
+        # propertyNames, patternProperties and additionalProperties, in one walk of the entries
+        key, item, matched = self._variable("k"), self._variable("v"), self._variable("m")
+        additional = keywords.get("additionalProperties")
+        names = keywords.get("propertyNames")
+        if additional is False:
+            unmatched = [f"add_error({errors}, {location}, "
+                         f"'Additional properties are not allowed (' + repr({key}) + "
+                         f"' was unexpected)')"]
+        else:
+            unmatched = self._nested(additional, item, f"({location}, {key})", errors,
+                                     indent + 3, loops + 1)
+        body: Lines = []
+        if names is not None:
+            body += self._nested(names, key, location, errors, indent + 2, loops + 1)
+        if unmatched:
+            body.append(f"{matched} = {key} in {self._constant(f'frozenset({known!r})')}")
+        for pattern, schema in object_items(unwrap_root(keywords.get("patternProperties"))) or ():
+            compile_pattern(pattern)
+            regex = self._constant(f"re.compile({pattern!r})")
+            checks = self._nested(schema, item, f"({location}, {key})", errors, indent + 3,
+                                  loops + 1)
+            if unmatched:
+                checks = [f"{matched} = True"] + checks
+            if checks:
+                body += [f"if {regex}.search({key}):"] + _indent(checks)
+        if unmatched:
+            body += [f"if not {matched}:"] + _indent(unmatched)
+        if not body:
+            return []
+        return [f"for {key}, {item} in {value}.items():"] + _indent(body)
+
+    def _trial(self, schema: Any, value: str, location: str, indent: int,
+               loops: int) -> Tuple[Optional[str], Lines]:
+        # Runs a subschema into a list of its own, to tell whether the value passes it. The
+        # list is None when the subschema accepts everything.
+        trial = self._variable("t")
+        body = self._nested(schema, value, location, trial, indent, loops)
+        if not body:
+            return None, []
+        return trial, [f"{trial} = []"] + body
+
+    def _logic(self, keywords: Dict[str, Any], value: str, location: str, errors: str,
+               indent: int, loops: int) -> Lines:
+        lines: Lines = []
+        for schema in keywords.get("allOf") or ():
+            lines += self._nested(schema, value, location, errors, indent, loops)
+        any_of = keywords.get("anyOf") or ()
+        if any_of:
+            matched = self._variable("m")
+            for position, schema in enumerate(any_of):
+                trial, block = self._trial(schema, value, location, indent + 1, loops)
+                block.append(f"{matched} = not {trial}" if trial else f"{matched} = True")
+                lines += block if not position else [f"if not {matched}:"] + _indent(block)
+            lines += [f"if not {matched}:",
+                      "    " + self._fail(errors, location, value,
+                                          " is not valid under any of the given schemas")]
+        one_of = keywords.get("oneOf") or ()
+        if one_of:
+            matches = self._variable("m")
+            lines.append(f"{matches} = 0")
+            for position, schema in enumerate(one_of):
+                trial, block = self._trial(schema, value, location, indent + 1, loops)
+                block.append(f"{matches} += not {trial}" if trial else f"{matches} += 1")
+                # The closures stop once two subschemas match
+                lines += block if position < 2 else [f"if {matches} < 2:"] + _indent(block)
+            lines += [f"if {matches} > 1:",
+                      "    " + self._fail(errors, location, value,
+                                          " is valid under each of several schemas"),
+                      f"elif not {matches}:",
+                      "    " + self._fail(errors, location, value,
+                                          " is not valid under any of the given schemas")]
+        if "not" in keywords:
+            trial, block = self._trial(keywords["not"], value, location, indent, loops)
+            failure = self._fail(errors, location, value,
+                                 " should not be valid under the 'not' schema")
+            lines += block + [f"if not {trial}:", "    " + failure] if trial else [failure]
+        if "if" in keywords:
+            then = self._nested(keywords.get("then"), value, location, errors, indent + 1, loops)
+            otherwise = self._nested(keywords.get("else"), value, location, errors, indent + 1,
+                                     loops)
+            trial, block = self._trial(keywords["if"], value, location, indent, loops)
+            if trial is None:
+                lines += then
+            elif then or otherwise:
+                lines += block + [f"if not {trial}:"] + _indent(then or ["pass"])
+                if otherwise:
+                    lines += ["else:"] + _indent(otherwise)
+        return lines
+
+
+def _schemas_section(document: Any) -> Dict[str, Any]:
+    # The component schemas of a raw document, an OpenAPI model or a LazyOpenAPI
+    document = unwrap_root(document)
+    if isinstance(document, dict):
+        components = document.get("components")
+    else:
+        components = getattr(document, "components", None)
+    if isinstance(components, dict):
+        schemas = components.get("schemas")
+    else:
+        schemas = getattr(components, "schemas", None)
+    if isinstance(schemas, LazyMapping):
+        # The raw entries, so that nothing is validated
+        return {name: schemas.raw(name) for name in schemas}
+    return dict(schemas or {})
+
+
+def generate_source(document: Any) -> str:
+    """
+    Generates the Python source of validators for the component schemas of a document.
+
+    Args:
+        document (Any): A raw document, an OpenAPI model or a LazyOpenAPI.
+
+    Returns:
+        str: A module defining VALIDATORS, a dict that maps each schema name to a function
+            with the signature of a compiled check.
+
+    Raises:
+        ParsingError: If a schema is invalid.
+        ReferenceResolutionError: If a reference cannot be resolved.
+    """
+    return _Generator(_schemas_section(document), SchemaCompiler(document)).source()
+
+
+def _section_digest(section: Dict[str, Any]) -> bytes:
+    # Raw schemas are hashed as canonical JSON, which is much faster than fingerprinting them
+    try:
+        text = json.dumps(section, sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        # Schema models, and values JSON cannot represent
+        return b"f" + Fingerprints(section).digest()
+    return b"j" + hashlib.blake2b(text.encode("utf-8", "surrogatepass"),
+                                  digest_size=DIGEST_SIZE).digest()
+
+
+def _import(path: Path, name: str) -> ModuleType:
+    # Loaded through the import system, which uses the bytecode in __pycache__ when present
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+class GeneratedValidators(Mapping):
+    """
+    Validators of a document's component schemas, generated as Python source.
+
+    The checks of every schema are written out as one plain function, with constants and
+    subschemas inlined and references turned into direct calls, so validating a value runs no
+    per-keyword dispatch at all. The results, including the error messages and their order,
+    are the same as those of the validators compiled by SchemaCompiler.
+
+    With a cache_dir, the generated module is stored there under the fingerprint of the
+    schemas and the parser and Python versions, and imported like any other module, so later
+    processes load its bytecode from __pycache__ and skip generation. Only point cache_dir at
+    a directory that untrusted users cannot write: the modules are executed.
+
+    Pass the object to SchemaCompiler (or compile operations with it) to have references to
+    component schemas use the generated functions.
+
+    Attributes:
+        document (Any): The document whose schemas were generated.
+        key (str): Hex digest identifying the schemas and the generator.
+        path (Optional[Path]): The module file, or None without a cache directory.
+        cached (bool): Whether the module was loaded from the cache directory.
+    """
+
+    def __init__(self, document: Any, cache_dir: Optional[Union[str, Path]] = None):
+        self.document = document
+        self._section = _schemas_section(document)
+        self._compiler = SchemaCompiler(document)
+        digest = hashlib.sha256(_VERSION_TAG)
+        digest.update(b"\0")
+        digest.update(_section_digest(self._section))
+        self.key = digest.hexdigest()
+        self.path = Path(cache_dir) / f"schemas_{self.key}.py" if cache_dir is not None else None
+        self.cached = False
+        module = self._load()
+        self._validators = {
+            name: SchemaValidator(self._section[name], function)
+            for name, function in module.VALIDATORS.items()
+        }
+
+    def __getitem__(self, name: str) -> SchemaValidator:
+        return self._validators[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._validators)
+
+    def __len__(self) -> int:
+        return len(self._validators)
+
+    def __repr__(self) -> str:
+        return f"GeneratedValidators({len(self._validators)} schemas, key={self.key[:12]})"
+
+    def _load(self) -> ModuleType:
+        name = f"_fountainai_schemas_{self.key}"
+        if self.path is not None and self.path.exists():
+            try:
+                module = _import(self.path, name)
+            except Exception as e:
+                logger.warning("Ignoring unreadable generated validators %s: %s", self.path, e)
+            else:
+                if self._is_current(module):
+                    self.cached = True
+                    return module
+        source = _Generator(self._section, self._compiler).source()
+        if self.path is not None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                write_atomic(self.path, source.encode("utf-8"))
+                # Written here, as imports do not write bytecode under PYTHONDONTWRITEBYTECODE.
+                # The hash of the source is checked when the bytecode is loaded.
+                py_compile.compile(str(self.path), doraise=True,
+                                   invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+                return _import(self.path, name)
+            except (OSError, py_compile.PyCompileError) as e:
+                logger.warning("Could not write the generated validators %s: %s", self.path, e)
+        module = ModuleType(name)
+        exec(compile(source, f"<{name}>", "exec"), module.__dict__)
+        return module
+
+    def _is_current(self, module: ModuleType) -> bool:
+        # References outside the component schemas are not covered by the key
+        for ref, expected in getattr(module, "EXTERNAL", {}).items():
+            try:
+                target = self._compiler.resolve(ref)
+            except ReferenceResolutionError:
+                return False
+            if Fingerprints(target).digest().hex() != expected:
+                return False
+        return hasattr(module, "VALIDATORS")
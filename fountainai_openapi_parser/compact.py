@@ -0,0 +1,214 @@
+from typing import Any, Dict, Iterator, List, Mapping, Tuple, Union
+
+from .exceptions import ParsingError
+from .lazy import LazyMapping
+from .models import Schema
+from .nodes import object_items
+
+# Keywords whose value is a schema, a list of schemas or a boolean
+_SUBSCHEMA_KEYWORDS = frozenset({
+    "contentSchema", "items", "prefixItems", "contains", "unevaluatedItems",
+    "additionalProperties", "propertyNames", "unevaluatedProperties",
+    "allOf", "anyOf", "oneOf", "not", "if", "then", "else",
+})
+
+# Keywords whose value maps names to schemas
+_SCHEMA_MAP_KEYWORDS = frozenset({"properties", "patternProperties", "dependentSchemas"})
+
+
+class CompactMap(Mapping):
+    """
+    Read-only mapping that stores its values in a tuple.
+
+    The key -> position index is shared by every mapping loaded with the same keys, in the
+    same order, so a mapping costs little more than the tuple of its values. Lists in the
+    document are stored as tuples and objects as CompactMap; to_dict() turns them back.
+    """
+
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        raise TypeError(f"{type(self).__name__} objects are created by compact_schema()")
+
+    @classmethod
+    def _make(cls, index: Dict[str, int], values: Tuple[Any, ...]) -> "CompactMap":
+        new = object.__new__(cls)
+        _set_index(new, index)
+        _set_values(new, values)
+        return new
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._index[key]]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self._index.get(key)
+        return default if position is None else self._values[position]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return _thaw_load, (type(self), self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the content as plain dicts and lists, as it appears in the document."""
+        return {key: _thaw(value) for key, value in zip(self._index, self._values)}
+
+
+class CompactSchema(CompactMap):
+    """
+    A Schema that stores only the keywords that are set.
+
+    Keywords are looked up by their key in the document ("$ref", "not", "if", ...), as in a raw
+    schema. Subschemas are CompactSchema objects, lists of subschemas are tuples and
+    properties, patternProperties and dependentSchemas are CompactMap objects of CompactSchema.
+    """
+
+    __slots__ = ()
+
+    def to_model(self) -> Schema:
+        """Validates the content and returns the equivalent Schema model."""
+        return Schema.model_validate(self.to_dict())
+
+
+_set_index = CompactMap._index.__set__
+_set_values = CompactMap._values.__set__
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, CompactMap):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _thaw_load(cls: type, content: Dict[str, Any]) -> CompactMap:
+    # Unpickles a CompactMap or CompactSchema
+    loader = _Loader()
+    return loader.schema(content) if cls is CompactSchema else loader.value(content)
+
+
+class _Loader:
+    # Interns keys and strings, and shares key indexes, across everything one loader loads
+
+    __slots__ = ("_strings", "_indexes")
+
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+        self._indexes: Dict[Tuple[str, ...], Dict[str, int]] = {}
+
+    def _string(self, value: str) -> str:
+        return self._strings.setdefault(value, value)
+
+    def _mapping(self, cls: type, keys: List[str], values: List[Any]) -> CompactMap:
+        shape = tuple(keys)
+        index = self._indexes.get(shape)
+        if index is None:
+            index = self._indexes[shape] = {key: position for position, key in enumerate(shape)}
+        return cls._make(index, tuple(values))
+
+    def schema(self, schema: Any) -> CompactSchema:
+        entries = object_items(schema)
+        if entries is None:
+            raise ParsingError(f"Invalid schema: {schema!r}")
+        keys = []
+        values = []
+        for key, value in entries:
+            keys.append(self._string(key))
+            if key in _SUBSCHEMA_KEYWORDS and value is not None and not isinstance(value, bool):
+                value = (tuple(self.schema(item) for item in value)
+                         if isinstance(value, list) else self.schema(value))
+            elif key in _SCHEMA_MAP_KEYWORDS and value is not None:
+                names = object_items(value)
+                if names is None:
+                    raise ParsingError(f"Invalid schema: {key} must be a mapping")
+                value = self._schemas(names)
+            else:
+                value = self.value(value)
+            values.append(value)
+        return self._mapping(CompactSchema, keys, values)
+
+    def _schemas(self, entries: Any) -> CompactMap:
+        keys = []
+        values = []
+        for name, schema in entries:
+            keys.append(self._string(name))
+            values.append(self.schema(schema))
+        return self._mapping(CompactMap, keys, values)
+
+    def value(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self._string(value)
+        if isinstance(value, (list, tuple)):
+            return tuple(self.value(item) for item in value)
+        entries = object_items(value)
+        if entries is None:
+            return value
+        keys = []
+        values = []
+        for key, item in entries:
+            keys.append(self._string(key))
+            values.append(self.value(item))
+        return self._mapping(CompactMap, keys, values)
+
+
+def compact_schema(schema: Union[Schema, Dict[str, Any]]) -> CompactSchema:
+    """
+    Converts a schema to its compact form.
+
+    Only the keywords that are set are kept: the fields in model_fields_set of a Schema, or the
+    keys of a raw schema. A raw schema is not validated; call to_model() on the result to
+    validate it.
+
+    Args:
+        schema (Union[Schema, Dict[str, Any]]): A Schema model or a raw schema.
+
+    Returns:
+        CompactSchema: The compact schema.
+
+    Raises:
+        ParsingError: If the schema, or one of its subschemas, is not an object.
+    """
+    return _Loader().schema(schema)
+
+
+def compact_schemas(document: Any) -> Dict[str, CompactSchema]:
+    """
+    Converts every component schema of a document to its compact form.
+
+    The schemas are loaded together, so that keys and strings repeated across schemas are
+    stored once. Lazily parsed documents are read from their raw entries, without validating
+    them into models first.
+
+    Args:
+        document (Any): An OpenAPI model, a lazily parsed document or the raw content.
+
+    Returns:
+        Dict[str, CompactSchema]: Component schema names mapped to their compact schemas.
+
+    Raises:
+        ParsingError: If a component schema is not an object.
+    """
+    if isinstance(document, dict):
+        schemas = (document.get("components") or {}).get("schemas") or {}
+    else:
+        components = document.components
+        schemas = (components.schemas if components is not None else None) or {}
+    loader = _Loader()
+    if isinstance(schemas, LazyMapping):
+        return {name: loader.schema(schemas.raw(name)) for name in schemas}
+    return {name: loader.schema(schema) for name, schema in schemas.items()}
+
@@ -36,3 +36,17 @@ class ReferenceResolutionError(Exception):
     def __init__(self, message: str):
         super().__init__(message)
         self.message = message
+
+
+class JsonPointerError(ReferenceResolutionError):
+    """
+    Raised when a JSON Pointer is malformed or does not match the document.
+
+    Attributes:
+        message (str): Description of the pointer error.
+        pointer (str): The JSON Pointer that failed.
+    """
+
+    def __init__(self, message: str, pointer: str = ""):
+        super().__init__(message)
+        self.pointer = pointer
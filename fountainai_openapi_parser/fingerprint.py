@@ -0,0 +1,278 @@
+import gc
+import hashlib
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from pydantic import BaseModel
+
+from .exceptions import JsonPointerError
+from .nodes import object_items, unwrap_root
+from .pointer import Tokens, format_pointer, parse_pointer, resolve_token
+
+# Size in bytes of each node digest
+DIGEST_SIZE = 16
+
+
+def _is_container(node: Any) -> bool:
+    return isinstance(node, (dict, list, BaseModel))
+
+
+def _encode(tag: bytes, text: str) -> bytes:
+    data = text.encode("utf-8", "surrogatepass")
+    return tag + len(data).to_bytes(4, "big") + data
+
+
+def _encode_scalar(value: Any) -> bytes:
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, str):
+        return _encode(b"s", value)
+    if value is None:
+        return b"n"
+    if isinstance(value, bool):
+        return b"t" if value else b"f"
+    if isinstance(value, float) and value.is_integer():
+        # One form per number, as in JSON: models store 'minimum: 0' as 0.0
+        value = int(value)
+    if isinstance(value, int):
+        return _encode(b"i", str(value))
+    if isinstance(value, float):
+        return _encode(b"d", repr(value))
+    # URLs, dates and other values loaded as objects
+    return _encode(b"x", str(value))
+
+
+def _compute(root: Any, digests: Dict[int, bytes]) -> None:
+    """
+    Computes the digest of every container node under root, in one post-order pass.
+
+    A node shared at several places of the tree (e.g. a YAML anchor or a resolved $ref) is
+    hashed once. Digests are stored in digests under id(node).
+
+    Raises:
+        ValueError: If the tree contains a cycle.
+    """
+    blake2b = hashlib.blake2b
+    # Keys and strings repeat a lot ('type', 'string', ...), so their encodings are reused
+    keys: Dict[str, bytes] = {}
+    strings: Dict[str, bytes] = {}
+    entered = set()
+    stack: List[Tuple[Any, bool]] = [(root, False)]
+    # The pass allocates many small objects; pausing the collector makes it much faster
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while stack:
+            node, done = stack.pop()
+            key = id(node)
+            if not done:
+                if key in digests:
+                    continue
+                if key in entered:
+                    # Entered but not finished: the node is one of its own ancestors
+                    raise ValueError("Cannot fingerprint a cyclic document")
+                entered.add(key)
+                stack.append((node, True))
+                if type(node) is dict:
+                    values: Iterable[Any] = node.values()
+                elif type(node) is list:
+                    values = node
+                else:
+                    values = [value for _, value in object_items(node)]
+                for value in values:
+                    if isinstance(value, (dict, list, BaseModel)):
+                        stack.append((unwrap_root(value), False))
+                continue
+            is_list = type(node) is list
+            parts = []
+            for name, value in (enumerate(node) if is_list else object_items(node)):
+                kind = type(value)
+                if kind is str:
+                    encoded = strings.get(value)
+                    if encoded is None:
+                        encoded = strings[value] = _encode(b"s", value)
+                elif kind is dict or kind is list:
+                    encoded = b"#" + digests[id(value)]
+                else:
+                    encoded = _child_bytes(unwrap_root(value), digests)
+                if not is_list:
+                    # Keys are compared as strings, as in JSON
+                    if type(name) is str:
+                        prefix = keys.get(name)
+                        if prefix is None:
+                            prefix = keys[name] = _encode(b"k", name)
+                    else:
+                        prefix = _encode(b"k", str(name))
+                    encoded = prefix + encoded
+                parts.append(encoded)
+            if not is_list:
+                # Entries start with their unique key, so sorting them makes the digest
+                # independent of key order
+                parts.sort()
+            data = (b"a" if is_list else b"o") + b"".join(parts)
+            digests[key] = blake2b(data, digest_size=DIGEST_SIZE).digest()
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _child_bytes(value: Any, digests: Dict[int, bytes]) -> bytes:
+    if isinstance(value, (dict, list, BaseModel)):
+        return b"#" + digests[id(value)]
+    return _encode_scalar(value)
+
+
+class Fingerprints:
+    """
+    Structural content hashes (Merkle digests) of every node of a document.
+
+    The digest of a node is computed from the digests of its children, so two subtrees have
+    the same fingerprint exactly when they have the same content, wherever they appear and in
+    whichever document. Objects are hashed with sorted keys and arrays in order. A pydantic
+    model is hashed as the fields that were set, under their aliases, so a model that round
+    trips its raw document has the same fingerprints as that document.
+
+    All digests are computed in one linear pass when the object is created; lookups then walk
+    the pointer and return the stored digest. The digests are a snapshot: after the document
+    is modified, compute new fingerprints.
+
+    Attributes:
+        document (Any): The raw document or model that was hashed.
+    """
+
+    def __init__(self, document: Any):
+        self.document = document
+        self._digests: Dict[int, bytes] = {}
+        root = unwrap_root(document)
+        if _is_container(root):
+            _compute(root, self._digests)
+
+    def __len__(self) -> int:
+        """Number of distinct object and array nodes that were hashed."""
+        return len(self._digests)
+
+    def node(self, pointer: Union[str, Tokens] = "") -> Any:
+        """
+        Evaluates a JSON Pointer against the document; model fields are looked up by alias.
+
+        Raises:
+            JsonPointerError: If the pointer does not match the document.
+        """
+        tokens = parse_pointer(pointer) if isinstance(pointer, str) else pointer
+        node = unwrap_root(self.document)
+        for depth, token in enumerate(tokens):
+            if isinstance(node, BaseModel):
+                entries = {str(key): value for key, value in object_items(node)}
+                if token not in entries:
+                    raise JsonPointerError(
+                        f"JSON Pointer {format_pointer(tokens)!r}: key {token!r} not found "
+                        f"at {format_pointer(tokens[:depth]) or '/'}",
+                        format_pointer(tokens),
+                    )
+                node = entries[token]
+            else:
+                node = resolve_token(node, token, tokens, depth)
+            node = unwrap_root(node)
+        return node
+
+    def digest(self, pointer: Union[str, Tokens] = "") -> bytes:
+        """
+        Returns the raw digest of the node at a JSON Pointer.
+
+        Raises:
+            JsonPointerError: If the pointer does not match the document.
+            ValueError: If the node was added to the document after it was hashed.
+        """
+        return self._digest_of(self.node(pointer))
+
+    def __getitem__(self, pointer: Union[str, Tokens]) -> str:
+        return self.digest(pointer).hex()
+
+    def _digest_of(self, node: Any) -> bytes:
+        if _is_container(node):
+            digest = self._digests.get(id(node))
+            if digest is None:
+                raise ValueError(
+                    "The document was modified after its fingerprints were computed")
+            return digest
+        return hashlib.blake2b(_encode_scalar(node), digest_size=DIGEST_SIZE).digest()
+
+
+def fingerprints(document: Any) -> Fingerprints:
+    """
+    Returns the fingerprints of a raw document or model.
+
+    The document is hashed on every call, so keep the returned object to look up several
+    nodes of an unchanged document.
+
+    Args:
+        document (Any): A raw document (dicts and lists) or a model such as OpenAPI.
+
+    Returns:
+        Fingerprints: The fingerprints of every node of the document.
+
+    Raises:
+        ValueError: If the document contains a cycle.
+    """
+    return Fingerprints(document)
+
+
+def fingerprint(document: Any, pointer: Union[str, Tokens] = "") -> str:
+    """
+    Returns the structural fingerprint of one node of a document.
+
+    Args:
+        document (Any): A raw document or a model such as OpenAPI.
+        pointer (Union[str, Tokens], optional): JSON Pointer of the node, e.g.
+            '/components/schemas/Character'. Defaults to the whole document.
+
+    Returns:
+        str: The hex digest of the node.
+
+    Raises:
+        JsonPointerError: If the pointer does not match the document.
+    """
+    return fingerprints(document)[pointer]
+
+
+def diff(old: Any, new: Any) -> List[str]:
+    """
+    Lists the places where two documents differ, skipping every subtree that is unchanged.
+
+    Args:
+        old (Any): The first document or model.
+        new (Any): The second document or model.
+
+    Returns:
+        List[str]: JSON Pointers of the outermost nodes that were changed, added or removed,
+            in document order.
+    """
+    old_prints, new_prints = fingerprints(old), fingerprints(new)
+    changes: List[str] = []
+    stack: List[Tuple[Tokens, Any, Any]] = [((), unwrap_root(old), unwrap_root(new))]
+    while stack:
+        tokens, before, after = stack.pop()
+        if before is _MISSING or after is _MISSING:
+            changes.append(format_pointer(tokens))
+            continue
+        if old_prints._digest_of(before) == new_prints._digest_of(after):
+            continue
+        before_items, after_items = object_items(before), object_items(after)
+        if isinstance(before, list) and isinstance(after, list):
+            before_items, after_items = enumerate(before), enumerate(after)
+        elif before_items is None or after_items is None:
+            changes.append(format_pointer(tokens))
+            continue
+        before_items = {str(key): value for key, value in before_items}
+        after_items = {str(key): value for key, value in after_items}
+        children = [(key, value, after_items.get(key, _MISSING))
+                    for key, value in before_items.items()]
+        children += [(key, _MISSING, value)
+                     for key, value in after_items.items() if key not in before_items]
+        for key, before_child, after_child in reversed(children):
+            stack.append((tokens + (key,), unwrap_root(before_child), unwrap_root(after_child)))
+    return changes
+
+
+# Marks the side of a diff where an entry does not exist
+_MISSING = object()
@@ -0,0 +1,193 @@
+import hashlib
+import pickle
+import weakref
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from .exceptions import ParsingError
+from .fingerprint import DIGEST_SIZE
+from .lazy import COMPONENT_ADAPTERS, LAZY_FIELDS, validate_node
+from .models import Components, OpenAPI, PathItem
+from .pointer import escape_token
+
+# Digests of raw entries: {"paths": {key: digest}, "components": {section: {key: digest}}}
+_Digests = Dict[str, Any]
+
+# Digests of the raw entries each reparse result was built from, keyed by id(model). Entries
+# are dropped when their model is garbage collected.
+_sources: Dict[int, _Digests] = {}
+
+
+def _digest(entry: Any) -> Optional[bytes]:
+    # A digest of the pickled entry: much cheaper than a structural fingerprint, and equal
+    # content with the same key order gives the same digest. None if it cannot be pickled.
+    try:
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        return None
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+def _entry_digests(content: Dict[str, Any]) -> _Digests:
+    """
+    Records a digest of every path item and component entry of a raw document.
+
+    Digests are a snapshot of the content: unlike the raw dicts, which OpenAPI.paths shares
+    with the caller, they do not follow later in-place edits of the document.
+    """
+    digests: _Digests = {"paths": {}, "components": {}}
+    paths = content.get("paths")
+    if isinstance(paths, dict):
+        digests["paths"] = {key: _digest(item) for key, item in paths.items()}
+    components = content.get("components")
+    if isinstance(components, dict):
+        for name in COMPONENT_ADAPTERS:
+            section = components.get(name)
+            if isinstance(section, dict):
+                digests["components"][name] = {
+                    key: _digest(entry) for key, entry in section.items()
+                }
+    return digests
+
+
+def _remember_digests(model: OpenAPI, digests: _Digests) -> None:
+    key = id(model)
+    _sources[key] = digests
+    weakref.finalize(model, _sources.pop, key, None)
+
+
+def record_content(model: OpenAPI, content: Dict[str, Any]) -> None:
+    """
+    Records digests of the raw content a model was parsed from, for a later reparse.
+
+    parse_openapi calls this when track_changes is set; reparse records the digests of its
+    own results.
+
+    Args:
+        model (OpenAPI): The parsed model.
+        content (Dict[str, Any]): The raw document it was parsed from.
+    """
+    _remember_digests(model, _entry_digests(content))
+
+
+def _unchanged(raw: Any, digest: Optional[bytes], previous_digest: Any,
+               previous_model: Any) -> bool:
+    """
+    Tells whether a raw entry still matches the entry a previous model was built from.
+
+    Args:
+        raw (Any): The new raw entry.
+        digest (Optional[bytes]): The digest of the new raw entry, None if it has none.
+        previous_digest (Any): The digest of the raw entry of the previous document, or
+            _UNKNOWN if the previous document has no digests; the previous model is then
+            compared in its dumped form.
+        previous_model (Any): The previous validated entry.
+
+    Returns:
+        bool: True if the previous validated entry can be reused.
+    """
+    if previous_digest is not _UNKNOWN:
+        return digest is not None and digest == previous_digest
+    if isinstance(previous_model, BaseModel):
+        return previous_model.model_dump(by_alias=True, exclude_unset=True) == raw
+    return False
+
+
+def _reparse_components(previous: Optional[Components], raw: Dict[str, Any],
+                        previous_digests: Optional[Dict[str, Dict[str, Optional[bytes]]]],
+                        digests: Dict[str, Dict[str, Optional[bytes]]]) -> Components:
+    sections: Dict[str, Dict[str, Any]] = {}
+    for name, adapter in COMPONENT_ADAPTERS.items():
+        section = raw.get(name)
+        if section is None:
+            continue
+        if not isinstance(section, dict):
+            raise ParsingError(
+                f"Invalid OpenAPI specification at /components/{name}: must be a mapping"
+            )
+        previous_section = (getattr(previous, name, None) or {}) if previous is not None else {}
+        previous_digest_section = (
+            None if previous_digests is None else previous_digests.get(name, {})
+        )
+        digest_section = digests[name]
+        validated = {}
+        for key, entry in section.items():
+            model = previous_section.get(key, _UNKNOWN)
+            old = _UNKNOWN if previous_digest_section is None else previous_digest_section.get(
+                key, _UNKNOWN)
+            if model is not _UNKNOWN and _unchanged(entry, digest_section[key], old, model):
+                validated[key] = model
+            else:
+                pointer = f"/components/{name}/{escape_token(key)}"
+                validated[key] = validate_node(pointer, adapter.validate_python, entry)
+        sections[name] = validated
+    return Components.model_construct(**sections)
+
+
+def reparse(previous: OpenAPI, new_content: Dict[str, Any]) -> OpenAPI:
+    """
+    Parses a new version of a document, re-validating only what changed since previous.
+
+    Path items and component entries are compared with the previous version and only the
+    ones that differ are validated again; unchanged components keep the very same model
+    objects. The small top-level fields (info, servers, tags, ...) are always validated.
+    The result is equal to parse_openapi(new_content).
+
+    Entries are compared with digests of the content the previous model was parsed from,
+    recorded by parse_openapi(track_changes=True), record_content or reparse, so in-place
+    edits of the content are detected. A model without recorded digests has its components
+    compared in their dumped form; its path items are compared with the raw path items in
+    OpenAPI.paths, except that a path item that is the very same object as before may have
+    been edited in place and is validated again.
+
+    Args:
+        previous (OpenAPI): The model of the previous version of the document.
+        new_content (Dict[str, Any]): The new raw document.
+
+    Returns:
+        OpenAPI: The model of the new document.
+
+    Raises:
+        ParsingError: If the new document is not a valid OpenAPI specification.
+    """
+    if not isinstance(new_content, dict):
+        raise ParsingError("Invalid OpenAPI specification: document must be a mapping")
+    previous_digests = _sources.get(id(previous))
+    digests = _entry_digests(new_content)
+
+    # Mappings are replaced by empty placeholders, as in LazyOpenAPI
+    top_level = dict(new_content)
+    for name in LAZY_FIELDS:
+        if name != "webhooks" and isinstance(new_content.get(name), dict):
+            top_level[name] = {} if name == "paths" else None
+    top = validate_node("", OpenAPI.model_validate, top_level)
+
+    paths = new_content["paths"]
+    previous_paths = previous.paths if isinstance(previous.paths, dict) else {}
+    for key, item in paths.items():
+        if previous_digests is not None:
+            digest = digests["paths"][key]
+            if digest is not None and previous_digests["paths"].get(key) == digest:
+                continue
+        else:
+            old = previous_paths.get(key, _UNKNOWN)
+            if old is not _UNKNOWN and old is not item and old == item:
+                continue
+        validate_node(f"/paths/{escape_token(key)}", PathItem.model_validate, item)
+    update: Dict[str, Any] = {"paths": paths}
+
+    components = new_content.get("components")
+    if isinstance(components, dict):
+        update["components"] = _reparse_components(
+            previous.components, components,
+            None if previous_digests is None else previous_digests["components"],
+            digests["components"],
+        )
+    result = top.model_copy(update=update)
+    _remember_digests(result, digests)
+    return result
+
+
+# Marks an entry that did not exist (or was not recorded) in the previous version
+_UNKNOWN = object()
@@ -0,0 +1,296 @@
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple, get_args
+
+from pydantic import TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
+
+from .exceptions import ParsingError
+from .models import Components, OpenAPI, Operation, PathItem
+from .pointer import escape_token
+
+# HTTP methods that hold an Operation on a PathItem, in specification order
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+# Top-level fields whose entries are validated on first access
+LAZY_FIELDS = ("paths", "webhooks", "components")
+
+
+def _entry_adapter(field_annotation: Any) -> TypeAdapter:
+    # Optional[Dict[str, X]] -> TypeAdapter(X)
+    dict_type = next(arg for arg in get_args(field_annotation) if arg is not type(None))
+    return TypeAdapter(get_args(dict_type)[1])
+
+
+# One adapter per components section, e.g. "schemas" -> Union[Schema, Reference]
+COMPONENT_ADAPTERS = {
+    name: _entry_adapter(field.annotation) for name, field in Components.model_fields.items()
+}
+
+
+class _Memo:
+    """
+    Caches the outcome of validating a single node, including failures.
+
+    A failed validation is remembered as its error message, so every later access raises an
+    equivalent ParsingError no matter in which order nodes were touched.
+    """
+
+    __slots__ = ("value", "error")
+
+    def __init__(self, value: Any = None, error: Optional[str] = None):
+        self.value = value
+        self.error = error
+
+    def unwrap(self) -> Any:
+        if self.error is not None:
+            raise ParsingError(self.error)
+        return self.value
+
+
+def _validate(pointer: str, validate: Callable[[Any], Any], raw: Any) -> _Memo:
+    try:
+        return _Memo(validate(raw))
+    except PydanticValidationError as e:
+        return _Memo(error=f"Invalid OpenAPI specification at {pointer or '/'}: {e}")
+    except ParsingError as e:
+        return _Memo(error=e.message)
+
+
+def validate_node(pointer: str, validate: Callable[[Any], Any], raw: Any) -> Any:
+    """
+    Validates one node of a document, reporting failures with the node's location.
+
+    Args:
+        pointer (str): JSON Pointer of the node, used in error messages.
+        validate (Callable[[Any], Any]): Validates the raw node, e.g. PathItem.model_validate.
+        raw (Any): The raw node.
+
+    Returns:
+        Any: The validated node.
+
+    Raises:
+        ParsingError: If the node is invalid.
+    """
+    return _validate(pointer, validate, raw).unwrap()
+
+
+class LazyMapping(Mapping):
+    """
+    Read-only mapping that validates each entry the first time it is looked up.
+
+    Keys, length and membership come straight from the raw document and never trigger
+    validation.
+
+    Attributes:
+        pointer (str): JSON Pointer of the mapping within the document.
+    """
+
+    def __init__(self, raw: Dict[str, Any], pointer: str, validate: Callable[[str, Any], Any]):
+        self._raw = raw
+        self._validate = validate
+        self._memo: Dict[str, _Memo] = {}
+        self.pointer = pointer
+
+    def __getitem__(self, key: str) -> Any:
+        memo = self._memo.get(key)
+        if memo is None:
+            raw = self._raw[key]
+            pointer = f"{self.pointer}/{escape_token(key)}"
+            memo = _validate(pointer, lambda value: self._validate(pointer, value), raw)
+            self._memo[key] = memo
+        return memo.unwrap()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._raw
+
+    def __repr__(self) -> str:
+        return f"LazyMapping({self.pointer!r}, {len(self._raw)} entries, {len(self._memo)} loaded)"
+
+    @property
+    def loaded(self) -> int:
+        """Number of entries that have been validated so far."""
+        return len(self._memo)
+
+    def raw(self, key: str) -> Any:
+        """Returns the unvalidated entry for a key."""
+        return self._raw[key]
+
+
+class LazyPathItem:
+    """
+    A PathItem whose operations are validated on first access.
+
+    The path-level fields (summary, description, servers, parameters and $ref) are validated
+    when the path item itself is first looked up; each operation is validated separately the
+    first time its method attribute is read.
+
+    Attributes:
+        pointer (str): JSON Pointer of the path item within the document.
+    """
+
+    def __init__(self, raw: Dict[str, Any], pointer: str):
+        if not isinstance(raw, dict):
+            raise ParsingError(
+                f"Invalid OpenAPI specification at {pointer}: path item must be a mapping"
+            )
+        shared = {key: value for key, value in raw.items() if key not in HTTP_METHODS}
+        self._item = _validate(pointer, PathItem.model_validate, shared).unwrap()
+        self._raw = raw
+        self._operations: Dict[str, _Memo] = {}
+        self.pointer = pointer
+
+    def __getattr__(self, name: str) -> Any:
+        if name in HTTP_METHODS:
+            return self.operation(name)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._item, name)
+
+    def __repr__(self) -> str:
+        return f"LazyPathItem({self.pointer!r}, methods={list(self.methods())})"
+
+    def methods(self) -> Iterator[str]:
+        """Yields the HTTP methods defined on this path, without validating them."""
+        return (method for method in HTTP_METHODS if self._raw.get(method) is not None)
+
+    def operation(self, method: str) -> Optional[Operation]:
+        """
+        Returns the validated Operation for an HTTP method.
+
+        Args:
+            method (str): The lower-case HTTP method.
+
+        Returns:
+            Optional[Operation]: The operation, or None if the method is not defined.
+
+        Raises:
+            ParsingError: If the operation is invalid.
+        """
+        raw = self._raw.get(method)
+        if raw is None:
+            return None
+        memo = self._operations.get(method)
+        if memo is None:
+            memo = _validate(f"{self.pointer}/{method}", Operation.model_validate, raw)
+            self._operations[method] = memo
+        return memo.unwrap()
+
+    def operations(self) -> Iterator[Tuple[str, Operation]]:
+        """Yields (method, Operation) pairs, validating each operation as it is reached."""
+        for method in self.methods():
+            yield method, self.operation(method)
+
+    def to_path_item(self) -> PathItem:
+        """Validates every operation and returns the equivalent PathItem model."""
+        return self._item.model_copy(update=dict(self.operations()))
+
+
+def _lazy_path_item(pointer: str, raw: Any) -> LazyPathItem:
+    return LazyPathItem(raw, pointer)
+
+
+class LazyComponents:
+    """
+    Components whose entries are validated on first access.
+
+    Each section (schemas, responses, parameters, ...) is a LazyMapping, or None when the
+    section is absent from the document.
+    """
+
+    def __init__(self, raw: Dict[str, Any], pointer: str = "/components"):
+        self.pointer = pointer
+        self._sections: Dict[str, LazyMapping] = {}
+        for name, adapter in COMPONENT_ADAPTERS.items():
+            section = raw.get(name)
+            if section is None:
+                continue
+            if not isinstance(section, dict):
+                raise ParsingError(
+                    f"Invalid OpenAPI specification at {pointer}/{name}: must be a mapping"
+                )
+            self._sections[name] = LazyMapping(
+                section, f"{pointer}/{name}", lambda _, value, a=adapter: a.validate_python(value)
+            )
+
+    def __getattr__(self, name: str) -> Optional[LazyMapping]:
+        if name in Components.model_fields:
+            return self._sections.get(name)
+        raise AttributeError(name)
+
+    def __repr__(self) -> str:
+        return f"LazyComponents({sorted(self._sections)})"
+
+    def to_components(self) -> Components:
+        """Validates every entry and returns the equivalent Components model."""
+        sections = {name: dict(section.items()) for name, section in self._sections.items()}
+        return Components.model_construct(**sections)
+
+
+class LazyOpenAPI:
+    """
+    An OpenAPI document that validates path items, operations and components on demand.
+
+    Only the small top-level fields (openapi, info, servers, security, tags, ...) are validated
+    when the document is parsed. Entries of paths, webhooks and components are validated the
+    first time they are accessed and memoized afterwards, so cold-start time and memory follow
+    what is actually used. Accessing an invalid entry raises ParsingError, and keeps raising
+    the same error on every later access.
+
+    Attributes:
+        paths (LazyMapping): Path templates mapped to LazyPathItem objects.
+        webhooks (Optional[LazyMapping]): Webhook names mapped to LazyPathItem objects.
+        components (Optional[LazyComponents]): The lazily validated components.
+    """
+
+    def __init__(self, content: Dict[str, Any]):
+        if not isinstance(content, dict):
+            raise ParsingError("Invalid OpenAPI specification: document must be a mapping")
+        # Mappings are replaced by empty placeholders; anything else is left for pydantic to reject
+        top_level = dict(content)
+        for name in LAZY_FIELDS:
+            if isinstance(content.get(name), dict):
+                top_level[name] = {} if name == "paths" else None
+        self._top = _validate("", OpenAPI.model_validate, top_level).unwrap()
+        self.paths = LazyMapping(content["paths"], "/paths", _lazy_path_item)
+        webhooks = content.get("webhooks")
+        self.webhooks = (
+            LazyMapping(webhooks, "/webhooks", _lazy_path_item) if webhooks is not None else None
+        )
+        components = content.get("components")
+        self.components = LazyComponents(components) if components is not None else None
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._top, name)
+
+    def __repr__(self) -> str:
+        return f"LazyOpenAPI({self._top.info.title!r}, {len(self.paths)} paths)"
+
+    def to_openapi(self) -> OpenAPI:
+        """
+        Validates the whole document and returns the equivalent OpenAPI model.
+
+        Entries are validated in document order, so the first invalid entry is reported
+        regardless of which entries were accessed before.
+
+        Returns:
+            OpenAPI: The fully validated model, reusing every entry validated so far.
+
+        Raises:
+            ParsingError: If any entry is invalid.
+        """
+        for item in self.paths.values():
+            item.to_path_item()
+        # Like parse_openapi, the validated document keeps the raw path items
+        update: Dict[str, Any] = {"paths": {key: self.paths.raw(key) for key in self.paths}}
+        if self.webhooks is not None:
+            update["webhooks"] = {key: item.to_path_item() for key, item in self.webhooks.items()}
+        if self.components is not None:
+            update["components"] = self.components.to_components()
+        return self._top.model_copy(update=update)
@@ -0,0 +1,577 @@
+import codecs
+import json
+import logging
+import mmap
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, BinaryIO, Dict, Iterator, List, Sequence, Set, Tuple, Union
+
+import yaml
+
+from .exceptions import JsonPointerError
+from .pointer import parse_pointer
+
+# Prefer the libyaml-backed loader when PyYAML was built against libyaml; it parses the same
+# YAML subset as SafeLoader but runs the scanner and parser in C.
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# True when the C-accelerated YAML loader is in use
+HAS_LIBYAML = SafeLoader is not yaml.SafeLoader
+
+# Raw document buffers accepted by the bytes-first loaders
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# Byte order marks, longest first so that UTF-32 LE is not mistaken for UTF-16 LE
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# Size of the chunks handed to the YAML parser when streaming from a buffer
+CHUNK_SIZE = 64 * 1024
+
+
+def load_yaml(content: str) -> Any:
+    """
+    Decodes a YAML document using the fastest available safe loader.
+
+    Args:
+        content (str): The YAML document as a string.
+
+    Returns:
+        Any: The decoded Python object.
+
+    Raises:
+        yaml.YAMLError: If the content is not valid YAML.
+    """
+    return yaml.load(content, Loader=SafeLoader)
+
+
+def load_json(content: Union[str, bytes, bytearray]) -> Any:
+    """
+    Decodes a JSON document using the standard library decoder.
+
+    Args:
+        content (Union[str, bytes, bytearray]): The JSON document as a string or as UTF-8,
+            UTF-16 or UTF-32 encoded bytes.
+
+    Returns:
+        Any: The decoded Python object.
+
+    Raises:
+        json.JSONDecodeError: If the content is not valid JSON.
+    """
+    return json.loads(content)
+
+
+def looks_like_json(content: str) -> bool:
+    """
+    Checks whether a document appears to be a JSON object.
+
+    Only the first non-whitespace character is inspected, so the check is constant time
+    regardless of document size.
+
+    Args:
+        content (str): The document as a string.
+
+    Returns:
+        bool: True if the document starts with '{' (ignoring a BOM and leading whitespace).
+    """
+    for char in content:
+        if char in " \t\r\n\ufeff":
+            continue
+        return char == "{"
+    return False
+
+
+def load_content(content: str) -> Any:
+    """
+    Decodes an OpenAPI document that may be either JSON or YAML.
+
+    Documents that look like JSON objects are handed to the JSON decoder first. YAML flow
+    mappings also start with '{', so content the JSON decoder rejects falls back to YAML.
+
+    Args:
+        content (str): The document as a string.
+
+    Returns:
+        Any: The decoded Python object.
+
+    Raises:
+        yaml.YAMLError: If the content is neither valid JSON nor valid YAML.
+    """
+    if looks_like_json(content):
+        try:
+            return load_json(content.lstrip("\ufeff"))
+        except json.JSONDecodeError:
+            logger.debug("Content is not valid JSON, falling back to the YAML loader")
+    return load_yaml(content)
+
+
+# Marker for a subtree that contained nothing selected
+_MISSING = object()
+
+
+def split_selector(selector: str) -> Tuple[str, ...]:
+    """
+    Splits a JSON Pointer selector into its unescaped reference tokens.
+
+    A token ending in '*' matches every key that starts with the text before the '*', so
+    '/paths/~1characters*' selects all paths under the '/characters' prefix.
+
+    Args:
+        selector (str): A JSON Pointer such as '/components/schemas/Character'.
+
+    Returns:
+        Tuple[str, ...]: The unescaped reference tokens.
+
+    Raises:
+        ValueError: If the selector is not a valid JSON Pointer.
+    """
+    try:
+        return parse_pointer(selector)
+    except JsonPointerError as e:
+        raise ValueError(f"Invalid JSON Pointer selector: {e}")
+
+
+def _token_matches(token: str, key: Any) -> bool:
+    key = str(key)
+    if token.endswith("*"):
+        return key.startswith(token[:-1])
+    return key == token
+
+
+# Tag of the YAML merge key ("<<")
+_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+
+class _SelectiveComposer:
+    """
+    Builds Python objects for the selected subtrees of a YAML event stream.
+
+    Events outside the selection are consumed without composing nodes, except for anchored
+    nodes, which are kept so that aliases inside the selection still resolve. Merge keys
+    ("<<: *base") of partly selected mappings are applied to the selected keys.
+    """
+
+    def __init__(self, loader: Any):
+        self.loader = loader
+        self.anchors: Dict[str, yaml.Node] = {}
+
+    def load(self, selectors: List[Tuple[str, ...]]) -> Any:
+        loader = self.loader
+        loader.get_event()  # StreamStartEvent
+        if loader.check_event(yaml.StreamEndEvent):
+            return None
+        loader.get_event()  # DocumentStartEvent
+        if loader.check_event(yaml.DocumentEndEvent):
+            return None
+        result = self.walk(selectors)
+        return None if result is _MISSING else result
+
+    def construct(self, node: yaml.Node) -> Any:
+        return self.loader.construct_document(node)
+
+    def walk(self, selectors: List[Tuple[str, ...]]) -> Any:
+        loader = self.loader
+        event = loader.peek_event()
+        if any(not selector for selector in selectors):
+            return self.construct(self.compose())
+        if isinstance(event, yaml.AliasEvent) or getattr(event, "anchor", None) is not None:
+            # Anchored nodes may be aliased from anywhere, so compose them in full
+            return _select_from_object(self.construct(self.compose()), selectors)
+        if isinstance(event, yaml.MappingStartEvent):
+            loader.get_event()
+            result = {}
+            keys = set()
+            merged: List[Dict[Any, Any]] = []
+            while not loader.check_event(yaml.MappingEndEvent):
+                key_node = self.compose()
+                if key_node.tag == _MERGE_TAG:
+                    merged.extend(self.merge_sources(self.compose()))
+                    continue
+                key = self.construct(key_node)
+                keys.add(key)
+                remaining = [s[1:] for s in selectors if _token_matches(s[0], key)]
+                if remaining:
+                    value = self.walk(remaining)
+                    if value is not _MISSING:
+                        result[key] = value
+                else:
+                    self.skip()
+            loader.get_event()
+            if merged:
+                result = self.merge(merged, keys, selectors, result)
+            return result if result else _MISSING
+        if isinstance(event, yaml.SequenceStartEvent):
+            loader.get_event()
+            items = []
+            index = 0
+            while not loader.check_event(yaml.SequenceEndEvent):
+                remaining = [s[1:] for s in selectors if _token_matches(s[0], index)]
+                if remaining:
+                    value = self.walk(remaining)
+                    if value is not _MISSING:
+                        items.append(value)
+                else:
+                    self.skip()
+                index += 1
+            loader.get_event()
+            return items if items else _MISSING
+        self.skip()
+        return _MISSING
+
+    def merge_sources(self, node: yaml.Node) -> List[Dict[Any, Any]]:
+        # The mappings a merge key refers to, first one first
+        sources = node.value if isinstance(node, yaml.SequenceNode) else [node]
+        if not all(isinstance(source, yaml.MappingNode) for source in sources):
+            raise yaml.constructor.ConstructorError(
+                "while constructing a mapping", node.start_mark,
+                "expected a mapping or list of mappings for merging", node.start_mark,
+            )
+        return [self.construct(source) for source in sources]
+
+    @staticmethod
+    def merge(merged: List[Dict[Any, Any]], keys: Set[Any], selectors: List[Tuple[str, ...]],
+              result: Dict[Any, Any]) -> Dict[Any, Any]:
+        # Keys of the mapping itself win over merged ones, and earlier sources over later ones.
+        # Keys are ordered as in a full load: merged keys first, from the last source.
+        entries: Dict[Any, Any] = {}
+        for source in reversed(merged):
+            entries.update(source)
+        combined = {}
+        for key, value in entries.items():
+            if key in keys:
+                if key in result:
+                    combined[key] = result[key]
+                continue
+            remaining = [s[1:] for s in selectors if _token_matches(s[0], key)]
+            if remaining:
+                selected = _select_from_object(value, remaining)
+                if selected is not _MISSING:
+                    combined[key] = selected
+        combined.update(result)
+        return combined
+
+    def skip(self) -> None:
+        loader = self.loader
+        depth = 0
+        while True:
+            event = loader.peek_event()
+            if getattr(event, "anchor", None) is not None and not isinstance(
+                event, yaml.AliasEvent
+            ):
+                self.compose()
+            else:
+                loader.get_event()
+                if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                    depth += 1
+                elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                    depth -= 1
+            if depth == 0:
+                return
+
+    def compose(self) -> yaml.Node:
+        loader = self.loader
+        event = loader.get_event()
+        if isinstance(event, yaml.AliasEvent):
+            if event.anchor not in self.anchors:
+                raise yaml.composer.ComposerError(
+                    None, None, f"found undefined alias {event.anchor!r}", event.start_mark
+                )
+            return self.anchors[event.anchor]
+        node: yaml.Node
+        tag = event.tag
+        if isinstance(event, yaml.ScalarEvent):
+            if tag is None or tag == "!":
+                tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+            node = yaml.ScalarNode(
+                tag, event.value, event.start_mark, event.end_mark, style=event.style
+            )
+            if event.anchor is not None:
+                self.anchors[event.anchor] = node
+            return node
+        if isinstance(event, yaml.SequenceStartEvent):
+            if tag is None or tag == "!":
+                tag = loader.resolve(yaml.SequenceNode, None, event.implicit)
+            node = yaml.SequenceNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+            if event.anchor is not None:
+                self.anchors[event.anchor] = node
+            while not loader.check_event(yaml.SequenceEndEvent):
+                node.value.append(self.compose())
+        else:
+            if tag is None or tag == "!":
+                tag = loader.resolve(yaml.MappingNode, None, event.implicit)
+            node = yaml.MappingNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+            if event.anchor is not None:
+                self.anchors[event.anchor] = node
+            while not loader.check_event(yaml.MappingEndEvent):
+                item_key = self.compose()
+                node.value.append((item_key, self.compose()))
+        node.end_mark = loader.get_event().end_mark
+        return node
+
+
+def _select_from_object(value: Any, selectors: List[Tuple[str, ...]]) -> Any:
+    if any(not selector for selector in selectors):
+        return value
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            remaining = [s[1:] for s in selectors if _token_matches(s[0], key)]
+            if remaining:
+                selected = _select_from_object(item, remaining)
+                if selected is not _MISSING:
+                    result[key] = selected
+        return result if result else _MISSING
+    if isinstance(value, list):
+        items = []
+        for index, item in enumerate(value):
+            remaining = [s[1:] for s in selectors if _token_matches(s[0], index)]
+            if remaining:
+                selected = _select_from_object(item, remaining)
+                if selected is not _MISSING:
+                    items.append(selected)
+        return items if items else _MISSING
+    return _MISSING
+
+
+def load_selected(stream: Union[str, IO[str], Buffer], selectors: Sequence[str]) -> Any:
+    """
+    Decodes only the selected subtrees of a YAML (or JSON) document.
+
+    The document is walked as a PyYAML event stream. Nodes are composed and constructed only
+    for the selected subtrees, so the work beyond scanning scales with the selected part
+    rather than the whole document. The result is a sparse copy of the document that keeps
+    the selected subtrees at their original positions; sequences keep only their selected
+    items.
+
+    Args:
+        stream (Union[str, IO[str], Buffer]): The document as a string, a text stream or a raw
+            buffer (see load_bytes).
+        selectors (Sequence[str]): JSON Pointers of the subtrees to load (see split_selector).
+
+    Returns:
+        Any: The sparse document, or None if nothing was selected.
+
+    Raises:
+        ValueError: If a selector is not a valid JSON Pointer.
+        yaml.YAMLError: If the content is not valid YAML.
+    """
+    parsed_selectors = [split_selector(selector) for selector in selectors]
+    reader = None
+    if isinstance(stream, (bytes, bytearray, memoryview, mmap.mmap)):
+        if _streamable(*detect_encoding(stream)):
+            stream = reader = _BufferReader(stream)
+        else:
+            stream = decode_buffer(stream)
+    loader = SafeLoader(stream)
+    try:
+        return _SelectiveComposer(loader).load(parsed_selectors)
+    finally:
+        loader.dispose()
+        if reader is not None:
+            reader.close()
+
+
+def detect_encoding(data: Buffer) -> Tuple[str, int]:
+    """
+    Detects the Unicode encoding of a raw document.
+
+    A byte order mark wins if present. Otherwise the pattern of zero bytes in the first four
+    bytes is used, as described in RFC 4627, since JSON and YAML documents start with ASCII.
+
+    Args:
+        data (Buffer): The raw document.
+
+    Returns:
+        Tuple[str, int]: The codec name and the length of the byte order mark (0 if none).
+    """
+    head = bytes(data[:4])
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    if len(head) >= 4:
+        if head[:3] == b"\x00\x00\x00":
+            return "utf-32-be", 0
+        if head[1:] == b"\x00\x00\x00":
+            return "utf-32-le", 0
+    if len(head) >= 2:
+        if head[0] == 0:
+            return "utf-16-be", 0
+        if head[1] == 0:
+            return "utf-16-le", 0
+    return "utf-8", 0
+
+
+class _BufferReader:
+    """
+    Read-only stream over a buffer that hands out bytes in chunks.
+
+    The YAML parsers accept any object with a read() method, so a document can be parsed
+    straight from a memory map without first decoding it into a str.
+    """
+
+    def __init__(self, data: Buffer, name: str = "<buffer>"):
+        self.view = memoryview(data)
+        self.name = name
+        self.position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            size = len(self.view) - self.position
+        chunk = self.view[self.position:self.position + size].tobytes()
+        self.position += len(chunk)
+        return chunk
+
+    def close(self) -> None:
+        # Release the export so the underlying memory map can be closed
+        self.view.release()
+
+
+def decode_buffer(data: Buffer, encoding: str = "") -> str:
+    """
+    Decodes a raw document into a str, stripping any byte order mark.
+
+    Args:
+        data (Buffer): The raw document.
+        encoding (str, optional): Codec to use when neither a byte order mark nor the zero
+            byte pattern of UTF-16/32 identifies the encoding. Defaults to UTF-8.
+
+    Returns:
+        str: The decoded document.
+    """
+    detected, bom_length = detect_encoding(data)
+    if encoding and bom_length == 0 and detected == "utf-8":
+        detected = encoding
+    with memoryview(data) as view:
+        return str(view[bom_length:], detected)
+
+
+def load_bytes(data: Buffer, name: str = "<buffer>") -> Any:
+    """
+    Decodes an OpenAPI document (JSON or YAML) from raw bytes.
+
+    UTF-8 documents and UTF-16 documents with a byte order mark are streamed to the YAML
+    parser in chunks, so no decoded copy of the whole document is built. JSON documents are
+    handed to json.loads as bytes. Other encodings are decoded to a str first.
+
+    Args:
+        data (Buffer): The raw document, e.g. bytes, a memoryview or a memory map.
+        name (str, optional): Name of the source, used in YAML error messages.
+
+    Returns:
+        Any: The decoded Python object.
+
+    Raises:
+        yaml.YAMLError: If the content is neither valid JSON nor valid YAML.
+        UnicodeDecodeError: If the content cannot be decoded.
+    """
+    encoding, bom_length = detect_encoding(data)
+    if not _streamable(encoding, bom_length):
+        return load_content(decode_buffer(data))
+
+    with memoryview(data) as view:
+        # Only a short prefix is decoded to decide between the JSON and YAML loaders
+        head = str(view[bom_length:bom_length + 64], encoding, "ignore")
+        if encoding == "utf-8" and looks_like_json(head):
+            try:
+                # json.loads handles a UTF-8 BOM itself but only accepts bytes and bytearray
+                return load_json(data if isinstance(data, (bytes, bytearray)) else view.tobytes())
+            except json.JSONDecodeError:
+                logger.debug("Content is not valid JSON, falling back to the YAML loader")
+        reader = _BufferReader(view, name)
+        try:
+            return yaml.load(reader, Loader=SafeLoader)
+        finally:
+            reader.close()
+
+
+def _streamable(encoding: str, bom_length: int) -> bool:
+    # Both YAML parsers read UTF-8, and UTF-16 when it is marked with a byte order mark
+    return encoding == "utf-8" or (encoding.startswith("utf-16") and bom_length > 0)
+
+
+@contextmanager
+def open_buffer(source: Union[str, Path, Buffer, BinaryIO]) -> Iterator[Buffer]:
+    """
+    Exposes a document source as a read-only buffer without decoding it.
+
+    Files are memory mapped, so their pages are read lazily by the operating system and are
+    never copied into a Python str. Binary file objects backed by a real file are mapped as
+    well; other binary streams (and empty files, which cannot be mapped) are read into bytes.
+
+    Args:
+        source (Union[str, Path, Buffer, BinaryIO]): A file path, a bytes-like object or a
+            binary file object.
+
+    Yields:
+        Buffer: The raw document.
+
+    Raises:
+        FileNotFoundError: If a file path does not exist.
+        TypeError: If a file object returns str instead of bytes.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        yield source
+        return
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as file:
+            with _map_file(file) as mapped:
+                yield mapped
+        return
+    with _map_file(source) as mapped:
+        yield mapped
+
+
+@contextmanager
+def _map_file(file: BinaryIO) -> Iterator[Buffer]:
+    try:
+        fileno = file.fileno()
+        size = os.fstat(fileno).st_size
+    except (AttributeError, OSError, ValueError):
+        fileno = -1
+        size = 0
+    position = file.tell() if fileno >= 0 and file.seekable() else 0
+    if fileno < 0 or size <= position:
+        data = file.read()
+        if not isinstance(data, (bytes, bytearray)):
+            raise TypeError("Binary file objects must return bytes from read()")
+        yield data
+        return
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+        if position == 0:
+            yield mapped
+            return
+        # mmap offsets must be page aligned, so map everything and skip what was already read
+        with memoryview(mapped) as view:
+            with view[position:] as remaining:
+                yield remaining
+
+
+def load_source(source: Union[str, Path, Buffer, BinaryIO]) -> Any:
+    """
+    Decodes an OpenAPI document from a file path, a bytes-like object or a binary file.
+
+    Args:
+        source (Union[str, Path, Buffer, BinaryIO]): The document source (see open_buffer).
+
+    Returns:
+        Any: The decoded Python object.
+
+    Raises:
+        FileNotFoundError: If a file path does not exist.
+        yaml.YAMLError: If the content is neither valid JSON nor valid YAML.
+    """
+    name = str(source) if isinstance(source, (str, Path)) else getattr(source, "name", "<buffer>")
+    with open_buffer(source) as buffer:
+        return load_bytes(buffer, str(name))
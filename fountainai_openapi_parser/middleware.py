@@ -0,0 +1,463 @@
+import collections
+import http.cookies
+import io
+import json
+import logging
+import random
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import parse_qs
+
+from .exceptions import ParsingError, ReferenceResolutionError
+from .lazy import LazyOpenAPI
+from .models import OpenAPI
+from .router import RouteMatch, Router
+from .validators import OperationValidator, SchemaCompiler, SchemaValidator, media_range
+
+logger = logging.getLogger(__name__)
+
+# Largest body, in bytes, that is buffered to be validated
+DEFAULT_MAX_BODY_SIZE = 2**20
+
+# Media type of the response sent for rejected requests
+_REJECTED_CONTENT_TYPE = "application/json"
+
+
+class Violation:
+    """
+    A request or response that does not conform to the document.
+
+    Attributes:
+        phase (str): 'request' or 'response'.
+        method (str): The lower-case HTTP method.
+        path (str): The request path.
+        template (str): The path template the request matched.
+        operation_id (Optional[str]): The operationId of the operation, if it has one.
+        status (Optional[int]): The response status, for response violations.
+        errors (List[str]): The error messages.
+    """
+
+    __slots__ = ("phase", "method", "path", "template", "operation_id", "status", "errors")
+
+    def __init__(self, phase: str, method: str, path: str, match: RouteMatch,
+                 errors: List[str], status: Optional[int] = None):
+        self.phase = phase
+        self.method = method
+        self.path = path
+        self.template = match.template
+        self.operation_id = match.entry.operation_id
+        self.status = status
+        self.errors = errors
+
+    def __repr__(self) -> str:
+        return f"Violation({self.phase!r}, {self.method.upper()} {self.path!r}, {self.errors!r})"
+
+
+def log_violation(violation: Violation) -> None:
+    """Default violation handler: logs a warning."""
+    logger.warning("OpenAPI %s violation in %s %s (%s): %s", violation.phase,
+                   violation.method.upper(), violation.path, violation.template,
+                   "; ".join(violation.errors))
+
+
+def _decode_body(body: bytes, content_type: Optional[str]) -> Tuple[Any, Optional[str]]:
+    """
+    Decodes a body for validation.
+
+    JSON media types are parsed and text/* is decoded as UTF-8; other bodies, and bodies
+    without a Content-Type, are returned as bytes, which the validators only check against the
+    allowed media types.
+
+    Returns:
+        Tuple[Any, Optional[str]]: The decoded body (None if it is empty), and an error message
+            if it cannot be decoded.
+    """
+    if not body:
+        return None, None
+    if not content_type:
+        return body, None
+    media_type = media_range(content_type)
+    if media_type == "application/json" or media_type.endswith("+json"):
+        try:
+            return json.loads(body), None
+        except ValueError:
+            return None, "body is not valid JSON"
+    if media_type.startswith("text/"):
+        try:
+            return body.decode("utf-8"), None
+        except UnicodeDecodeError:
+            return None, "body is not valid UTF-8 text"
+    return body, None
+
+
+def _parse_cookies(header: Optional[str]) -> Dict[str, str]:
+    if not header:
+        return {}
+    cookies = http.cookies.SimpleCookie()
+    try:
+        cookies.load(header)
+    except http.cookies.CookieError:
+        return {}
+    return {name: morsel.value for name, morsel in cookies.items()}
+
+
+class ValidationMiddleware:
+    """
+    Validates the traffic of an application against an OpenAPI document.
+
+    Each request is routed to its operation with a Router. Requests whose path or method the
+    document does not describe pass through unchecked. For a sampled request, the parameters
+    and the body are validated with the compiled validators of the operation, and then the
+    response is validated as it is sent. The validators of an operation are compiled on its
+    first sampled request and reused afterwards. Violations are passed to on_violation.
+
+    Requests that are not sampled cost a single random number, so sample_rate bounds the
+    overhead in production. Bodies are buffered to be validated, up to max_body_size bytes;
+    larger bodies pass through without their content being checked.
+
+    base_path is the prefix of request paths that the document's paths leave out, e.g. '/v1'.
+    generated may hold generated validators for the component schemas (GeneratedValidators),
+    which are then used instead of compiled closures. Use WSGIValidationMiddleware or
+    ASGIValidationMiddleware to wrap an application.
+
+    Raises:
+        ValueError: If sample_rate is not between 0 and 1.
+
+    Attributes:
+        app (Any): The wrapped application.
+        router (Router): Routes requests to the operations of the document.
+        compiler (SchemaCompiler): Compiles and caches the validators of each operation.
+        sample_rate (float): Fraction of requests that are validated, from 0 to 1.
+        validate_responses (bool): Whether responses to sampled requests are validated.
+        reject_invalid (bool): Whether invalid requests are answered with a 400 response
+            listing the errors, instead of being passed to the application.
+        max_body_size (int): Largest body, in bytes, that is validated.
+        on_violation (Callable[[Violation], None]): Receives every violation.
+    """
+
+    def __init__(self, app: Any, document: Union[OpenAPI, LazyOpenAPI], sample_rate: float = 1.0,
+                 validate_responses: bool = True, reject_invalid: bool = False,
+                 on_violation: Optional[Callable[[Violation], None]] = None,
+                 base_path: str = "", max_body_size: int = DEFAULT_MAX_BODY_SIZE,
+                 generated: Optional[Mapping[str, SchemaValidator]] = None):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"sample_rate must be between 0 and 1, not {sample_rate!r}")
+        self.app = app
+        self.router = Router(document, base_path)
+        self.compiler = SchemaCompiler(document, generated=generated)
+        self.sample_rate = sample_rate
+        self.validate_responses = validate_responses
+        self.reject_invalid = reject_invalid
+        self.max_body_size = max_body_size
+        self.on_violation = on_violation if on_violation is not None else log_violation
+        # Operations whose schemas could not be compiled, reported once
+        self._failed: Set[Tuple[str, str]] = set()
+
+    def _sampled(self) -> bool:
+        rate = self.sample_rate
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def _route(self, method: str, path: str,
+               decoded: bool) -> Optional[Tuple[RouteMatch, OperationValidator]]:
+        match = self.router.match(method, path, decoded)
+        if match is None:
+            return None
+        entry = match.entry
+        if (entry.method, entry.path) in self._failed:
+            return None
+        try:
+            return match, self.compiler.operation(entry)
+        except (ParsingError, ReferenceResolutionError) as e:
+            logger.warning("Not validating %s %s: %s", entry.method.upper(), entry.path, e)
+            self._failed.add((entry.method, entry.path))
+            return None
+
+    def _report(self, violation: Violation) -> None:
+        try:
+            self.on_violation(violation)
+        except Exception:
+            logger.exception("Violation handler failed for %r", violation)
+
+    def _check_request(self, method: str, path: str, match: RouteMatch,
+                       validator: OperationValidator, query_string: str,
+                       headers: Dict[str, str], body: Optional[bytes]) -> List[str]:
+        """
+        Validates a request and reports its violations.
+
+        Args:
+            headers (Dict[str, str]): The headers, with lower-case names.
+            body (Optional[bytes]): The raw body, or None if it was too large to buffer.
+
+        Returns:
+            List[str]: The error messages.
+        """
+        errors = validator.validate_parameters(
+            match.path_params, parse_qs(query_string, keep_blank_values=True), headers,
+            _parse_cookies(headers.get("cookie")))
+        if body is not None:
+            content_type = headers.get("content-type")
+            decoded, error = _decode_body(body, content_type)
+            if error is not None:
+                errors.append(f"request {error}")
+            else:
+                errors.extend(validator.validate_body(decoded, content_type))
+        if errors:
+            self._report(Violation("request", method.lower(), path, match, errors))
+        return errors
+
+    def _check_response(self, method: str, path: str, match: RouteMatch,
+                        validator: OperationValidator, status: int, content_type: Optional[str],
+                        body: Optional[bytes]) -> None:
+        # The body is None when it was too large to buffer
+        decoded, error = _decode_body(body, content_type) if body is not None else (None, None)
+        errors = [f"response {error}"] if error is not None else validator.validate_response(
+            status, decoded, content_type)
+        if errors:
+            self._report(Violation("response", method.lower(), path, match, errors, status))
+
+    @staticmethod
+    def _rejection(errors: List[str]) -> bytes:
+        return json.dumps({"errors": errors}).encode("utf-8")
+
+
+class _ResponseBody:
+    """
+    Iterates over the body of a WSGI response, buffering it to be validated at the end.
+    """
+
+    def __init__(self, body: Iterable[bytes], max_size: int,
+                 finish: Callable[[Optional[bytes]], None]):
+        self._body = body
+        self._max_size = max_size
+        self._finish = finish
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunks: Optional[List[bytes]] = []
+        size = 0
+        for chunk in self._body:
+            if chunks is not None:
+                size += len(chunk)
+                if size > self._max_size:
+                    chunks = None
+                else:
+                    chunks.append(chunk)
+            yield chunk
+        self._finish(b"".join(chunks) if chunks is not None else None)
+
+    def close(self) -> None:
+        close = getattr(self._body, "close", None)
+        if close is not None:
+            close()
+
+
+class _ReplayedInput:
+    """
+    A wsgi.input returning the bytes that were read ahead, followed by the rest of the input.
+    """
+
+    def __init__(self, head: bytes, rest: Any):
+        self._head = io.BytesIO(head)
+        self._rest = rest
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        data = self._head.read(size)
+        if size is None or size < 0:
+            return data + self._rest.read()
+        if len(data) < size:
+            data += self._rest.read(size - len(data))
+        return data
+
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        line = self._head.readline(size)
+        if size is None or size < 0:
+            return line if line.endswith(b"\n") else line + self._rest.readline()
+        if line.endswith(b"\n") or len(line) >= size:
+            return line
+        return line + self._rest.readline(size - len(line))
+
+    def readlines(self, hint: Any = None) -> List[bytes]:
+        return list(self)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.readline, b"")
+
+
+class WSGIValidationMiddleware(ValidationMiddleware):
+    """
+    WSGI middleware validating requests and responses against an OpenAPI document.
+
+    Paths are matched against PATH_INFO, which the server has already percent-decoded: path
+    parameter values are taken as they are, and an encoded '/' in a value splits the segment
+    it is in. The request body is read when it is validated, and handed to the application in
+    a new wsgi.input. A request without CONTENT_LENGTH has its body read only if the server
+    sets wsgi.input_terminated (e.g. for a chunked upload); otherwise the body is passed
+    through unvalidated. Output written with the write callable of start_response is not
+    validated.
+    """
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable[..., Any]) -> Any:
+        if not self._sampled():
+            return self.app(environ, start_response)
+        method = environ.get("REQUEST_METHOD", "GET")
+        path = environ.get("PATH_INFO") or "/"
+        route = self._route(method, path, decoded=True)
+        if route is None:
+            return self.app(environ, start_response)
+        match, validator = route
+        headers = {
+            key[5:].replace("_", "-").lower(): value
+            for key, value in environ.items() if key.startswith("HTTP_")
+        }
+        if environ.get("CONTENT_TYPE"):
+            headers["content-type"] = environ["CONTENT_TYPE"]
+        try:
+            length: Optional[int] = int(environ["CONTENT_LENGTH"])
+        except (KeyError, ValueError):
+            length = None
+        stream = environ["wsgi.input"]
+        body: Optional[bytes] = None
+        if length is not None:
+            if length <= self.max_body_size:
+                body = stream.read(length) if length > 0 else b""
+                environ["wsgi.input"] = io.BytesIO(body)
+        elif environ.get("wsgi.input_terminated"):
+            # The length is unknown (e.g. a chunked upload): read one byte past the limit
+            head = stream.read(self.max_body_size + 1)
+            if len(head) <= self.max_body_size:
+                body = head
+                environ["wsgi.input"] = io.BytesIO(head)
+            else:
+                environ["wsgi.input"] = _ReplayedInput(head, stream)
+        errors = self._check_request(method, path, match, validator,
+                                     environ.get("QUERY_STRING", ""), headers, body)
+        if errors and self.reject_invalid:
+            content = self._rejection(errors)
+            start_response("400 Bad Request", [("Content-Type", _REJECTED_CONTENT_TYPE),
+                                               ("Content-Length", str(len(content)))])
+            return [content]
+        if not self.validate_responses:
+            return self.app(environ, start_response)
+        response: Dict[str, Any] = {}
+
+        def capture(status: str, response_headers: List[Tuple[str, str]],
+                    exc_info: Any = None) -> Any:
+            response["status"] = int(status.split(" ", 1)[0])
+            response["content_type"] = next(
+                (value for name, value in response_headers if name.lower() == "content-type"),
+                None)
+            return start_response(status, response_headers, exc_info)
+
+        def finish(content: Optional[bytes]) -> None:
+            if "status" in response:
+                self._check_response(method, path, match, validator, response["status"],
+                                     response["content_type"], content)
+
+        return _ResponseBody(self.app(environ, capture), self.max_body_size, finish)
+
+
+class ASGIValidationMiddleware(ValidationMiddleware):
+    """
+    ASGI middleware validating HTTP requests and responses against an OpenAPI document.
+
+    Paths are matched against raw_path, so that path parameters are percent-decoded exactly
+    once, or against the decoded path if the server does not provide raw_path. Other scopes
+    (lifespan, websocket) are passed through. The request body is received in full before
+    the application is called, and replayed to it; the response is validated after its last
+    message has been sent.
+    """
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[[], Awaitable[Any]],
+                       send: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        if scope["type"] != "http" or not self._sampled():
+            await self.app(scope, receive, send)
+            return
+        method, path = scope["method"], scope["path"]
+        raw_path = scope.get("raw_path")
+        if raw_path:
+            route = self._route(method, raw_path.decode("latin-1"), decoded=False)
+        else:
+            route = self._route(method, path, decoded=True)
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+        match, validator = route
+        headers: Dict[str, str] = {}
+        for name, value in scope.get("headers", ()):
+            key = name.decode("latin-1").lower()
+            text = value.decode("latin-1")
+            headers[key] = f"{headers[key]}, {text}" if key in headers else text
+        # Messages received here, replayed to the application before any later ones
+        received: Deque[Dict[str, Any]] = collections.deque()
+        chunks: Optional[List[bytes]] = []
+        size = 0
+        while True:
+            message = await receive()
+            received.append(message)
+            if message["type"] != "http.request":
+                chunks = None
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            chunks.append(chunk)
+            if size > self.max_body_size:
+                # Not validated; the rest of the body streams to the application
+                chunks = None
+                break
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks) if chunks is not None else None
+        errors = self._check_request(method, path, match, validator,
+                                     scope.get("query_string", b"").decode("latin-1"), headers,
+                                     body)
+        if errors and self.reject_invalid:
+            content = self._rejection(errors)
+            await send({"type": "http.response.start", "status": 400, "headers": [
+                (b"content-type", _REJECTED_CONTENT_TYPE.encode("latin-1")),
+                (b"content-length", str(len(content)).encode("latin-1")),
+            ]})
+            await send({"type": "http.response.body", "body": content})
+            return
+
+        async def replay() -> Any:
+            if received:
+                return received.popleft()
+            return await receive()
+
+        if not self.validate_responses:
+            await self.app(scope, replay, send)
+            return
+        response: Dict[str, Any] = {"chunks": []}
+
+        async def capture(message: Dict[str, Any]) -> None:
+            await send(message)
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["content_type"] = next(
+                    (value.decode("latin-1") for name, value in message.get("headers", ())
+                     if name.lower() == b"content-type"), None)
+            elif message["type"] == "http.response.body" and "status" in response:
+                chunks = response["chunks"]
+                if chunks is not None:
+                    chunks.append(message.get("body", b""))
+                    response["size"] = response.get("size", 0) + len(chunks[-1])
+                    if response["size"] > self.max_body_size:
+                        response["chunks"] = chunks = None
+                if not message.get("more_body", False):
+                    self._check_response(method, path, match, validator, response["status"],
+                                         response["content_type"],
+                                         b"".join(chunks) if chunks is not None else None)
+
+        await self.app(scope, replay, capture)
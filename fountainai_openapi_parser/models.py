@@ -1,3 +1,7 @@
+from typing import Optional, List, Dict, Any, Union
+from typing_extensions import Annotated
+from pydantic import BaseModel, Field, AnyUrl, EmailStr, RootModel
+from pydantic import Discriminator as UnionDiscriminator, Tag as UnionTag
 from enum import Enum
 
 
@@ -89,6 +93,52 @@ class Config:
     populate_by_name = True
 
 
+# Keys a Reference object may have
+_REFERENCE_KEYS = frozenset({"$ref", "summary", "description"})
+
+
+def _is_reference(value: Any, own_ref: bool) -> bool:
+    if not isinstance(value, dict):
+        return isinstance(value, Reference)
+    if own_ref:
+        # Schema and PathItem have a $ref field of their own: a $ref with other keys next to it
+        # is one of those rather than a Reference
+        return "$ref" in value and _REFERENCE_KEYS.issuperset(value)
+    return "$ref" in value
+
+
+def reference_union(target: Any, own_ref: bool = False) -> Any:
+    """
+    Builds the type Union[target, Reference], dispatched on the $ref key of each input.
+
+    Pydantic validates a plain Union in smart mode, which may try each member in turn and
+    validate the whole subtree of a node more than once. The discriminated union picks the
+    member up front, so each node is validated exactly once, and a failing node reports the
+    errors of the member it was validated as only.
+
+    Args:
+        target (Any): The model, or the name of the model, that is not a Reference.
+        own_ref (bool, optional): Whether the target has a $ref field itself, in which case
+            only objects holding nothing but Reference keys are References. Defaults to False.
+
+    Returns:
+        Any: The annotated union type.
+    """
+    name = target if isinstance(target, str) else target.__name__
+
+    def tag(value: Any) -> str:
+        return "Reference" if _is_reference(value, own_ref) else name
+
+    return Annotated[
+        Union[Annotated[target, UnionTag(name)], Annotated[Reference, UnionTag("Reference")]],
+        UnionDiscriminator(tag),
+    ]
+
+
+# Schema or Reference, used wherever a schema may be given
+SchemaOrReference = reference_union("Schema", own_ref=True)
+
+
 # A metadata object that allows for more fine-tuned XML model definitions
 class XML(BaseModel):
     name: Optional[str] = None
@@ -107,7 +157,7 @@ class Discriminator(BaseModel):
 # A single encoding definition applied to a single schema property
 class Encoding(BaseModel):
     contentType: Optional[str] = None
-    headers: Optional[Dict[str, Union["Header", Reference]]] = None
+    headers: Optional[Dict[str, reference_union("Header")]] = None
     style: Optional[Style] = None
     explode: Optional[bool] = None
     allowReserved: Optional[bool] = None
@@ -123,11 +173,14 @@ class Example(BaseModel):
 
 # Each Media Type object provides schema and examples for the media type identified by its key
 class MediaType(BaseModel):
-    schema_data: Optional[Union["Schema", Reference]] = None
+    schema_data: Optional[SchemaOrReference] = Field(default=None, alias="schema")
     example: Optional[Any] = None
-    examples: Optional[Dict[str, Union[Example, Reference]]] = None
+    examples: Optional[Dict[str, reference_union(Example)]] = None
     encoding: Optional[Dict[str, Encoding]] = None
 
+    class Config:
+        populate_by_name = True
+
 
 # The Schema Object allows the definition of input and output data types
 class Schema(BaseModel):
@@ -223,9 +276,9 @@ class Parameter(BaseModel):
     style: Optional[Style] = None
     explode: Optional[bool] = None
     allowReserved: Optional[bool] = None
-    schema_data: Optional[Union[Schema, Reference]] = None
+    schema_data: Optional[SchemaOrReference] = Field(default=None, alias="schema")
     example: Optional[Any] = None
-    examples: Optional[Dict[str, Union[Example, Reference]]] = None
+    examples: Optional[Dict[str, reference_union(Example)]] = None
     content: Optional[Dict[str, MediaType]] = None
 
     class Config:
@@ -242,9 +295,9 @@ class RequestBody(BaseModel):
 # Describes a single response from an API Operation
 class Response(BaseModel):
     description: str
-    headers: Optional[Dict[str, Union["Header", Reference]]] = None
+    headers: Optional[Dict[str, reference_union("Header")]] = None
     content: Optional[Dict[str, MediaType]] = None
-    links: Optional[Dict[str, Union["Link", Reference]]] = None
+    links: Optional[Dict[str, reference_union("Link")]] = None
 
 
 # The Link object represents a possible design-time link for a response
@@ -266,14 +319,17 @@ class Header(BaseModel):
     style: Optional[Style] = None
     explode: Optional[bool] = None
     allowReserved: Optional[bool] = None
-    schema_data: Optional[Union[Schema, Reference]] = None
+    schema_data: Optional[SchemaOrReference] = Field(default=None, alias="schema")
     example: Optional[Any] = None
-    examples: Optional[Dict[str, Union[Example, Reference]]] = None
+    examples: Optional[Dict[str, reference_union(Example)]] = None
     content: Optional[Dict[str, MediaType]] = None
 
+    class Config:
+        populate_by_name = True
+
 
 # A map of possible out-of-band callbacks related to the parent operation
-class Callback(RootModel[Dict[str, Union["PathItem", Reference]]]):
+class Callback(RootModel[Dict[str, reference_union("PathItem", own_ref=True)]]):
     pass
 
 
@@ -315,10 +371,10 @@ class Operation(BaseModel):
     description: Optional[str] = None
     externalDocs: Optional[ExternalDocumentation] = None
     operationId: Optional[str] = None
-    parameters: Optional[List[Union[Parameter, Reference]]] = None
-    requestBody: Optional[Union[RequestBody, Reference]] = None
-    responses: Dict[str, Union[Response, Reference]]
-    callbacks: Optional[Dict[str, Union[Callback, Reference]]] = None
+    parameters: Optional[List[reference_union(Parameter)]] = None
+    requestBody: Optional[reference_union(RequestBody)] = None
+    responses: Dict[str, reference_union(Response)]
+    callbacks: Optional[Dict[str, reference_union(Callback)]] = None
     deprecated: Optional[bool] = None
     security: Optional[List[Dict[str, List[str]]]] = None  # SecurityRequirements
     servers: Optional[List[Server]] = None
@@ -338,7 +394,7 @@ class PathItem(BaseModel):
     patch: Optional[Operation] = None
     trace: Optional[Operation] = None
     servers: Optional[List[Server]] = None
-    parameters: Optional[List[Union[Parameter, Reference]]] = None
+    parameters: Optional[List[reference_union(Parameter)]] = None
 
     class Config:
         populate_by_name = True
@@ -346,16 +402,16 @@ class PathItem(BaseModel):
 
 # Holds a set of reusable objects for different aspects of the OAS
 class Components(BaseModel):
-    schemas: Optional[Dict[str, Union[Schema, Reference]]] = None
-    responses: Optional[Dict[str, Union[Response, Reference]]] = None
-    parameters: Optional[Dict[str, Union[Parameter, Reference]]] = None
-    examples: Optional[Dict[str, Union[Example, Reference]]] = None
-    requestBodies: Optional[Dict[str, Union[RequestBody, Reference]]] = None
-    headers: Optional[Dict[str, Union[Header, Reference]]] = None
-    securitySchemes: Optional[Dict[str, Union[SecurityScheme, Reference]]] = None
-    links: Optional[Dict[str, Union[Link, Reference]]] = None
-    callbacks: Optional[Dict[str, Union[Callback, Reference]]] = None
-    pathItems: Optional[Dict[str, Union[PathItem, Reference]]] = None
+    schemas: Optional[Dict[str, SchemaOrReference]] = None
+    responses: Optional[Dict[str, reference_union(Response)]] = None
+    parameters: Optional[Dict[str, reference_union(Parameter)]] = None
+    examples: Optional[Dict[str, reference_union(Example)]] = None
+    requestBodies: Optional[Dict[str, reference_union(RequestBody)]] = None
+    headers: Optional[Dict[str, reference_union(Header)]] = None
+    securitySchemes: Optional[Dict[str, reference_union(SecurityScheme)]] = None
+    links: Optional[Dict[str, reference_union(Link)]] = None
+    callbacks: Optional[Dict[str, reference_union(Callback)]] = None
+    pathItems: Optional[Dict[str, reference_union(PathItem, own_ref=True)]] = None
 
 
 # The root document object of the OpenAPI document
@@ -365,7 +421,7 @@ class OpenAPI(BaseModel):
     jsonSchemaDialect: Optional[AnyUrl] = None
     servers: Optional[List[Server]] = None
     paths: dict
-    webhooks: Optional[Dict[str, Union[PathItem, Reference]]] = None
+    webhooks: Optional[Dict[str, reference_union(PathItem, own_ref=True)]] = None
     components: Optional[Components] = None
     security: Optional[List[Dict[str, List[str]]]] = None  # SecurityRequirements
     tags: Optional[List[Tag]] = None
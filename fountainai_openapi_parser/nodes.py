@@ -0,0 +1,48 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from pydantic import BaseModel, RootModel
+
+# Model class -> {field name: key in the document (its alias)}
+_MODEL_KEYS: Dict[type, Dict[str, str]] = {}
+
+
+def unwrap_root(node: Any) -> Any:
+    """Returns the value a node stands for: the root value of Callback and other root models."""
+    while isinstance(node, RootModel):
+        node = node.root
+    return node
+
+
+def _model_keys(model_class: type) -> Dict[str, str]:
+    keys = _MODEL_KEYS.get(model_class)
+    if keys is None:
+        keys = _MODEL_KEYS[model_class] = {
+            name: field.alias or name for name, field in model_class.model_fields.items()
+        }
+    return keys
+
+
+def object_items(node: Any) -> Optional[Iterable[Tuple[Any, Any]]]:
+    """
+    Lists the entries of an object node as they appear in the document.
+
+    A model contributes the fields that were set, under their aliases, plus any extra fields,
+    which is the content of model_dump(by_alias=True, exclude_unset=True).
+
+    Args:
+        node (Any): A dict, a model or any other value.
+
+    Returns:
+        Optional[Iterable[Tuple[Any, Any]]]: (key, value) pairs, or None if the node is not an
+            object.
+    """
+    if isinstance(node, dict):
+        return node.items()
+    if isinstance(node, BaseModel):
+        fields_set = node.model_fields_set
+        items = [(key, getattr(node, name))
+                 for name, key in _model_keys(type(node)).items() if name in fields_set]
+        if node.model_extra:
+            items.extend(node.model_extra.items())
+        return items
+    return None
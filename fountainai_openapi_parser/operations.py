@@ -0,0 +1,288 @@
+import logging
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .lazy import HTTP_METHODS, LazyMapping, LazyOpenAPI, LazyPathItem
+from .models import OpenAPI, Operation, Parameter, Reference, Server
+from .pointer import escape_token
+
+logger = logging.getLogger(__name__)
+
+# Indexes returned by operation_index(), keyed by id(document). Entries are dropped when their
+# document is garbage collected.
+_indexes: Dict[int, "OperationIndex"] = {}
+
+
+def _parameter_key(parameter: Union[Parameter, Reference]) -> Tuple[str, str]:
+    # A parameter is identified by its name and location; a reference by its target
+    if isinstance(parameter, Reference):
+        return "$ref", parameter.ref
+    return parameter.name, parameter.in_.value
+
+
+class IndexedOperation:
+    """
+    An operation of an OperationIndex, with the context it inherits from its path item.
+
+    The operation itself is validated the first time it is accessed. The merged context
+    (parameters, servers and security) is computed once and kept.
+
+    Attributes:
+        path (str): The path template, e.g. '/characters/{id}'.
+        method (str): The lower-case HTTP method.
+        operation_id (Optional[str]): The operationId, if any.
+        tags (List[str]): The tags of the operation.
+        pointer (str): JSON Pointer of the operation within the document.
+    """
+
+    __slots__ = ("path", "method", "operation_id", "tags", "pointer", "_index", "_item", "_raw",
+                 "_parameters", "_servers")
+
+    def __init__(self, index: "OperationIndex", path: str, method: str, item: Dict[str, Any],
+                 raw: Dict[str, Any]):
+        self.path = path
+        self.method = method
+        self.operation_id: Optional[str] = raw.get("operationId")
+        self.tags: List[str] = list(raw.get("tags") or ())
+        self.pointer = f"/paths/{escape_token(path)}/{method}"
+        self._index = index
+        self._item = item
+        self._raw = raw
+        self._parameters: Optional[List[Union[Parameter, Reference]]] = None
+        self._servers: Optional[List[Server]] = None
+
+    def __repr__(self) -> str:
+        return f"IndexedOperation({self.method.upper()} {self.path}, {self.operation_id!r})"
+
+    @property
+    def path_item(self) -> LazyPathItem:
+        """The path item, with its path-level fields validated."""
+        return self._index._path_item(self.path, self._item)
+
+    @property
+    def operation(self) -> Operation:
+        """
+        The validated Operation.
+
+        Raises:
+            ParsingError: If the operation is invalid.
+        """
+        return self.path_item.operation(self.method)
+
+    @property
+    def parameters(self) -> List[Union[Parameter, Reference]]:
+        """
+        The effective parameters: those of the path item, overridden by those of the operation.
+
+        A parameter is overridden by one with the same name and location. References are not
+        resolved and only override a reference to the same target.
+        """
+        if self._parameters is None:
+            own = self.operation.parameters or []
+            overridden = {_parameter_key(parameter) for parameter in own}
+            inherited = [parameter for parameter in self.path_item.parameters or []
+                         if _parameter_key(parameter) not in overridden]
+            self._parameters = inherited + list(own)
+        return self._parameters
+
+    @property
+    def servers(self) -> List[Server]:
+        """The effective servers: those of the operation, else the path item, else the document."""
+        if self._servers is None:
+            self._servers = list(self.operation.servers or self.path_item.servers
+                                 or self._index.document.servers or [])
+        return self._servers
+
+    @property
+    def security(self) -> Optional[List[Dict[str, List[str]]]]:
+        """The effective security requirements: the operation's own, else the document's."""
+        security = self.operation.security
+        return security if security is not None else self._index.document.security
+
+    def _is_current(self, paths: Any) -> bool:
+        # The path item and the operation are still the ones that were indexed, unchanged
+        item = paths.get(self.path) if isinstance(paths, dict) else None
+        return (item is self._item and item.get(self.method) is self._raw
+                and self._raw.get("operationId") == self.operation_id
+                and list(self._raw.get("tags") or ()) == self.tags)
+
+
+class OperationIndex:
+    """
+    Constant-time lookups of the operations of a document.
+
+    Operations are found by operationId, by (method, path template) and by tag. Building the
+    index only walks the raw path items; each operation is validated the first time it is
+    used. Path items that are only a $ref are not followed, so resolve references first if the
+    document uses them.
+
+    The index checks in constant time, on every lookup, that the operations it returns are
+    still in the document with the same operationId and tags, and that paths, servers and
+    security were not replaced; otherwise it is rebuilt. Other edits made in place (e.g. adding
+    an operation to an existing path item, or editing parameters) are not detected: call
+    invalidate() after them.
+
+    Attributes:
+        document (Union[OpenAPI, LazyOpenAPI]): The indexed document.
+    """
+
+    def __init__(self, document: Union[OpenAPI, LazyOpenAPI]):
+        self._document = weakref.ref(document)
+        # Dropped for cached indexes, so that the cache does not keep documents alive
+        self._owner: Optional[Union[OpenAPI, LazyOpenAPI]] = document
+        self._stale = True
+        self._build()
+
+    @property
+    def document(self) -> Union[OpenAPI, LazyOpenAPI]:
+        """The indexed document."""
+        document = self._document()
+        if document is None:
+            raise ReferenceError("The indexed document no longer exists")
+        return document
+
+    def __len__(self) -> int:
+        self._check()
+        return len(self._by_route)
+
+    def __iter__(self) -> Iterator[IndexedOperation]:
+        """Yields the operations in document order."""
+        self._check()
+        return iter(list(self._by_route.values()))
+
+    def __repr__(self) -> str:
+        return f"OperationIndex({len(self._by_route)} operations)"
+
+    def invalidate(self) -> None:
+        """Rebuilds the index at the next lookup, after the document was edited in place."""
+        self._stale = True
+
+    def by_id(self, operation_id: str) -> Optional[IndexedOperation]:
+        """
+        Finds an operation by its operationId.
+
+        Args:
+            operation_id (str): The operationId.
+
+        Returns:
+            Optional[IndexedOperation]: The operation, or None if no operation has this id.
+        """
+        return self._lookup(lambda: self._by_id.get(operation_id))
+
+    def get(self, method: str, path: str) -> Optional[IndexedOperation]:
+        """
+        Finds an operation by HTTP method and path template.
+
+        Args:
+            method (str): The HTTP method, in any case.
+            path (str): The path template exactly as in the document, e.g. '/characters/{id}'.
+
+        Returns:
+            Optional[IndexedOperation]: The operation, or None if it is not defined.
+        """
+        return self._lookup(lambda: self._by_route.get((method.lower(), path)))
+
+    def by_tag(self, tag: str) -> List[IndexedOperation]:
+        """
+        Lists the operations with a tag, in document order.
+
+        Args:
+            tag (str): The tag name.
+
+        Returns:
+            List[IndexedOperation]: The operations; empty if no operation has this tag.
+        """
+        self._check()
+        entries = self._by_tag.get(tag, ())
+        paths = self._raw_paths()
+        if not all(entry._is_current(paths) for entry in entries):
+            self._build()
+            entries = self._by_tag.get(tag, ())
+        return list(entries)
+
+    def tags(self) -> List[str]:
+        """Lists the tags used by operations, in order of first use."""
+        self._check()
+        return list(self._by_tag)
+
+    def _lookup(self, find: Any) -> Optional[IndexedOperation]:
+        self._check()
+        entry = find()
+        if entry is not None and not entry._is_current(self._raw_paths()):
+            self._build()
+            entry = find()
+        return entry
+
+    def _raw_paths(self) -> Any:
+        paths = self.document.paths
+        return paths._raw if isinstance(paths, LazyMapping) else paths
+
+    def _signature(self) -> Tuple[int, int, int, int]:
+        # Identity of the fields the index depends on, and the number of paths
+        paths = self._raw_paths()
+        return (id(paths), len(paths) if isinstance(paths, dict) else 0,
+                id(self.document.servers), id(self.document.security))
+
+    def _check(self) -> None:
+        if self._stale or self._signature() != self._built_for:
+            self._build()
+
+    def _build(self) -> None:
+        self._by_id: Dict[str, IndexedOperation] = {}
+        self._by_route: Dict[Tuple[str, str], IndexedOperation] = {}
+        self._by_tag: Dict[str, List[IndexedOperation]] = {}
+        self._path_items: Dict[str, Tuple[Dict[str, Any], LazyPathItem]] = {}
+        paths = self._raw_paths()
+        for path, item in (paths.items() if isinstance(paths, dict) else ()):
+            if not isinstance(item, dict):
+                continue
+            for method in HTTP_METHODS:
+                raw = item.get(method)
+                if not isinstance(raw, dict):
+                    continue
+                entry = IndexedOperation(self, path, method, item, raw)
+                self._by_route[(method, path)] = entry
+                if entry.operation_id is not None:
+                    if entry.operation_id in self._by_id:
+                        logger.warning("Duplicate operationId %r at %s", entry.operation_id,
+                                       entry.pointer)
+                    else:
+                        self._by_id[entry.operation_id] = entry
+                for tag in entry.tags:
+                    self._by_tag.setdefault(tag, []).append(entry)
+        self._built_for = self._signature()
+        self._stale = False
+
+    def _path_item(self, path: str, item: Dict[str, Any]) -> LazyPathItem:
+        known = self._path_items.get(path)
+        if known is not None and known[0] is item:
+            return known[1]
+        if isinstance(self.document.paths, LazyMapping):
+            # Shares the operations already validated by the lazy document
+            lazy_item = self.document.paths[path]
+        else:
+            lazy_item = LazyPathItem(item, f"/paths/{escape_token(path)}")
+        self._path_items[path] = (item, lazy_item)
+        return lazy_item
+
+
+def operation_index(document: Union[OpenAPI, LazyOpenAPI]) -> OperationIndex:
+    """
+    Returns the operation index of a document, building it on first use.
+
+    The index is kept for as long as the document lives, so repeated calls (e.g. once per
+    request) are cheap. It only refers to the document weakly.
+
+    Args:
+        document (Union[OpenAPI, LazyOpenAPI]): A parsed document.
+
+    Returns:
+        OperationIndex: The index of the document's operations.
+    """
+    key = id(document)
+    index = _indexes.get(key)
+    if index is None or index._document() is not document:
+        index = _indexes[key] = OperationIndex(document)
+        index._owner = None
+        weakref.finalize(document, _indexes.pop, key, None)
+    return index
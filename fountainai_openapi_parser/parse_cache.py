@@ -0,0 +1,299 @@
+import gc
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pydantic
+
+from . import __version__
+from .loader import CHUNK_SIZE, Buffer, load_bytes
+from .models import OpenAPI
+from .remote import is_url, shared_http_fetcher, write_atomic
+from .utils import Location, base_location, external_documents
+
+logger = logging.getLogger(__name__)
+
+# Default upper bound for the total size of a cache directory
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+# Bumped whenever the layout of the cache entries changes
+CACHE_FORMAT = 1
+
+# Everything besides the input that decides what a cached model looks like
+_VERSION_TAG = (
+    f"format {CACHE_FORMAT}|parser {__version__}|pydantic {pydantic.VERSION}|"
+    f"python {sys.version_info[0]}.{sys.version_info[1]}"
+).encode("utf-8")
+
+_MANIFEST_SUFFIX = ".manifest"
+_MODEL_SUFFIX = ".model"
+_DOCUMENT_SUFFIX = ".document"
+
+
+def _hash_file(path: Path) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    Persistent, content-addressed cache of validated OpenAPI models.
+
+    An entry is found through the SHA-256 of the document bytes, the selected sections and
+    the parser, pydantic and Python versions. It records the external files the document
+    refers to (directly or through other files) with their hashes, and is only used while
+    all of them are unchanged. Models are stored pickled, so a hit skips decoding and
+    validation entirely; only point cache_dir at a directory that untrusted users cannot write.
+
+    Writes go to temporary files that are renamed into place, so concurrent writers and
+    readers never see partial entries. Once the directory grows beyond max_bytes, the least
+    recently used files are removed.
+
+    Attributes:
+        cache_dir (Path): The cache directory.
+        max_bytes (int): Size limit for the directory.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def source_key(self, data: Buffer, select: Optional[Sequence[str]] = None) -> str:
+        """
+        Returns the key of a document's manifest.
+
+        Args:
+            data (Buffer): The raw document.
+            select (Optional[Sequence[str]], optional): Sections that are loaded, if not all.
+
+        Returns:
+            str: A hex SHA-256 digest.
+        """
+        digest = hashlib.sha256(_VERSION_TAG)
+        if select is not None:
+            digest.update(json.dumps(sorted(select)).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _model_key(source_key: str, dependencies: Dict[str, Optional[str]]) -> str:
+        digest = hashlib.sha256(source_key.encode("ascii"))
+        digest.update(json.dumps(sorted(dependencies.items())).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, source_key: str) -> Optional[OpenAPI]:
+        """
+        Returns the cached model for a manifest key, if it is present and current.
+
+        Args:
+            source_key (str): The key from source_key.
+
+        Returns:
+            Optional[OpenAPI]: The model, or None on a miss.
+        """
+        manifest_path = self.cache_dir / (source_key + _MANIFEST_SUFFIX)
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        # Current hashes of the recorded dependencies; a missing file hashes to None
+        dependencies = {
+            location: None if is_url(location) else _hash_file(Path(location))
+            for location in manifest.get("dependencies", {})
+        }
+        if dependencies != manifest.get("dependencies"):
+            return None
+        model_path = self.cache_dir / (self._model_key(source_key, dependencies) + _MODEL_SUFFIX)
+        try:
+            data = model_path.read_bytes()
+            # Unpickling builds many small objects; pausing the collector makes it much faster
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                model = pickle.loads(data)
+            finally:
+                if enabled:
+                    gc.enable()
+        except OSError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable parse cache entry %s: %s", model_path, e)
+            return None
+        # Mark the entry as recently used for the eviction order
+        for path in (manifest_path, model_path):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return model if isinstance(model, OpenAPI) else None
+
+    def put(self, source_key: str, content: Any, location: Location, model: OpenAPI) -> None:
+        """
+        Stores a validated model together with the hashes of its external dependencies.
+
+        Args:
+            source_key (str): The key from source_key.
+            content (Any): The decoded document, scanned for external references.
+            location (Location): The document's path, to resolve relative references.
+            model (OpenAPI): The validated model.
+        """
+        dependencies = _dependencies(content, location)
+        model_key = self._model_key(source_key, dependencies)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.cache_dir / (model_key + _MODEL_SUFFIX),
+                          pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+            # The manifest is written last, so it never points at a missing model
+            write_atomic(self.cache_dir / (source_key + _MANIFEST_SUFFIX),
+                          json.dumps({"dependencies": dependencies}).encode("utf-8"))
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning("Could not write the parse cache entry %s: %s", source_key, e)
+            return
+        self.evict()
+
+    def load_document(self, location: Location) -> Any:
+        """
+        Decodes an external document, reusing the decoded form stored by any process that
+        read the same bytes before.
+
+        Entries are keyed by the SHA-256 of the file's bytes, so they never go stale. This is
+        meant as the loader of a DocumentCache, to share decoded documents between worker
+        processes. URLs are loaded with shared_http_fetcher, which has a disk cache of its own.
+
+        Args:
+            location (Location): The document's file path or HTTP(S) URL.
+
+        Returns:
+            Any: The decoded document.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            yaml.YAMLError: If the file is neither valid JSON nor valid YAML.
+        """
+        if is_url(location):
+            return shared_http_fetcher.load(location)  # type: ignore[arg-type]
+        data = Path(location).read_bytes()
+        digest = hashlib.sha256(_VERSION_TAG)
+        digest.update(b"\0document\0")
+        digest.update(data)
+        path = self.cache_dir / (digest.hexdigest() + _DOCUMENT_SUFFIX)
+        try:
+            document = pickle.loads(path.read_bytes())
+        except OSError:
+            pass
+        except Exception as e:
+            logger.warning("Ignoring unreadable parse cache entry %s: %s", path, e)
+        else:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return document
+        document = load_bytes(data, str(location))
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL))
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning("Could not write the parse cache entry %s: %s", path, e)
+            return document
+        self.evict()
+        return document
+
+    def evict(self) -> int:
+        """
+        Removes the least recently used files until the directory fits in max_bytes.
+
+        Returns:
+            int: The number of files removed.
+        """
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.cache_dir) as scan:
+                for entry in scan:
+                    if entry.name.endswith((_MANIFEST_SUFFIX, _MODEL_SUFFIX, _DOCUMENT_SUFFIX)):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                        total += stat.st_size
+        except OSError:
+            return 0
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                # Already removed by a concurrent writer
+                pass
+            total -= size
+        return removed
+
+
+def _dependencies(content: Any, location: Location) -> Dict[str, Optional[str]]:
+    """
+    Finds the external documents a document depends on, directly or transitively.
+
+    Args:
+        content (Any): The decoded document.
+        location (Location): The document's path or URL.
+
+    Returns:
+        Dict[str, Optional[str]]: The SHA-256 of every referenced file (None if it cannot be
+            read), keyed by absolute path. URLs are recorded with None and not followed.
+    """
+    dependencies: Dict[str, Optional[str]] = {}
+    pending: List[Tuple[Any, Location]] = [(content, base_location(location))]
+    while pending:
+        document, document_path = pending.pop()
+        for reference in external_documents(document, document_path):
+            key = reference if is_url(reference) else os.path.abspath(reference)
+            if key in dependencies:
+                continue
+            dependencies[key] = None if is_url(key) else _hash_file(Path(key))
+            if dependencies[key] is None:
+                continue
+            try:
+                pending.append((load_bytes(Path(key).read_bytes(), key), Path(key)))
+            except Exception as e:
+                logger.debug("Could not scan %s for references: %s", key, e)
+    return dependencies
+
+
+def cached_parse(cache: ParseCache, data: Buffer, location: Location,
+                 select: Optional[Sequence[str]],
+                 parse: Callable[[], Tuple[Any, OpenAPI]]) -> Tuple[OpenAPI, bool]:
+    """
+    Returns the cached model for a document, or parses and caches it.
+
+    Args:
+        cache (ParseCache): The cache.
+        data (Buffer): The raw document.
+        location (Location): The document's path.
+        select (Optional[Sequence[str]]): Sections that are loaded, if not all.
+        parse (Callable[[], Tuple[Any, OpenAPI]]): Decodes and validates the document,
+            returning the decoded content and the model.
+
+    Returns:
+        Tuple[OpenAPI, bool]: The model, and whether it came from the cache.
+    """
+    source_key = cache.source_key(data, select)
+    model = cache.get(source_key)
+    if model is not None:
+        return model, True
+    content, model = parse()
+    cache.put(source_key, content, location, model)
+    return model, False
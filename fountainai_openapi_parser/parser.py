@@ -1,11 +1,23 @@
+from pathlib import Path
+from typing import IO, Any, BinaryIO, Dict, Optional, Sequence, Union
 import yaml
 import logging
-import codecs
+from pydantic import BaseModel, Field, TypeAdapter
+from .models import OpenAPI, Info, Components, PathItem
+from .exceptions import ParsingError, ValidationError, ReferenceResolutionError
+from .loader import Buffer, load_bytes, load_content, load_selected, open_buffer
+from .source import Source
+from .incremental import record_content
+from .lazy import LazyOpenAPI
+from .parse_cache import ParseCache, cached_parse
 
 # Configure logging
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
 
+# The Paths Object maps each relative path to the operations available on it
+Paths = Dict[str, PathItem]
+
 # Define a schema validator for OpenAPI content using Pydantic
 
 
@@ -23,15 +35,39 @@ class OpenAPISchemaValidator(BaseModel):
     # The 'externalDocs' field is optional and provides additional external documentation
     externalDocs: Optional[Any] = None
 
-# Function to parse OpenAPI content from a dictionary
 
+# Validates the Paths Object without keeping a typed copy of it around
+_paths_adapter: TypeAdapter = TypeAdapter(Paths)
+
+# Function to validate OpenAPI content with a single pydantic pass over each node.
+# OpenAPI.paths is stored as a plain dict, so the path items are checked against PathItem first
+# and the typed result is dropped straight away, before the OpenAPI model is built. This keeps
+# the checks of OpenAPISchemaValidator without materializing a dumped intermediate copy.
+
+
+def _parse_single_pass(content: Dict[str, Any]) -> OpenAPI:
+    paths = content.get("paths") if isinstance(content, dict) else None
+    if paths is not None:
+        _paths_adapter.validate_python(paths)
+    return OpenAPI.model_validate(content)
+
+# Function to parse OpenAPI content from a dictionary. With track_changes, digests of the path
+# items and components are recorded so that incremental.reparse can tell which entries changed,
+# even if content is edited in place; this costs extra time, so it is off by default.
 
-def parse_openapi(content: Dict[str, Any]) -> OpenAPI:
+
+def parse_openapi(content: Dict[str, Any], single_pass: bool = True,
+                  track_changes: bool = False) -> OpenAPI:
     try:
-        # Validate content against OpenAPISchemaValidator
-        validated_content = OpenAPISchemaValidator(**content).dict()
-        # Attempt to parse the validated content as an OpenAPI object
-        openapi = OpenAPI(**validated_content)
+        if single_pass:
+            openapi = _parse_single_pass(content)
+        else:
+            # Validate content against OpenAPISchemaValidator
+            validated_content = OpenAPISchemaValidator(**content).dict()
+            # Attempt to parse the validated content as an OpenAPI object
+            openapi = OpenAPI(openapi=content.get("openapi"), **validated_content)
+        if track_changes:
+            record_content(openapi, content)
         return openapi
     except (ValidationError, ReferenceResolutionError) as e:
         # Raise a ParsingError if the input content cannot be validated as OpenAPI
@@ -41,13 +77,26 @@ def parse_openapi(content: Dict[str, Any]) -> OpenAPI:
         logger.error("Unexpected error while parsing OpenAPI specification", exc_info=True)
         raise ParsingError(f"Unexpected error while parsing OpenAPI specification: {e}")
 
+# Function to parse OpenAPI content lazily: only the top-level fields are validated up front,
+# path items, operations and components are validated on first access
+
+
+def parse_openapi_lazy(content: Dict[str, Any]) -> LazyOpenAPI:
+    try:
+        return LazyOpenAPI(content)
+    except ParsingError:
+        raise
+    except Exception as e:
+        logger.error("Unexpected error while parsing OpenAPI specification", exc_info=True)
+        raise ParsingError(f"Unexpected error while parsing OpenAPI specification: {e}")
+
 # Function to load OpenAPI content from a YAML string
 
 
 def load_openapi_from_yaml(yaml_content: str) -> OpenAPI:
     try:
-        # Load the YAML content into a Python dictionary
-        content = yaml.safe_load(yaml_content)
+        # Load the YAML (or JSON) content into a Python dictionary
+        content = load_content(yaml_content)
         if not isinstance(content, dict):
             # Ensure the loaded content is a dictionary representing the OpenAPI document
             raise ParsingError(
@@ -60,17 +109,107 @@ def load_openapi_from_yaml(yaml_content: str) -> OpenAPI:
         logger.error("Unexpected error while loading OpenAPI from YAML", exc_info=True)
         raise ParsingError(f"Unexpected error while loading OpenAPI from YAML: {e}")
 
-# Function to load OpenAPI content from a file
+# Function to load OpenAPI content (JSON or YAML) from raw bytes
+
+
+def load_openapi_from_bytes(data: Buffer, name: str = "<buffer>") -> OpenAPI:
+    try:
+        return parse_openapi(_decode_bytes(data, name))
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        raise ParsingError(f"Invalid OpenAPI document structure: {e}")
+
+
+def _decode_bytes(data: Buffer, name: str) -> Dict[str, Any]:
+    # Decode straight from the buffer; the encoding is detected from the BOM or the content
+    content = load_bytes(data, name)
+    if not isinstance(content, dict):
+        raise ParsingError(
+            "YAML content must be a dictionary representing the OpenAPI document.")
+    return content
+
+# Sections that are always loaded so that a selective load still yields a valid OpenAPI model
+_REQUIRED_SECTIONS = ("/openapi", "/info")
 
+# Function to load only the selected sections (JSON Pointers) of an OpenAPI document
 
-def load_openapi_from_file(file_path: str) -> OpenAPI:
+
+def load_openapi_sections(stream: Union[str, IO[str], Buffer], select: Sequence[str]) -> OpenAPI:
+    try:
+        return parse_openapi(_decode_sections(stream, select))
+    except (yaml.YAMLError, ValueError) as e:
+        raise ParsingError(f"Invalid OpenAPI document structure: {e}")
+
+
+def _decode_sections(stream: Union[str, IO[str], Buffer],
+                     select: Sequence[str]) -> Dict[str, Any]:
+    # Build Python objects only for the selected subtrees of the YAML event stream
+    content = load_selected(stream, list(select) + list(_REQUIRED_SECTIONS))
+    if not isinstance(content, dict):
+        raise ParsingError(
+            "YAML content must be a dictionary representing the OpenAPI document.")
+    # Sections that were not selected are left out; 'paths' is required by the model
+    content.setdefault("paths", {})
+    return content
+
+# Function to load OpenAPI content from a file path or a binary file object. With a cache_dir,
+# validated models are kept on disk (see parse_cache.ParseCache) and reused while the file and
+# the files it references are unchanged.
+
+
+def load_openapi_from_file(file_path: Union[str, Path, BinaryIO],
+                           select: Optional[Sequence[str]] = None,
+                           cache_dir: Optional[Union[str, Path]] = None) -> OpenAPI:
     try:
-        # Read the YAML content from a file, handling BOM and different encodings
-        with codecs.open(file_path, 'r', encoding='utf-8-sig') as file:
-            yaml_content = file.read()
-        # Parse the YAML content as an OpenAPI object
-        return load_openapi_from_yaml(yaml_content)
+        # Memory map the file and parse the raw bytes, handling BOM and different encodings
+        with open_buffer(file_path) as buffer:
+            if cache_dir is not None:
+                return _load_cached(ParseCache(cache_dir), buffer, file_path, select)
+            if select is not None:
+                # Only build the sections that were asked for
+                return load_openapi_sections(buffer, select)
+            return load_openapi_from_bytes(buffer, str(getattr(file_path, "name", file_path)))
     except FileNotFoundError as e:
         raise ParsingError(f"File not found: {e}")
     except IOError as e:
         raise ParsingError(f"IO error while reading the file: {e}")
+
+# Function to look a document up in the parse cache, decoding and validating it on a miss
+
+
+def _load_cached(cache: ParseCache, buffer: Buffer, file_path: Union[str, Path, BinaryIO],
+                 select: Optional[Sequence[str]]) -> OpenAPI:
+    # Relative references in the document are resolved against its full path
+    if isinstance(file_path, (str, Path)):
+        name = str(file_path)
+    else:
+        name = str(getattr(file_path, "name", "<file>"))
+
+    def parse():
+        try:
+            if select is not None:
+                content = _decode_sections(buffer, select)
+            else:
+                content = _decode_bytes(buffer, name)
+        except (yaml.YAMLError, UnicodeDecodeError, ValueError) as e:
+            raise ParsingError(f"Invalid OpenAPI document structure: {e}")
+        return content, parse_openapi(content)
+
+    model, hit = cached_parse(cache, buffer, name, select, parse)
+    logger.debug("Parse cache %s for %s", "hit" if hit else "miss", name)
+    return model
+
+# Function to load OpenAPI content from an explicit Source (path, text, bytes, file or URL)
+
+
+def load_openapi_from_source(source: Source, select: Optional[Sequence[str]] = None) -> OpenAPI:
+    try:
+        with source.open() as document:
+            if select is not None:
+                return load_openapi_sections(document, select)
+            if isinstance(document, str):
+                return load_openapi_from_yaml(document)
+            return load_openapi_from_bytes(document, source.name)
+    except FileNotFoundError as e:
+        raise ParsingError(f"File not found: {e}")
+    except IOError as e:
+        raise ParsingError(f"IO error while reading {source.name}: {e}")
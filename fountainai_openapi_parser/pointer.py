@@ -0,0 +1,202 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Tuple, Union
+from urllib.parse import unquote
+
+from .exceptions import JsonPointerError
+
+# A parsed JSON Pointer: its unescaped reference tokens
+Tokens = Tuple[str, ...]
+
+# A '~' that does not start a valid escape ('~0' or '~1')
+_INVALID_ESCAPE = re.compile(r"~(?![01])")
+
+
+@lru_cache(maxsize=8192)
+def parse_pointer(pointer: str) -> Tokens:
+    """
+    Parses a JSON Pointer (RFC 6901) into its unescaped reference tokens.
+
+    Results are cached, so each distinct pointer is only split and unescaped once.
+
+    Args:
+        pointer (str): The pointer, e.g. '/paths/~1pets~1{id}/get'.
+
+    Returns:
+        Tokens: The reference tokens, e.g. ('paths', '/pets/{id}', 'get').
+
+    Raises:
+        JsonPointerError: If the pointer does not start with '/' or has an invalid '~' escape.
+    """
+    if pointer == "":
+        return ()
+    if not pointer.startswith("/"):
+        raise JsonPointerError(f"Invalid JSON Pointer {pointer!r}: must start with '/'", pointer)
+    tokens = pointer[1:].split("/")
+    for index, token in enumerate(tokens):
+        if "~" in token:
+            if _INVALID_ESCAPE.search(token):
+                raise JsonPointerError(
+                    f"Invalid JSON Pointer {pointer!r}: '~' must be followed by '0' or '1'",
+                    pointer,
+                )
+            # '~1' is decoded before '~0' so that '~01' becomes '~1' and not '/'
+            tokens[index] = token.replace("~1", "/").replace("~0", "~")
+    return tuple(tokens)
+
+
+@lru_cache(maxsize=8192)
+def parse_fragment(fragment: str) -> Tokens:
+    """
+    Parses the URI fragment of a $ref (the part after '#') into reference tokens.
+
+    The fragment is percent-decoded before it is parsed as a JSON Pointer, so
+    '/paths/~1pets~1%7Bid%7D' refers to the '/pets/{id}' path.
+
+    Args:
+        fragment (str): The fragment without the leading '#'.
+
+    Returns:
+        Tokens: The reference tokens.
+
+    Raises:
+        JsonPointerError: If the decoded fragment is not a valid JSON Pointer.
+    """
+    return parse_pointer(unquote(fragment) if "%" in fragment else fragment)
+
+
+def escape_token(token: Any) -> str:
+    """Escapes a single reference token ('~' becomes '~0' and '/' becomes '~1')."""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def format_pointer(tokens: Iterable[Any]) -> str:
+    """
+    Builds a JSON Pointer from reference tokens.
+
+    Args:
+        tokens (Iterable[Any]): The reference tokens; non-string tokens are converted with str().
+
+    Returns:
+        str: The escaped pointer, e.g. '/paths/~1pets~1{id}'.
+    """
+    return "".join("/" + escape_token(token) for token in tokens)
+
+
+def resolve_token(node: Any, token: str, tokens: Tokens, depth: int) -> Any:
+    """
+    Evaluates one reference token of a JSON Pointer.
+
+    Args:
+        node (Any): The node reached by the tokens before this one.
+        token (str): The token, tokens[depth].
+        tokens (Tokens): The whole pointer, for error messages.
+        depth (int): The position of the token in the pointer.
+
+    Returns:
+        Any: The child of the node named by the token.
+
+    Raises:
+        JsonPointerError: If the node has no such child.
+    """
+    if isinstance(node, dict):
+        if token in node:
+            return node[token]
+        # YAML loads keys such as response codes (200) as integers
+        if token.isascii() and token.isdigit() and int(token) in node:
+            return node[int(token)]
+        raise JsonPointerError(
+            f"JSON Pointer {format_pointer(tokens)!r}: key {token!r} not found "
+            f"at {format_pointer(tokens[:depth]) or '/'}",
+            format_pointer(tokens),
+        )
+    if isinstance(node, list):
+        if token.isascii() and token.isdigit() and (token == "0" or not token.startswith("0")):
+            index = int(token)
+            if index < len(node):
+                return node[index]
+            problem = f"index {index} is out of range ({len(node)} items)"
+        else:
+            problem = f"{token!r} is not an array index"
+        raise JsonPointerError(
+            f"JSON Pointer {format_pointer(tokens)!r}: {problem} "
+            f"at {format_pointer(tokens[:depth]) or '/'}",
+            format_pointer(tokens),
+        )
+    raise JsonPointerError(
+        f"JSON Pointer {format_pointer(tokens)!r}: cannot descend into "
+        f"{type(node).__name__} at {format_pointer(tokens[:depth]) or '/'}",
+        format_pointer(tokens),
+    )
+
+
+def resolve_pointer(document: Any, pointer: Union[str, Tokens]) -> Any:
+    """
+    Evaluates a JSON Pointer against a document.
+
+    Args:
+        document (Any): The document (nested dicts and lists).
+        pointer (Union[str, Tokens]): The pointer string or its parsed tokens.
+
+    Returns:
+        Any: The referenced value.
+
+    Raises:
+        JsonPointerError: If the pointer is invalid or a token does not match the document.
+    """
+    tokens = parse_pointer(pointer) if isinstance(pointer, str) else pointer
+    node = document
+    for depth, token in enumerate(tokens):
+        node = resolve_token(node, token, tokens, depth)
+    return node
+
+
+class PointerIndex:
+    """
+    Memoized JSON Pointer lookups against one document.
+
+    Every prefix that is walked is remembered, so repeated references into the same part of a
+    document (e.g. '#/components/schemas/...') cost one dict lookup each. The document must
+    not be modified while the index is in use.
+
+    Attributes:
+        document (Any): The document the pointers are evaluated against.
+    """
+
+    def __init__(self, document: Any):
+        self.document = document
+        self._nodes: Dict[Tokens, Any] = {(): document}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def resolve(self, pointer: Union[str, Tokens]) -> Any:
+        """
+        Evaluates a JSON Pointer, reusing previously walked prefixes.
+
+        Args:
+            pointer (Union[str, Tokens]): The pointer string or its parsed tokens.
+
+        Returns:
+            Any: The referenced value.
+
+        Raises:
+            JsonPointerError: If the pointer is invalid or a token does not match the document.
+        """
+        tokens = parse_pointer(pointer) if isinstance(pointer, str) else pointer
+        nodes = self._nodes
+        if tokens in nodes:
+            return nodes[tokens]
+        # Find the longest prefix that was already resolved and walk on from there
+        depth = len(tokens) - 1
+        while tokens[:depth] not in nodes:
+            depth -= 1
+        node = nodes[tokens[:depth]]
+        for depth in range(depth, len(tokens)):
+            node = resolve_token(node, tokens[depth], tokens, depth)
+            nodes[tokens[:depth + 1]] = node
+        return node
+
+    def resolve_fragment(self, fragment: str) -> Any:
+        """Evaluates the URI fragment of a $ref (percent-encoded JSON Pointer)."""
+        return self.resolve(parse_fragment(fragment))
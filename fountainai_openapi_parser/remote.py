@@ -0,0 +1,227 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+from .loader import load_bytes
+
+logger = logging.getLogger(__name__)
+
+# Default timeout (in seconds) for HTTP requests
+DEFAULT_URL_TIMEOUT = 30.0
+
+# Default number of pooled connections per host and of requests in flight at once
+DEFAULT_MAX_CONNECTIONS = 10
+
+# Default number of responses an HttpFetcher keeps in memory
+DEFAULT_MAX_ENTRIES = 256
+
+# Validators of a cached response: (ETag, Last-Modified)
+Validators = Tuple[Optional[str], Optional[str]]
+
+
+def is_url(location: Union[str, Path]) -> bool:
+    """Returns True if a $ref location or base path is an HTTP(S) URL."""
+    return isinstance(location, str) and location.startswith(("http://", "https://"))
+
+
+class HttpFetcher:
+    """
+    Downloads remote documents over one pooled, keep-alive requests.Session.
+
+    Responses are revalidated rather than re-downloaded: the ETag and Last-Modified headers of
+    the last response are sent back as If-None-Match and If-Modified-Since, and a 304 reply
+    reuses the stored body (and the document parsed from it). The max_entries most recently used
+    responses are kept in memory; with a cache_dir, bodies and validators are also kept on
+    disk, so they survive restarts and evictions.
+
+    Instances are safe to share between threads; at most max_concurrency requests are in
+    flight at once.
+
+    Attributes:
+        cache_dir (Optional[Path]): Directory of the disk cache, or None to cache in memory only.
+        timeout (float): Timeout in seconds for each request.
+        max_connections (int): Connections kept open per host.
+        max_entries (Optional[int]): Maximum number of responses kept in memory, or None for no
+            limit.
+        requests (int): Number of HTTP requests sent.
+        revalidated (int): Number of requests answered with 304 Not Modified.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None,
+                 timeout: float = DEFAULT_URL_TIMEOUT,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_concurrency: int = DEFAULT_MAX_CONNECTIONS,
+                 max_entries: Optional[int] = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_entries = max_entries
+        self.requests = 0
+        self.revalidated = 0
+        self._session = None
+        self._limit = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        # url -> (validators, body, parsed document or None), least recently used first
+        self._memory: "OrderedDict[str, Tuple[Validators, bytes, Any]]" = OrderedDict()
+
+    @property
+    def session(self) -> Any:
+        """The shared requests.Session, created on first use."""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.max_connections,
+                                      pool_maxsize=self.max_connections)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _cache_file(self, url: str) -> Path:
+        return self.cache_dir / hashlib.sha256(url.encode("utf-8")).hexdigest()  # type: ignore
+
+    def _remember(self, url: str, entry: Tuple[Validators, bytes, Any]) -> None:
+        with self._lock:
+            self._memory[url] = entry
+            self._memory.move_to_end(url)
+            while self.max_entries is not None and len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _cached(self, url: str) -> Optional[Tuple[Validators, bytes, Any]]:
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                self._memory.move_to_end(url)
+        if entry is not None or self.cache_dir is None:
+            return entry
+        path = self._cache_file(url)
+        try:
+            meta = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+            body = path.with_suffix(".body").read_bytes()
+        except (OSError, ValueError):
+            return None
+        return (meta.get("etag"), meta.get("last_modified")), body, None
+
+    def _store(self, url: str, validators: Validators, body: bytes) -> None:
+        if self.cache_dir is None:
+            return
+        path = self._cache_file(url)
+        meta = {"url": url, "etag": validators[0], "last_modified": validators[1]}
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # The body is replaced first, so the validators on disk never describe a newer body
+            write_atomic(path.with_suffix(".body"), body)
+            write_atomic(path.with_suffix(".json"), json.dumps(meta).encode("utf-8"))
+        except OSError as e:
+            logger.warning("Could not write the HTTP cache entry for %s: %s", url, e)
+
+    def _request(self, url: str) -> Tuple[bytes, Any]:
+        cached = self._cached(url)
+        headers = {}
+        if cached is not None:
+            etag, last_modified = cached[0]
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        with self._limit:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        with self._lock:
+            self.requests += 1
+        if response.status_code == 304 and cached is not None:
+            with self._lock:
+                self.revalidated += 1
+            self._remember(url, cached)
+            return cached[1], cached[2]
+        response.raise_for_status()
+        body = response.content
+        validators = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        # A response without validators can never be revalidated, so it is not kept
+        if validators != (None, None):
+            self._remember(url, (validators, body, None))
+            self._store(url, validators, body)
+        return body, None
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Returns the body of a URL, revalidating any cached copy.
+
+        Args:
+            url (str): The HTTP(S) URL.
+
+        Returns:
+            bytes: The response body.
+
+        Raises:
+            requests.RequestException: If the request fails or returns an error status.
+        """
+        return self._request(url)[0]
+
+    def load(self, url: str) -> Any:
+        """
+        Downloads and decodes the JSON or YAML document at a URL.
+
+        A document that is still current (304 Not Modified) is not decoded again.
+
+        Args:
+            url (str): The HTTP(S) URL, without a fragment.
+
+        Returns:
+            Any: The decoded document. It may be shared and must be treated as read-only.
+
+        Raises:
+            requests.RequestException: If the request fails or returns an error status.
+            yaml.YAMLError: If the body is neither valid JSON nor valid YAML.
+        """
+        body, document = self._request(url)
+        if document is None:
+            document = load_bytes(body, url)
+            with self._lock:
+                entry = self._memory.get(url)
+                if entry is not None and entry[1] is body:
+                    self._memory[url] = (entry[0], body, document)
+        return document
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Writes a file so that readers and concurrent writers never see it partly written.
+
+    The data goes to a temporary file in the same directory, which is then renamed over the
+    target.
+
+    Args:
+        path (Path): The file to write; its directory must exist.
+        data (bytes): The new content.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Fetcher used for remote $ref targets and URL sources unless another one is configured
+shared_http_fetcher = HttpFetcher()
@@ -0,0 +1,217 @@
+import re
+from typing import Dict, List, Optional, Pattern, Tuple, Union
+from urllib.parse import unquote
+
+from .lazy import LazyOpenAPI
+from .models import OpenAPI, Operation
+from .operations import IndexedOperation, operation_index
+
+# A path template parameter, e.g. '{id}'
+_TEMPLATE_PARAMETER = re.compile(r"\{([^{}/]+)\}")
+
+
+class RouteMatch:
+    """
+    The operation matched by a request, with the values of its path parameters.
+
+    Attributes:
+        entry (IndexedOperation): The matched operation and its merged path-level context.
+        path_params (Dict[str, str]): Path parameter values, percent-decoded.
+    """
+
+    __slots__ = ("entry", "path_params")
+
+    def __init__(self, entry: IndexedOperation, path_params: Dict[str, str]):
+        self.entry = entry
+        self.path_params = path_params
+
+    def __repr__(self) -> str:
+        return f"RouteMatch({self.entry!r}, {self.path_params!r})"
+
+    @property
+    def template(self) -> str:
+        """The matched path template."""
+        return self.entry.path
+
+    @property
+    def operation(self) -> Operation:
+        """The validated Operation."""
+        return self.entry.operation
+
+
+class _Node:
+    """
+    One segment position of the trie.
+
+    Children are kept by kind, in the order they are tried: literal segments, segments mixing
+    literal text and parameters (e.g. '{name}.{ext}'), then whole-segment parameters.
+    """
+
+    __slots__ = ("literals", "patterns", "parameters", "template", "methods")
+
+    def __init__(self):
+        self.literals: Dict[str, _Node] = {}
+        self.patterns: List[Tuple[Pattern, Tuple[str, ...], _Node]] = []
+        self.parameters: Dict[str, _Node] = {}
+        # Set on the node that ends a path template
+        self.template: Optional[str] = None
+        self.methods: Dict[str, IndexedOperation] = {}
+
+
+def _segment_pattern(segment: str) -> Tuple[Pattern, Tuple[str, ...]]:
+    names: List[str] = []
+    parts: List[str] = []
+    position = 0
+    for match in _TEMPLATE_PARAMETER.finditer(segment):
+        parts.append(re.escape(segment[position:match.start()]))
+        parts.append("(.+?)")
+        names.append(match.group(1))
+        position = match.end()
+    parts.append(re.escape(segment[position:]))
+    return re.compile("".join(parts), re.DOTALL), tuple(names)
+
+
+class Router:
+    """
+    Matches request paths to the operations of a document.
+
+    The path templates are compiled into a trie with one level per path segment, so matching
+    costs time proportional to the number of segments of the request path rather than to the
+    number of templates. As the OpenAPI specification requires, a literal segment is preferred
+    to a templated one: '/characters/me' matches that template before '/characters/{id}'.
+    If the preferred branch does not lead to a template, the next one is tried.
+
+    The router is a snapshot of the document; build a new one after editing the paths.
+
+    Attributes:
+        document (Union[OpenAPI, LazyOpenAPI]): The routed document.
+        base_path (str): Prefix stripped from request paths before matching, e.g. '/v1'.
+    """
+
+    def __init__(self, document: Union[OpenAPI, LazyOpenAPI], base_path: str = ""):
+        self.document = document
+        self.base_path = base_path.rstrip("/")
+        self._root = _Node()
+        self._templates = 0
+        for entry in operation_index(document):
+            node = self._insert(entry.path)
+            node.methods[entry.method] = entry
+
+    def __len__(self) -> int:
+        """Number of path templates."""
+        return self._templates
+
+    def __repr__(self) -> str:
+        return f"Router({self._templates} templates)"
+
+    def _insert(self, template: str) -> _Node:
+        node = self._root
+        for segment in template.split("/")[1:]:
+            parameter = _TEMPLATE_PARAMETER.fullmatch(segment)
+            if parameter is not None:
+                node = node.parameters.setdefault(parameter.group(1), _Node())
+            elif "{" in segment:
+                pattern, names = _segment_pattern(segment)
+                for known, known_names, child in node.patterns:
+                    if known.pattern == pattern.pattern and known_names == names:
+                        node = child
+                        break
+                else:
+                    node.patterns.append((pattern, names, _Node()))
+                    node = node.patterns[-1][2]
+            else:
+                node = node.literals.setdefault(segment, _Node())
+        if node.template is None:
+            node.template = template
+            self._templates += 1
+        return node
+
+    def _find(self, path: str, decoded: bool) -> Optional[Tuple[_Node, Dict[str, str]]]:
+        """
+        Finds the node of the template matching a request path.
+
+        Returns:
+            Optional[Tuple[_Node, Dict[str, str]]]: The node and the path parameters, or None.
+        """
+        if not decoded:
+            path = path.split("?", 1)[0]
+        if self.base_path:
+            if path != self.base_path and not path.startswith(self.base_path + "/"):
+                return None
+            path = path[len(self.base_path):] or "/"
+        if not path.startswith("/"):
+            return None
+        segments = path.split("/")[1:]
+        values: List[Tuple[str, str]] = []
+
+        def walk(node: _Node, depth: int) -> Optional[_Node]:
+            if depth == len(segments):
+                return node if node.template is not None else None
+            segment = segments[depth]
+            child = node.literals.get(segment)
+            if child is not None:
+                found = walk(child, depth + 1)
+                if found is not None:
+                    return found
+            if not segment:
+                # Parameters never match an empty segment
+                return None
+            for pattern, names, child in node.patterns:
+                match = pattern.fullmatch(segment)
+                if match is not None:
+                    values.extend(zip(names, match.groups()))
+                    found = walk(child, depth + 1)
+                    if found is not None:
+                        return found
+                    del values[len(values) - len(names):]
+            for name, child in node.parameters.items():
+                values.append((name, segment))
+                found = walk(child, depth + 1)
+                if found is not None:
+                    return found
+                values.pop()
+            return None
+
+        node = walk(self._root, 0)
+        if node is None:
+            return None
+        if decoded:
+            return node, dict(values)
+        return node, {name: unquote(value) for name, value in values}
+
+    def match(self, method: str, path: str, decoded: bool = False) -> Optional[RouteMatch]:
+        """
+        Finds the operation for a request.
+
+        Args:
+            method (str): The HTTP method, in any case.
+            path (str): The request path, e.g. '/characters/42/actions'. A query string is
+                ignored.
+            decoded (bool): Whether path is already percent-decoded, as WSGI's PATH_INFO is.
+                Its path parameter values are then used as they are, and it has no query
+                string. An encoded '/' cannot be told from a separator in such a path.
+
+        Returns:
+            Optional[RouteMatch]: The match, or None if no template matches the path or the
+                matching template has no operation for the method.
+        """
+        found = self._find(path, decoded)
+        if found is None:
+            return None
+        node, path_params = found
+        entry = node.methods.get(method.lower())
+        return RouteMatch(entry, path_params) if entry is not None else None
+
+    def allowed_methods(self, path: str, decoded: bool = False) -> List[str]:
+        """
+        Lists the methods defined for the template matching a request path.
+
+        Args:
+            path (str): The request path.
+            decoded (bool): Whether path is already percent-decoded, as in match.
+
+        Returns:
+            List[str]: The lower-case methods; empty if no template matches.
+        """
+        found = self._find(path, decoded)
+        return list(found[0].methods) if found is not None else []
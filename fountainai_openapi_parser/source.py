@@ -0,0 +1,196 @@
+import io
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional, Union
+
+from .loader import CHUNK_SIZE, Buffer, decode_buffer, load_bytes, load_content, open_buffer
+from .remote import DEFAULT_URL_TIMEOUT, shared_http_fetcher
+
+# Longest path the filesystem accepts; longer strings can only be document content
+_MAX_PATH_LENGTH = 4096
+
+
+class Source:
+    """
+    An OpenAPI document source with an explicit kind.
+
+    Sources are created through the from_* constructors, so callers state whether a value is a
+    path, text, raw bytes, a file object or a URL instead of having it guessed from the value.
+
+    Attributes:
+        kind (str): One of Source.PATH, TEXT, BYTES, FILE or URL.
+        value (Any): The path, text, bytes-like object, file object or URL.
+        name (str): A display name used in error messages.
+        encoding (str): Codec for raw content that carries no byte order mark.
+        timeout (float): Timeout in seconds for URL sources.
+    """
+
+    PATH = "path"
+    TEXT = "text"
+    BYTES = "bytes"
+    FILE = "file"
+    URL = "url"
+
+    def __init__(self, kind: str, value: Any, name: str, encoding: str = "utf-8",
+                 timeout: float = DEFAULT_URL_TIMEOUT):
+        self.kind = kind
+        self.value = value
+        self.name = name
+        self.encoding = encoding
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f"Source({self.kind}, {self.name!r})"
+
+    @classmethod
+    def from_path(cls, path: Union[str, Path], encoding: str = "utf-8") -> "Source":
+        """Creates a source that reads the file at the given path."""
+        return cls(cls.PATH, Path(path), str(path), encoding)
+
+    @classmethod
+    def from_text(cls, text: str, name: str = "<string>") -> "Source":
+        """Creates a source from document content held in a string."""
+        return cls(cls.TEXT, text, name)
+
+    @classmethod
+    def from_bytes(cls, data: Buffer, name: str = "<bytes>", encoding: str = "utf-8") -> "Source":
+        """Creates a source from raw document content (bytes, bytearray or memoryview)."""
+        return cls(cls.BYTES, data, name, encoding)
+
+    @classmethod
+    def from_file(cls, file: IO, name: Optional[str] = None, encoding: str = "utf-8") -> "Source":
+        """Creates a source that reads from an open text or binary file object."""
+        return cls(cls.FILE, file, name or str(getattr(file, "name", "<file>")), encoding)
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = DEFAULT_URL_TIMEOUT) -> "Source":
+        """Creates a source that downloads the document from an HTTP(S) URL."""
+        return cls(cls.URL, url, url, timeout=timeout)
+
+    @classmethod
+    def guess(cls, value: Union[str, Path, Buffer, IO], encoding: str = "utf-8") -> "Source":
+        """
+        Creates a source from a value of unknown kind, as the legacy load_file did.
+
+        Strings are only checked against the filesystem when they could be a path at all:
+        multi-line or overly long strings are taken as document content without a stat call.
+
+        Args:
+            value (Union[str, Path, Buffer, IO]): A path, content, raw bytes or a file object.
+            encoding (str, optional): Codec for raw content. Defaults to 'utf-8'.
+
+        Returns:
+            Source: The source matching the value.
+        """
+        if isinstance(value, Path):
+            return cls.from_path(value, encoding)
+        if isinstance(value, (bytes, bytearray, memoryview, mmap.mmap)):
+            return cls.from_bytes(value, encoding=encoding)
+        if hasattr(value, "read"):
+            return cls.from_file(value, encoding=encoding)  # type: ignore[arg-type]
+        if _could_be_path(value):  # type: ignore[arg-type]
+            return cls.from_path(value, encoding)  # type: ignore[arg-type]
+        return cls.from_text(value)  # type: ignore[arg-type]
+
+    def _is_text_file(self) -> bool:
+        return isinstance(self.value, io.TextIOBase)
+
+    @contextmanager
+    def open(self) -> Iterator[Union[str, Buffer]]:
+        """
+        Opens the source for parsing.
+
+        Yields the document as a str for text sources and as a raw buffer otherwise; files are
+        memory mapped and URLs are downloaded in chunks.
+
+        Yields:
+            Union[str, Buffer]: The document content.
+
+        Raises:
+            FileNotFoundError: If a path source does not exist.
+            requests.RequestException: If a URL source cannot be downloaded.
+        """
+        if self.kind == self.TEXT:
+            yield self.value
+        elif self.kind == self.BYTES:
+            yield self.value
+        elif self.kind == self.FILE and self._is_text_file():
+            yield self.value.read()
+        elif self.kind == self.URL:
+            data = bytearray()
+            for chunk in self.iter_chunks():
+                data += chunk
+            yield data
+        else:
+            with open_buffer(self.value) as buffer:
+                yield buffer
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Union[str, bytes]]:
+        """
+        Reads the source incrementally.
+
+        Args:
+            chunk_size (int, optional): Maximum size of each chunk. Defaults to 64 KiB.
+
+        Yields:
+            Union[str, bytes]: Successive chunks; str for text sources, bytes otherwise.
+
+        Raises:
+            FileNotFoundError: If a path source does not exist.
+            requests.RequestException: If a URL source cannot be downloaded.
+        """
+        if self.kind == self.TEXT:
+            for start in range(0, len(self.value), chunk_size):
+                yield self.value[start:start + chunk_size]
+        elif self.kind == self.BYTES:
+            with memoryview(self.value) as view:
+                for start in range(0, len(view), chunk_size):
+                    yield view[start:start + chunk_size].tobytes()
+        elif self.kind == self.URL:
+            # Reuses the pooled keep-alive connections of the shared fetcher
+            session = shared_http_fetcher.session
+            with session.get(self.value, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                yield from response.iter_content(chunk_size)
+        elif self.kind == self.PATH:
+            with open(self.value, "rb") as file:
+                yield from iter(lambda: file.read(chunk_size), b"")
+        else:
+            yield from iter(lambda: self.value.read(chunk_size), self.value.read(0))
+
+    def read_text(self) -> str:
+        """
+        Reads the whole source as a str, without any byte order mark.
+
+        Returns:
+            str: The document content.
+        """
+        with self.open() as document:
+            if isinstance(document, str):
+                return document
+            return decode_buffer(document, self.encoding)
+
+    def load(self) -> Any:
+        """
+        Decodes the document (JSON or YAML) into Python objects.
+
+        Returns:
+            Any: The decoded document.
+
+        Raises:
+            yaml.YAMLError: If the content is neither valid JSON nor valid YAML.
+        """
+        with self.open() as document:
+            if isinstance(document, str):
+                return load_content(document)
+            return load_bytes(document, self.name)
+
+
+def _could_be_path(value: str) -> bool:
+    if len(value) > _MAX_PATH_LENGTH or "\n" in value:
+        return False
+    try:
+        return Path(value).exists()
+    except (OSError, ValueError):
+        return False
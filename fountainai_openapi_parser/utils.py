@@ -1,45 +1,88 @@
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-import yaml
-import json
-from typing import Union, Dict, Any
+from typing import BinaryIO, Iterator, List, Optional, Set, Tuple, Union, Dict, Any
+from urllib.parse import urljoin
+from .cache import DocumentCache, shared_document_cache
 from .exceptions import ReferenceResolutionError
+from .loader import Buffer
+from .pointer import PointerIndex, format_pointer
+from .remote import is_url
+from .source import Source
 
+logger = logging.getLogger(__name__)
 
-def load_file(source: Union[str, Path], encoding: str = "utf-8") -> str:
+# Default number of threads used to load external documents ahead of resolution
+DEFAULT_PREFETCH_WORKERS = 8
+
+# Where a document lives: a file path or an HTTP(S) URL
+Location = Union[Path, str]
+
+
+def load_file(source: Union[str, Path, Buffer, BinaryIO], encoding: str = "utf-8") -> str:
     """
-    Loads the content of a file from a given path or string.
+    Loads the content of a file from a given path, string, bytes-like object or binary file.
 
     Args:
-        source (Union[str, Path]): The file path or content as a string.
-        encoding (str, optional): The encoding of the file if a file path is provided. Defaults to 'utf-8'.
+        source (Union[str, Path, Buffer, BinaryIO]): The file path, the content as a string,
+            the raw content as bytes, bytearray or memoryview, or a binary file object.
+        encoding (str, optional): The encoding of raw content that is not marked or detected
+            as UTF-16/32. Defaults to 'utf-8'.
 
     Returns:
-        str: The content of the file.
+        str: The content of the file, without any byte order mark.
 
     Raises:
         FileNotFoundError: If the provided file path does not exist.
         IOError: If there is an issue reading the file.
     """
-    if isinstance(source, Path) or Path(source).exists():
-        try:
-            with open(source, "r", encoding=encoding) as f:
-                return f.read()
-        except FileNotFoundError as e:
-            raise FileNotFoundError(f"File not found: {str(e)}")
-        except IOError as e:
-            raise IOError(f"Error reading file: {str(e)}")
-    else:
-        return source
+    try:
+        # Legacy entry point; new code should create a Source with an explicit kind
+        return Source.guess(source, encoding).read_text()
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {str(e)}")
+    except IOError as e:
+        raise IOError(f"Error reading file: {str(e)}")
 
 
 def resolve_references(openapi_instance: Dict[str, Any],
-                       base_path: Union[str, Path] = "") -> Dict[str, Any]:
+                       base_path: Union[str, Path] = "",
+                       cache: Optional[DocumentCache] = None,
+                       preserve_identity: bool = False,
+                       prefetch_workers: int = DEFAULT_PREFETCH_WORKERS) -> Dict[str, Any]:
     """
     Resolves $ref references within an OpenAPI document.
 
+    By default every $ref is replaced by its own copy of the target. With preserve_identity,
+    each target is resolved once and every reference to it shares the same object, so a
+    schema referenced 1,000 times exists once and recursive schemas become cyclic object
+    graphs. In copy mode a reference back into a target that is still being expanded is left
+    in place as a {"$ref": ...} marker instead of being expanded forever; a marker pointing
+    into an external document names that document relative to base_path.
+
+    Local references inside external documents are resolved against that document, and
+    relative external references are resolved against the directory (or URL) of the document
+    that contains them. HTTP(S) references, such as 'https://example.com/common.yaml#/Pet', are
+    downloaded by the cache's HttpFetcher; a base_path that is a URL makes relative references
+    remote too.
+
+    External documents are read and parsed once per resolution, however often they are
+    referenced. Pass a long-lived DocumentCache (e.g. cache.shared_document_cache) to also
+    reuse them across calls. Before the document is walked, every external document that can
+    be reached through $ref is loaded into the cache by a pool of prefetch_workers threads
+    (see prefetch_documents), so slow disks and network filesystems are read in parallel.
+
     Args:
         openapi_instance (Dict[str, Any]): The parsed OpenAPI document as a dictionary.
-        base_path (Union[str, Path], optional): The base path to resolve external references. Defaults to "".
+        base_path (Union[str, Path], optional): The base path or URL to resolve external
+            references. Defaults to "".
+        cache (Optional[DocumentCache], optional): Cache of parsed external documents. Defaults
+            to a new cache that lives for this call only.
+        preserve_identity (bool, optional): Share one resolved object per target instead of
+            copying it at every use site. Defaults to False.
+        prefetch_workers (int, optional): Threads used to load external documents up front;
+            0 loads each document only when the walk reaches it. Defaults to 8.
 
     Returns:
         Dict[str, Any]: The OpenAPI document with references resolved.
@@ -47,48 +90,272 @@ def resolve_references(openapi_instance: Dict[str, Any],
     Raises:
         ReferenceResolutionError: If there is an issue resolving references.
     """
-    try:
-        def resolve(node: Any, path: str = "") -> Any:
-            """
-            Recursively resolves references within the OpenAPI document.
+    if cache is None:
+        # Files cannot change in the middle of a resolution, so skip the stat calls
+        cache = DocumentCache(max_entries=None, check_stat=False)
+    if prefetch_workers > 0:
+        prefetch_documents(openapi_instance, base_path, cache, prefetch_workers)
+    # (raw container, resolved copy) keyed by id(raw container); only used with
+    # preserve_identity. Holding the raw container keeps its id from being reused.
+    resolved: Dict[int, Tuple[Any, Any]] = {}
+    # Raw $ref targets currently being expanded, keyed by id()
+    expanding: Set[int] = set()
+    # Memoized pointer lookups per document, keyed by id(document)
+    indexes: Dict[int, PointerIndex] = {}
+
+    def locate(ref: str, document: Any, document_path: Location) -> Tuple[Any, Any, Location]:
+        """
+        Finds the raw target of a $ref.
+
+        Args:
+            ref (str): The reference, e.g. '#/components/schemas/Pet' or 'common.yaml#/Pet'.
+            document (Any): The document that contains the reference.
+            document_path (Location): The path or URL of that document.
+
+        Returns:
+            Tuple[Any, Any, Location]: The target node, its document and the document's location.
 
-            Args:
-                node (Any): The current node in the OpenAPI document.
-                path (str, optional): The current path of the node being resolved. Defaults to "".
+        Raises:
+            ReferenceResolutionError: If the fragment is not a valid JSON Pointer, does not
+                match the document, or points at something other than a mapping.
+        """
+        location, _, fragment = ref.partition("#")
+        if location:
+            # External reference
+            document_path = join_location(document_path, location)
+            # Parsed once per path; JSON and YAML are told apart by the content
+            document = cache.get(document_path)
+        if not fragment:
+            return document, document, document_path
+        index = indexes.get(id(document))
+        if index is None:
+            # The index holds the document, so its id cannot be reused during the call
+            index = indexes[id(document)] = PointerIndex(document)
+        target = index.resolve_fragment(fragment)
+        if not isinstance(target, dict):
+            raise ReferenceResolutionError(f"Unable to resolve local reference: {ref}")
+        return target, document, document_path
 
-            Returns:
-                Any: The resolved node.
-            """
+    # The document is walked with an explicit stack of frames instead of recursion, so
+    # nesting depth is bounded by memory rather than the interpreter's recursion limit. A
+    # frame is (raw node, its document, the document's path, output container, key in the
+    # output container, parent frame); scalars are copied without a frame of their own. The
+    # parent links are only followed to describe the location when an error is reported.
+    root: List[Any] = [None]
+    stack: List[Tuple[Any, ...]] = [
+        (openapi_instance, openapi_instance, base_location(base_path), root, 0, None)
+    ]
+    pop = stack.pop
+    push = stack.append
+    try:
+        while stack:
+            frame = pop()
+            node = frame[0]
+            if node is _END_EXPANSION:
+                expanding.discard(frame[1])
+                continue
+            node, document, document_path, container, key, parent = frame
             if isinstance(node, dict):
                 if "$ref" in node:
                     ref = node["$ref"]
-                    if ref.startswith("#/"):
-                        # Local reference
-                        ref_path = ref[2:].split("/")
-                        resolved_node = openapi_instance
-                        for part in ref_path:
-                            resolved_node = resolved_node.get(part, {})
-                        if not isinstance(resolved_node, dict):
-                            raise ReferenceResolutionError(
-                                f"Unable to resolve local reference: {ref}")
-                        return resolve(resolved_node, path)
+                    try:
+                        target, target_document, target_path = locate(ref, document, document_path)
+                    except Exception as e:
+                        raise ReferenceResolutionError(
+                            f"Failed to resolve references at {frame_location(frame)}: {str(e)}")
+                    target_id = id(target)
+                    if preserve_identity and target_id in resolved:
+                        container[key] = resolved[target_id][1]
+                    elif target_id in expanding:
+                        # Back-reference into a target that is still being expanded
+                        container[key] = {"$ref": _root_ref(ref, target_document, target_path,
+                                                            openapi_instance, base_path)}
+                    else:
+                        expanding.add(target_id)
+                        # Popped once the whole target subtree has been resolved
+                        push((_END_EXPANSION, target_id))
+                        push((target, target_document, target_path, container, key, parent))
+                    continue
+                if preserve_identity:
+                    memo = resolved.get(id(node))
+                    if memo is not None:
+                        container[key] = memo[1]
+                        continue
+                # Keys are inserted up front so the output keeps the input order
+                result = dict.fromkeys(node)
+                container[key] = result
+                if preserve_identity:
+                    # Registered before the children so that cycles point back to this object
+                    resolved[id(node)] = (node, result)
+                for child_key, value in node.items():
+                    if isinstance(value, (dict, list)):
+                        push((value, document, document_path, result, child_key, frame))
                     else:
-                        # External reference
-                        external_path = Path(base_path).parent / ref
-                        external_content = load_file(external_path)
-                        if external_path.suffix in [".yaml", ".yml"]:
-                            external_data = yaml.safe_load(external_content)
-                        else:
-                            external_data = json.loads(external_content)
-                        return resolve(external_data, str(external_path))
-                else:
-                    return {key: resolve(value, path + f"/{key}") for key, value in node.items()}
+                        result[child_key] = value
             elif isinstance(node, list):
-                return [resolve(item, path + f"/[{i}]") for i, item in enumerate(node)]
+                if preserve_identity:
+                    memo = resolved.get(id(node))
+                    if memo is not None:
+                        container[key] = memo[1]
+                        continue
+                items = node.copy()
+                container[key] = items
+                if preserve_identity:
+                    resolved[id(node)] = (node, items)
+                for index, value in enumerate(node):
+                    if isinstance(value, (dict, list)):
+                        push((value, document, document_path, items, index, frame))
             else:
-                return node
-
-        return resolve(openapi_instance)
+                container[key] = node
+        return root[0]
 
+    except ReferenceResolutionError:
+        raise
     except Exception as e:
         raise ReferenceResolutionError(f"Failed to resolve references: {str(e)}")
+
+
+def prefetch_documents(openapi_instance: Dict[str, Any],
+                       base_path: Union[str, Path] = "",
+                       cache: Optional[DocumentCache] = None,
+                       max_workers: int = DEFAULT_PREFETCH_WORKERS) -> List[Location]:
+    """
+    Loads every external document reachable through $ref into a cache, in parallel.
+
+    The documents are discovered breadth first: each loaded document is scanned for further
+    external references as soon as it arrives, while the others are still loading. Documents
+    that cannot be loaded are skipped; resolve_references reports them, with their location,
+    if the resolution actually reaches them.
+
+    Args:
+        openapi_instance (Dict[str, Any]): The parsed OpenAPI document as a dictionary.
+        base_path (Union[str, Path], optional): The base path to resolve external references,
+            as for resolve_references. Defaults to "".
+        cache (Optional[DocumentCache], optional): The cache to fill. Defaults to
+            cache.shared_document_cache.
+        max_workers (int, optional): Maximum number of loader threads. Defaults to 8.
+
+    Returns:
+        List[Location]: The documents that were loaded (or were already cached), in discovery
+            order.
+    """
+    if cache is None:
+        cache = shared_document_cache
+    seen: Set[str] = set()
+    loaded: List[Location] = []
+    pending: Dict[Future, Location] = {}
+    base = base_location(base_path)
+
+    def discover(document: Any, document_path: Location, executor: ThreadPoolExecutor) -> None:
+        for path in external_documents(document, document_path):
+            key = DocumentCache.key(path)
+            if key not in seen:
+                seen.add(key)
+                pending[executor.submit(cache.get, path)] = path
+
+    # Threads are only started once the root document turns out to have external references
+    if next(external_documents(openapi_instance, base), None) is None:
+        return loaded
+    with ThreadPoolExecutor(max_workers=max_workers,
+                            thread_name_prefix="openapi-prefetch") as executor:
+        discover(openapi_instance, base, executor)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    document = future.result()
+                except Exception as e:
+                    logger.debug("Could not prefetch %s: %s", path, e)
+                    continue
+                loaded.append(path)
+                discover(document, path, executor)
+    return loaded
+
+
+def _root_ref(ref: str, target_document: Any, target_path: Location, root: Any,
+              base_path: Union[str, Path]) -> str:
+    # Rewrites a $ref so that it is valid in the root document rather than in the document
+    # that contains it
+    fragment = ref.partition("#")[2]
+    if target_document is root:
+        return f"#{fragment}"
+    base = base_location(base_path)
+    location = str(target_path)
+    if isinstance(base, Path) and isinstance(target_path, Path):
+        try:
+            location = Path(os.path.relpath(target_path, base.parent)).as_posix()
+        except ValueError:
+            # On another drive
+            pass
+    return f"{location}#{fragment}" if fragment else location
+
+
+def base_location(base_path: Union[str, Path]) -> Location:
+    """Returns the location of a document given as a base_path: the URL, or the path."""
+    return base_path if is_url(base_path) else Path(base_path)  # type: ignore[return-value]
+
+
+def join_location(document_path: Location, location: str) -> Location:
+    """
+    Resolves the location part of a $ref against the document that contains it.
+
+    Args:
+        document_path (Location): The path or URL of the containing document.
+        location (str): The part of the $ref before '#'.
+
+    Returns:
+        Location: The URL, or the path relative to the containing document's directory.
+    """
+    if is_url(location):
+        return location
+    if is_url(document_path):
+        return urljoin(document_path, location)  # type: ignore[type-var]
+    return document_path.parent / location  # type: ignore[union-attr]
+
+
+def external_documents(document: Any, document_path: Location) -> Iterator[Location]:
+    """
+    Yields the locations of the external documents referenced from a document.
+
+    Args:
+        document (Any): The document to scan.
+        document_path (Location): The path or URL of that document.
+
+    Yields:
+        Location: The location of each external reference, as resolve_references would
+            compute it.
+    """
+    stack = [document]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                location = ref.partition("#")[0]
+                if location:
+                    yield join_location(document_path, location)
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(value for value in node if isinstance(value, (dict, list)))
+
+
+# Stack marker that ends the expansion of a $ref target
+_END_EXPANSION = object()
+
+
+def frame_location(frame: Optional[Tuple[Any, ...]]) -> str:
+    """
+    Builds the JSON Pointer of a resolver frame by following its parent links.
+
+    Args:
+        frame (Optional[Tuple[Any, ...]]): A frame from the resolve_references stack.
+
+    Returns:
+        str: The location of the frame in the resolved document, e.g. '/paths/~1pets/get'.
+    """
+    parts = []
+    while frame is not None and frame[5] is not None:
+        parts.append(frame[4])
+        frame = frame[5]
+    return format_pointer(reversed(parts)) or "/"
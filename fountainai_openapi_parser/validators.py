@@ -0,0 +1,935 @@
+import json
+import re
+import reprlib
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from .exceptions import ParsingError, ReferenceResolutionError, ValidationError
+from .lazy import LazyMapping
+from .nodes import object_items, unwrap_root
+from .operations import IndexedOperation
+from .pointer import format_pointer, parse_fragment, resolve_token
+
+# Where a value sits in the validated instance: (parent location, key), or None for the root
+InstanceLocation = Optional[Tuple[Any, Any]]
+
+# A compiled check: appends a message to errors for every violation found in the value
+Check = Callable[[Any, InstanceLocation, List[str]], None]
+
+# Values are shortened in error messages
+value_repr = reprlib.Repr()
+value_repr.maxstring = 60
+value_repr.maxother = 60
+
+
+def is_integer(value: Any) -> bool:
+    """Returns True if a value is a JSON Schema integer: an int or a whole float, not a bool."""
+    if isinstance(value, float):
+        return value.is_integer()
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# JSON Schema type name -> test of a Python value (as loaded from JSON)
+TYPE_TESTS: Dict[str, Callable[[Any], bool]] = {
+    "null": lambda value: value is None,
+    "boolean": lambda value: isinstance(value, bool),
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "number": _is_number,
+    "integer": is_integer,
+}
+
+
+def _format_location(location: InstanceLocation) -> str:
+    keys = []
+    while location is not None:
+        location, key = location
+        keys.append(key)
+    return format_pointer(reversed(keys))
+
+
+def add_error(errors: List[str], location: InstanceLocation, message: str) -> None:
+    """Appends a message to errors, followed by the JSON Pointer of the location if any."""
+    if location is not None:
+        message = f"{message} at {_format_location(location)}"
+    errors.append(message)
+
+
+def json_equal(first: Any, second: Any) -> bool:
+    """Compares JSON values: booleans are not numbers, and 1 equals 1.0."""
+    if isinstance(first, bool) or isinstance(second, bool):
+        return isinstance(first, bool) and isinstance(second, bool) and first == second
+    if isinstance(first, dict) and isinstance(second, dict):
+        return first.keys() == second.keys() and all(
+            json_equal(value, second[key]) for key, value in first.items())
+    if isinstance(first, list) and isinstance(second, list):
+        return len(first) == len(second) and all(map(json_equal, first, second))
+    if isinstance(first, (dict, list)) or isinstance(second, (dict, list)):
+        return False
+    return first == second
+
+
+def json_key(value: Any) -> Any:
+    """Returns a hashable key such that JSON values have equal keys exactly when json_equal."""
+    if isinstance(value, bool):
+        return ("bool", value)
+    if isinstance(value, dict):
+        return frozenset((key, json_key(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(json_key(item) for item in value)
+    return value
+
+
+def _accept(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+    pass
+
+
+def _reject(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+    add_error(errors, location, "False schema does not allow any value")
+
+
+def _combine(checks: List[Check]) -> Check:
+    if not checks:
+        return _accept
+    if len(checks) == 1:
+        return checks[0]
+    checks = tuple(checks)
+
+    def check_all(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+        for check in checks:
+            check(value, location, errors)
+
+    return check_all
+
+
+def schema_keywords(schema: Any) -> Dict[str, Any]:
+    """
+    Lists the keywords of a schema, given as a dict or a Schema model.
+
+    Args:
+        schema (Any): The schema.
+
+    Returns:
+        Dict[str, Any]: The keywords that are present.
+
+    Raises:
+        ParsingError: If the schema is neither an object nor a model.
+    """
+    entries = object_items(schema)
+    if entries is None:
+        raise ParsingError(f"Invalid schema: {value_repr.repr(schema)}")
+    # None stands for an absent keyword, except for const
+    return {key: value for key, value in entries if value is not None or key == "const"}
+
+
+def component_schema(ref: str) -> Optional[str]:
+    """Returns the name of the component schema a local $ref points at, if it points at one."""
+    if not ref.startswith("#/components/schemas/"):
+        return None
+    tokens = parse_fragment(ref[1:])
+    return tokens[2] if len(tokens) == 3 else None
+
+
+class SchemaValidator:
+    """
+    A compiled validator for one schema.
+
+    Attributes:
+        schema (Any): The schema the validator was compiled from.
+    """
+
+    __slots__ = ("schema", "_check")
+
+    def __init__(self, schema: Any, check: Check):
+        self.schema = schema
+        self._check = check
+
+    def __repr__(self) -> str:
+        return f"SchemaValidator({value_repr.repr(self.schema)})"
+
+    def errors(self, instance: Any) -> List[str]:
+        """
+        Validates a value and lists every violation.
+
+        Args:
+            instance (Any): The value, as loaded from JSON.
+
+        Returns:
+            List[str]: The error messages; empty if the value is valid.
+        """
+        errors: List[str] = []
+        self._check(instance, None, errors)
+        return errors
+
+    def is_valid(self, instance: Any) -> bool:
+        """Tells whether a value is valid."""
+        errors: List[str] = []
+        self._check(instance, None, errors)
+        return not errors
+
+    def validate(self, instance: Any) -> None:
+        """
+        Validates a value.
+
+        Raises:
+            ValidationError: If the value is invalid; the message lists every violation.
+        """
+        errors = self.errors(instance)
+        if errors:
+            raise ValidationError("; ".join(errors))
+
+
+class SchemaCompiler:
+    """
+    Compiles schemas into specialized validator closures.
+
+    Each keyword of a schema becomes one small closure with its constants bound, and the
+    closures of a schema are chained, so validating a value runs only the checks the schema
+    actually uses instead of interpreting the schema again. Supported keywords are type (and
+    the OpenAPI 3.0 nullable), enum, const, the numeric and string bounds, pattern, the array
+    and object keywords, allOf, anyOf, oneOf, not, if/then/else and local $ref. Annotations
+    and format are ignored, as jsonschema does by default.
+
+    Schemas may be raw dicts or Schema models. Local references are resolved against the
+    document, and each reference target is compiled once, so recursive schemas are supported.
+    External references are not: resolve or bundle the document first.
+
+    Attributes:
+        document (Any): The document references are resolved against (a raw document, an
+            OpenAPI model or a LazyOpenAPI), or None.
+        generated (Optional[Mapping[str, SchemaValidator]]): Validators used for references to
+            component schemas instead of compiling them, such as GeneratedValidators.
+    """
+
+    def __init__(self, document: Any = None,
+                 generated: Optional[Mapping[str, "SchemaValidator"]] = None):
+        self.document = document
+        self.generated = generated
+        self._references: Dict[str, Check] = {}
+        self._operations: Dict[Tuple[str, str], Tuple[IndexedOperation, OperationValidator]] = {}
+
+    def compile(self, schema: Any) -> SchemaValidator:
+        """
+        Compiles a schema.
+
+        Args:
+            schema (Any): A raw schema, a Schema or Reference model, or a boolean schema.
+
+        Returns:
+            SchemaValidator: The compiled validator.
+
+        Raises:
+            ParsingError: If the schema is invalid.
+            ReferenceResolutionError: If a reference cannot be resolved.
+        """
+        return SchemaValidator(schema, self._compile(schema))
+
+    def operation(self, entry: IndexedOperation) -> "OperationValidator":
+        """
+        Returns the compiled validators of an operation, compiling them on first use.
+
+        Args:
+            entry (IndexedOperation): The operation, e.g. from an OperationIndex or a Router.
+
+        Returns:
+            OperationValidator: The validators of the operation's requests and responses.
+        """
+        key = (entry.method, entry.path)
+        cached = self._operations.get(key)
+        if cached is not None and cached[0] is entry:
+            return cached[1]
+        validator = OperationValidator(entry, self)
+        self._operations[key] = (entry, validator)
+        return validator
+
+    def resolve(self, ref: str) -> Any:
+        """
+        Looks up the target of a local reference in the document.
+
+        Raises:
+            ReferenceResolutionError: If the reference is external or does not match.
+        """
+        location, _, fragment = ref.partition("#")
+        if location:
+            raise ReferenceResolutionError(
+                f"Cannot compile the external reference {ref!r}: resolve or bundle the "
+                f"document first"
+            )
+        if self.document is None:
+            raise ReferenceResolutionError(f"Cannot resolve {ref!r} without a document")
+        tokens = parse_fragment(fragment)
+        node = self.document
+        for depth, token in enumerate(tokens):
+            node = unwrap_root(node)
+            if isinstance(node, (dict, list)):
+                node = resolve_token(node, token, tokens, depth)
+                continue
+            if isinstance(node, BaseModel):
+                node = dict(object_items(node)).get(token, _MISSING)
+            elif isinstance(node, LazyMapping):
+                # The raw entries of a LazyOpenAPI, which need no validation to be compiled
+                node = node.raw(token) if token in node else _MISSING
+            else:
+                node = getattr(node, token, _MISSING) if not token.startswith("_") else _MISSING
+            if node is _MISSING or node is None:
+                raise ReferenceResolutionError(
+                    f"Unable to resolve reference {ref!r}: {token!r} not found")
+        return node
+
+    def _compile_reference(self, ref: str) -> Check:
+        check = self._references.get(ref)
+        if check is not None:
+            return check
+        if self.generated is not None:
+            name = component_schema(ref)
+            if name is not None and name in self.generated:
+                check = self._references[ref] = self.generated[name]._check
+                return check
+        # Registered before the target is compiled, so that recursive references find it
+        target: List[Check] = []
+
+        def check_reference(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+            target[0](value, location, errors)
+
+        self._references[ref] = check_reference
+        target.append(self._compile(self.resolve(ref)))
+        self._references[ref] = target[0]
+        return check_reference
+
+    def _compile(self, schema: Any) -> Check:
+        schema = unwrap_root(schema)
+        if schema is True or schema is None:
+            return _accept
+        if schema is False:
+            return _reject
+        keywords = schema_keywords(schema)
+        checks: List[Check] = []
+        ref = keywords.get("$ref")
+        if isinstance(ref, str):
+            checks.append(self._compile_reference(ref))
+        if "type" in keywords:
+            checks.append(_compile_type(keywords["type"]))
+        if "enum" in keywords:
+            checks.append(_compile_enum(keywords["enum"]))
+        if "const" in keywords:
+            checks.append(_compile_const(keywords["const"]))
+        checks.extend(_compile_number(keywords))
+        checks.extend(_compile_string(keywords))
+        checks.extend(self._compile_array(keywords))
+        checks.extend(self._compile_object(keywords))
+        checks.extend(self._compile_logic(keywords))
+        check = _combine(checks)
+        if keywords.get("nullable") is True:
+            inner = check
+
+            def check_nullable(value: Any, location: InstanceLocation,
+                               errors: List[str]) -> None:
+                if value is not None:
+                    inner(value, location, errors)
+
+            return check_nullable
+        return check
+
+    def _compile_array(self, keywords: Dict[str, Any]) -> List[Check]:
+        items = keywords.get("items")
+        prefix = keywords.get("prefixItems")
+        if isinstance(items, list):
+            # The tuple form of items, before prefixItems existed
+            prefix, items = items, keywords.get("additionalItems")
+        prefix_checks = tuple(self._compile(schema) for schema in prefix or ())
+        items_check = self._compile(items) if items is not None else None
+        contains = keywords.get("contains")
+        contains_check = self._compile(contains) if contains is not None else None
+        min_contains = keywords.get("minContains", 1)
+        max_contains = keywords.get("maxContains")
+        min_items = keywords.get("minItems")
+        max_items = keywords.get("maxItems")
+        unique = keywords.get("uniqueItems") is True
+        if not (prefix_checks or items_check or contains_check or unique
+                or min_items is not None or max_items is not None):
+            return []
+        start = len(prefix_checks)
+
+        def check_array(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+            if not isinstance(value, list):
+                return
+            if min_items is not None and len(value) < min_items:
+                add_error(errors, location, f"{value_repr.repr(value)} is too short")
+            if max_items is not None and len(value) > max_items:
+                add_error(errors, location, f"{value_repr.repr(value)} is too long")
+            for index, check in enumerate(prefix_checks[:len(value)]):
+                check(value[index], (location, index), errors)
+            if items_check is not None:
+                for index in range(start, len(value)):
+                    items_check(value[index], (location, index), errors)
+            if contains_check is not None:
+                found = 0
+                for item in value:
+                    trial: List[str] = []
+                    contains_check(item, location, trial)
+                    found += not trial
+                if found < min_contains:
+                    add_error(errors, location, f"{value_repr.repr(value)} does not contain enough "
+                                             f"items matching 'contains'")
+                if max_contains is not None and found > max_contains:
+                    add_error(errors, location, f"{value_repr.repr(value)} contains too many items "
+                                             f"matching 'contains'")
+            if unique:
+                try:
+                    distinct = len({json_key(item) for item in value})
+                except TypeError:
+                    distinct = len(value)
+                if distinct < len(value):
+                    add_error(errors, location, f"{value_repr.repr(value)} has non-unique elements")
+
+        return [check_array]
+
+    def _compile_object(self, keywords: Dict[str, Any]) -> List[Check]:
+        properties = tuple(
+            (name, self._compile(schema))
+            for name, schema in (object_items(unwrap_root(keywords.get("properties"))) or ())
+        )
+        pattern_properties = unwrap_root(keywords.get("patternProperties"))
+        patterns = tuple(
+            (compile_pattern(pattern), self._compile(schema))
+            for pattern, schema in (object_items(pattern_properties) or ())
+        )
+        additional = keywords.get("additionalProperties")
+        additional_check = self._compile(additional) if additional is not None else None
+        names = keywords.get("propertyNames")
+        names_check = self._compile(names) if names is not None else None
+        required = tuple(keywords.get("required") or ())
+        dependent_required = dict(keywords.get("dependentRequired") or {})
+        dependent_schemas = {
+            name: self._compile(schema)
+            for name, schema in (object_items(unwrap_root(keywords.get("dependentSchemas"))) or ())
+        }
+        min_properties = keywords.get("minProperties")
+        max_properties = keywords.get("maxProperties")
+        if not (properties or patterns or additional_check or names_check or required
+                or dependent_required or dependent_schemas or min_properties is not None
+                or max_properties is not None):
+            return []
+        forbid_additional = additional is False
+        known = frozenset(name for name, _ in properties)
+        # Entries only need to be walked when a schema applies to names it does not list
+        walk = bool(patterns or additional_check or names_check)
+
+        def check_object(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value:
+                    add_error(errors, location, f"{name!r} is a required property")
+            if min_properties is not None and len(value) < min_properties:
+                add_error(errors, location, f"{value_repr.repr(value)} does not have enough "
+                                         f"properties")
+            if max_properties is not None and len(value) > max_properties:
+                add_error(errors, location, f"{value_repr.repr(value)} has too many properties")
+            # Listed properties are checked in the order of the schema, as jsonschema does
+            for name, check in properties:
+                if name in value:
+                    check(value[name], (location, name), errors)
+            if walk:
+                for key, item in value.items():
+                    if names_check is not None:
+                        names_check(key, location, errors)
+                    matched = key in known
+                    for regex, pattern_check in patterns:
+                        if regex.search(key):
+                            matched = True
+                            pattern_check(item, (location, key), errors)
+                    if not matched and additional_check is not None:
+                        if forbid_additional:
+                            add_error(errors, location, f"Additional properties are not allowed "
+                                                     f"({key!r} was unexpected)")
+                        else:
+                            additional_check(item, (location, key), errors)
+            for name, needed in dependent_required.items():
+                if name in value:
+                    for other in needed:
+                        if other not in value:
+                            add_error(errors, location, f"{other!r} is a dependency of {name!r}")
+            for name, dependent_check in dependent_schemas.items():
+                if name in value:
+                    dependent_check(value, location, errors)
+
+        return [check_object]
+
+    def _compile_logic(self, keywords: Dict[str, Any]) -> List[Check]:
+        checks = [self._compile(schema) for schema in keywords.get("allOf") or ()]
+        any_of = tuple(self._compile(schema) for schema in keywords.get("anyOf") or ())
+        one_of = tuple(self._compile(schema) for schema in keywords.get("oneOf") or ())
+        not_check = self._compile(keywords["not"]) if "not" in keywords else None
+
+        def passes(check: Check, value: Any, location: InstanceLocation) -> bool:
+            trial: List[str] = []
+            check(value, location, trial)
+            return not trial
+
+        if any_of:
+            def check_any_of(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+                for check in any_of:
+                    if passes(check, value, location):
+                        return
+                add_error(errors, location, f"{value_repr.repr(value)} is not valid under any of "
+                                         f"the given schemas")
+
+            checks.append(check_any_of)
+        if one_of:
+            def check_one_of(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+                matches = 0
+                for check in one_of:
+                    if passes(check, value, location):
+                        matches += 1
+                        if matches > 1:
+                            add_error(errors, location, f"{value_repr.repr(value)} is valid under "
+                                                     f"each of several schemas")
+                            return
+                if not matches:
+                    add_error(errors, location, f"{value_repr.repr(value)} is not valid under any "
+                                             f"of the given schemas")
+
+            checks.append(check_one_of)
+        if not_check is not None:
+            def check_not(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+                if passes(not_check, value, location):
+                    add_error(errors, location, f"{value_repr.repr(value)} should not be valid "
+                                             f"under the 'not' schema")
+
+            checks.append(check_not)
+        if "if" in keywords:
+            if_check = self._compile(keywords["if"])
+            then_check = self._compile(keywords.get("then"))
+            else_check = self._compile(keywords.get("else"))
+
+            def check_conditional(value: Any, location: InstanceLocation,
+                                  errors: List[str]) -> None:
+                if passes(if_check, value, location):
+                    then_check(value, location, errors)
+                else:
+                    else_check(value, location, errors)
+
+            checks.append(check_conditional)
+        return checks
+
+
+def _compile_type(names: Union[str, List[str]]) -> Check:
+    names = [names] if isinstance(names, str) else list(names)
+    unknown = [name for name in names if name not in TYPE_TESTS]
+    if unknown:
+        raise ParsingError(f"Invalid schema: unknown type {unknown[0]!r}")
+    tests = tuple(TYPE_TESTS[name] for name in names)
+    expected = names[0] if len(names) == 1 else names
+
+    if len(tests) == 1:
+        test = tests[0]
+
+        def check_type(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+            if not test(value):
+                add_error(errors, location, f"{value_repr.repr(value)} is not of type {expected!r}")
+    else:
+        def check_type(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+            for test in tests:
+                if test(value):
+                    return
+            add_error(errors, location, f"{value_repr.repr(value)} is not of type {expected!r}")
+
+    return check_type
+
+
+def _compile_enum(options: List[Any]) -> Check:
+    options = list(options)
+    if all(isinstance(option, str) for option in options):
+        strings = frozenset(options)
+
+        def check_enum(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+            if not (isinstance(value, str) and value in strings):
+                add_error(errors, location, f"{value_repr.repr(value)} is not one of {options!r}")
+    else:
+        def check_enum(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+            if not any(json_equal(value, option) for option in options):
+                add_error(errors, location, f"{value_repr.repr(value)} is not one of {options!r}")
+
+    return check_enum
+
+
+def _compile_const(constant: Any) -> Check:
+    def check_const(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+        if not json_equal(value, constant):
+            add_error(errors, location, f"{constant!r} was expected")
+
+    return check_const
+
+
+def _integral(number: Any) -> Any:
+    # Schema models hold bounds as floats; keep whole numbers exact, and readable in messages
+    if isinstance(number, float) and number.is_integer():
+        return int(number)
+    return number
+
+
+def number_bounds(keywords: Dict[str, Any]) -> Tuple[Any, Any, Any, Any, Any]:
+    """
+    Reads the numeric keywords of a schema.
+
+    Returns:
+        Tuple[Any, Any, Any, Any, Any]: minimum, maximum, exclusive minimum, exclusive maximum
+            and multipleOf, each None when absent.
+    """
+    minimum = _integral(keywords.get("minimum"))
+    maximum = _integral(keywords.get("maximum"))
+    exclusive_minimum = _integral(keywords.get("exclusiveMinimum"))
+    exclusive_maximum = _integral(keywords.get("exclusiveMaximum"))
+    # OpenAPI 3.0 (draft 4) uses booleans that make minimum and maximum exclusive
+    if exclusive_minimum is True:
+        exclusive_minimum, minimum = minimum, None
+    elif exclusive_minimum is False:
+        exclusive_minimum = None
+    if exclusive_maximum is True:
+        exclusive_maximum, maximum = maximum, None
+    elif exclusive_maximum is False:
+        exclusive_maximum = None
+    multiple_of = _integral(keywords.get("multipleOf"))
+    return minimum, maximum, exclusive_minimum, exclusive_maximum, multiple_of
+
+
+def _compile_number(keywords: Dict[str, Any]) -> List[Check]:
+    minimum, maximum, exclusive_minimum, exclusive_maximum, multiple_of = number_bounds(keywords)
+    if (minimum is None and maximum is None and exclusive_minimum is None
+            and exclusive_maximum is None and multiple_of is None):
+        return []
+
+    def check_number(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return
+        if minimum is not None and value < minimum:
+            add_error(errors, location, f"{value!r} is less than the minimum of {minimum!r}")
+        if maximum is not None and value > maximum:
+            add_error(errors, location, f"{value!r} is greater than the maximum of {maximum!r}")
+        if exclusive_minimum is not None and value <= exclusive_minimum:
+            add_error(errors, location, f"{value!r} is less than or equal to the minimum of "
+                                     f"{exclusive_minimum!r}")
+        if exclusive_maximum is not None and value >= exclusive_maximum:
+            add_error(errors, location, f"{value!r} is greater than or equal to the maximum of "
+                                     f"{exclusive_maximum!r}")
+        if multiple_of is not None:
+            if isinstance(multiple_of, int) and isinstance(value, int):
+                failed = value % multiple_of != 0
+            else:
+                quotient = value / multiple_of
+                try:
+                    failed = int(quotient) != quotient
+                except OverflowError:
+                    failed = True
+            if failed:
+                add_error(errors, location, f"{value!r} is not a multiple of {multiple_of!r}")
+
+    return [check_number]
+
+
+def compile_pattern(pattern: str) -> "re.Pattern":
+    """
+    Compiles the regular expression of a pattern or patternProperties keyword.
+
+    Raises:
+        ParsingError: If the pattern is not a valid regular expression.
+    """
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ParsingError(f"Invalid schema: bad pattern {pattern!r}: {e}")
+
+
+def _compile_string(keywords: Dict[str, Any]) -> List[Check]:
+    min_length = keywords.get("minLength")
+    max_length = keywords.get("maxLength")
+    pattern = keywords.get("pattern")
+    regex = compile_pattern(pattern) if pattern is not None else None
+    if min_length is None and max_length is None and regex is None:
+        return []
+
+    def check_string(value: Any, location: InstanceLocation, errors: List[str]) -> None:
+        if not isinstance(value, str):
+            return
+        if min_length is not None and len(value) < min_length:
+            add_error(errors, location, f"{value_repr.repr(value)} is too short")
+        if max_length is not None and len(value) > max_length:
+            add_error(errors, location, f"{value_repr.repr(value)} is too long")
+        if regex is not None and not regex.search(value):
+            add_error(errors, location, f"{value_repr.repr(value)} does not match {pattern!r}")
+
+    return [check_string]
+
+
+def compile_schema(schema: Any, document: Any = None) -> SchemaValidator:
+    """
+    Compiles a schema into a validator.
+
+    Args:
+        schema (Any): A raw schema, or a Schema or Reference model.
+        document (Any, optional): The document local references are resolved against.
+
+    Returns:
+        SchemaValidator: The compiled validator.
+
+    Raises:
+        ParsingError: If the schema is invalid.
+        ReferenceResolutionError: If a reference cannot be resolved.
+    """
+    return SchemaCompiler(document).compile(schema)
+
+
+def media_range(media_type: str) -> str:
+    """Returns a media type without its parameters, in lower case, e.g. 'application/json'."""
+    return media_type.split(";", 1)[0].strip().lower()
+
+
+def _select_media_type(validators: Dict[str, Any], media_type: str) -> Any:
+    # An exact match wins over 'type/*', which wins over '*/*'
+    media_type = media_range(media_type)
+    for candidate in (media_type, media_type.split("/", 1)[0] + "/*", "*/*"):
+        if candidate in validators:
+            return validators[candidate]
+    return _MISSING
+
+
+def _schema_type(schema: Any, compiler: SchemaCompiler) -> Optional[Any]:
+    # The type of a parameter schema, following references
+    for _ in range(32):
+        schema = unwrap_root(schema)
+        keywords = dict(object_items(schema) or ())
+        if isinstance(keywords.get("$ref"), str):
+            schema = compiler.resolve(keywords["$ref"])
+            continue
+        return keywords.get("type"), keywords.get("items")
+    return None, None
+
+
+def _coerce_scalar(value: str, kind: Any) -> Any:
+    # Converts a parameter string to the schema type, when the string is a valid literal
+    kinds = [kind] if isinstance(kind, str) else list(kind or ())
+    if "integer" in kinds and re.fullmatch(r"-?\d+", value):
+        return int(value)
+    if "number" in kinds:
+        try:
+            return float(value) if re.search(r"[.eE]", value) else int(value)
+        except ValueError:
+            pass
+    if "boolean" in kinds and value in ("true", "false"):
+        return value == "true"
+    if "null" in kinds and value in ("", "null"):
+        return None
+    return value
+
+
+class _CompiledParameter:
+    __slots__ = ("name", "location", "required", "validator", "kind", "items_kind", "json",
+                 "explode")
+
+    def __init__(self, parameter: Dict[str, Any], compiler: SchemaCompiler):
+        self.name = parameter.get("name")
+        location = parameter.get("in")
+        self.location = str(getattr(location, "value", location))
+        self.required = bool(parameter.get("required")) or self.location == "path"
+        schema = parameter.get("schema")
+        self.json = False
+        if schema is None and parameter.get("content"):
+            # A parameter described by a media type, e.g. JSON in a query string
+            media_type, content = next(iter(object_items(unwrap_root(parameter["content"]))))
+            schema = dict(object_items(unwrap_root(content)) or ()).get("schema")
+            self.json = "json" in media_range(media_type)
+        self.validator = compiler.compile(schema) if schema is not None else None
+        kind, items = _schema_type(schema, compiler) if schema is not None else (None, None)
+        self.kind = kind
+        self.items_kind = _schema_type(items, compiler)[0] if items is not None else None
+        style = getattr(parameter.get("style"), "value", parameter.get("style"))
+        explode = parameter.get("explode")
+        self.explode = explode if explode is not None else style in (None, "form")
+
+    def coerce(self, value: Union[str, List[str]]) -> Any:
+        if self.json:
+            raw = value[0] if isinstance(value, list) else value
+            try:
+                return json.loads(raw)
+            except ValueError:
+                return raw
+        kinds = [self.kind] if isinstance(self.kind, str) else list(self.kind or ())
+        if "array" in kinds:
+            if isinstance(value, list):
+                values = value if self.explode or len(value) != 1 else value[0].split(",")
+            else:
+                values = value.split(",") if value else []
+            return [_coerce_scalar(item, self.items_kind) for item in values]
+        if isinstance(value, list):
+            value = value[0] if value else ""
+        return _coerce_scalar(value, self.kind)
+
+
+class OperationValidator:
+    """
+    Compiled validators for the requests and responses of one operation.
+
+    Parameter values are given as strings, as they appear in the request, and converted to
+    the type of their schema before they are validated. Bodies are given already decoded
+    (e.g. with json.loads).
+
+    Attributes:
+        entry (IndexedOperation): The operation.
+    """
+
+    def __init__(self, entry: IndexedOperation, compiler: SchemaCompiler):
+        self.entry = entry
+        self._compiler = compiler
+        self._parameters = [_CompiledParameter(self._keywords(parameter), compiler)
+                            for parameter in entry.parameters]
+        operation = entry.operation
+        body = self._keywords(operation.requestBody) if operation.requestBody else {}
+        self.body_required = bool(body.get("required"))
+        self._bodies = self._compile_content(body.get("content"))
+        self._responses = {
+            str(status): self._compile_content(self._keywords(response).get("content"))
+            for status, response in (operation.responses or {}).items()
+        }
+
+    def _keywords(self, node: Any) -> Dict[str, Any]:
+        # The fields of a parameter, request body or response, following references
+        for _ in range(32):
+            keywords = dict(object_items(unwrap_root(node)) or ())
+            if not isinstance(keywords.get("$ref"), str):
+                return keywords
+            node = self._compiler.resolve(keywords["$ref"])
+        raise ReferenceResolutionError(f"Too many nested references at {self.entry.pointer}")
+
+    def _compile_content(self, content: Any) -> Dict[str, Optional[SchemaValidator]]:
+        validators = {}
+        for media_type, media in (object_items(unwrap_root(content)) or ()):
+            schema = dict(object_items(unwrap_root(media)) or ()).get("schema")
+            validators[media_range(media_type)] = (
+                self._compiler.compile(schema) if schema is not None else None
+            )
+        return validators
+
+    def validate_parameters(self, path_params: Optional[Mapping[str, str]] = None,
+                            query: Optional[Mapping[str, Union[str, List[str]]]] = None,
+                            headers: Optional[Mapping[str, str]] = None,
+                            cookies: Optional[Mapping[str, str]] = None) -> List[str]:
+        """
+        Validates the parameters of a request against the operation.
+
+        Args:
+            path_params (Optional[Mapping[str, str]], optional): Path parameter values.
+            query (Optional[Mapping[str, Union[str, List[str]]]], optional): Query parameters;
+                repeated parameters as lists.
+            headers (Optional[Mapping[str, str]], optional): Headers, in any case.
+            cookies (Optional[Mapping[str, str]], optional): Cookie values.
+
+        Returns:
+            List[str]: The error messages; empty if the parameters are valid.
+        """
+        errors: List[str] = []
+        sources = {
+            "path": path_params or {},
+            "query": query or {},
+            "header": {key.lower(): value for key, value in (headers or {}).items()},
+            "cookie": cookies or {},
+        }
+        for parameter in self._parameters:
+            values = sources.get(parameter.location, {})
+            name = parameter.name.lower() if parameter.location == "header" else parameter.name
+            label = f"{parameter.location} parameter {parameter.name!r}"
+            if name not in values:
+                if parameter.required:
+                    errors.append(f"{label} is required")
+                continue
+            if parameter.validator is not None:
+                value = parameter.coerce(values[name])
+                errors.extend(f"{label}: {error}" for error in parameter.validator.errors(value))
+        return errors
+
+    def validate_body(self, body: Any, media_type: Optional[str] = None) -> List[str]:
+        """
+        Validates the body of a request against the operation.
+
+        Args:
+            body (Any): The decoded body, or None if the request has no body. A body given as
+                bytes was not decoded, and is only checked against the allowed media types.
+            media_type (Optional[str], optional): The Content-Type of the body.
+
+        Returns:
+            List[str]: The error messages; empty if the body is valid.
+        """
+        if body is None:
+            return ["request body is required"] if self.body_required else []
+        if not self._bodies:
+            return []
+        validator = _select_media_type(self._bodies, media_type or "application/json")
+        if validator is _MISSING:
+            return [f"request body: media type {media_type!r} is not allowed"]
+        if validator is None or isinstance(body, bytes):
+            return []
+        return [f"request body: {error}" for error in validator.errors(body)]
+
+    def validate_request(self, path_params: Optional[Mapping[str, str]] = None,
+                         query: Optional[Mapping[str, Union[str, List[str]]]] = None,
+                         headers: Optional[Mapping[str, str]] = None,
+                         cookies: Optional[Mapping[str, str]] = None,
+                         body: Any = None, media_type: Optional[str] = None) -> List[str]:
+        """
+        Validates a request against the operation: its parameters, then its body.
+
+        Args:
+            path_params (Optional[Mapping[str, str]], optional): Path parameter values.
+            query (Optional[Mapping[str, Union[str, List[str]]]], optional): Query parameters;
+                repeated parameters as lists.
+            headers (Optional[Mapping[str, str]], optional): Headers, in any case.
+            cookies (Optional[Mapping[str, str]], optional): Cookie values.
+            body (Any, optional): The decoded body, or None if the request has no body.
+            media_type (Optional[str], optional): The Content-Type of the body.
+
+        Returns:
+            List[str]: The error messages; empty if the request is valid.
+        """
+        errors = self.validate_parameters(path_params, query, headers, cookies)
+        errors.extend(self.validate_body(body, media_type))
+        return errors
+
+    def validate_response(self, status: int, body: Any = None,
+                          media_type: Optional[str] = None) -> List[str]:
+        """
+        Validates a response against the operation.
+
+        Args:
+            status (int): The status code.
+            body (Any, optional): The decoded body, or None if the response has no body. A
+                body given as bytes is only checked against the documented media types.
+            media_type (Optional[str], optional): The Content-Type of the body.
+
+        Returns:
+            List[str]: The error messages; empty if the response is valid.
+        """
+        code = str(status)
+        for key in (code, code[:1] + "XX", code[:1] + "xx", "default"):
+            if key in self._responses:
+                content = self._responses[key]
+                break
+        else:
+            return [f"response status {code} is not documented"]
+        if body is None or not content:
+            return []
+        validator = _select_media_type(content, media_type or "application/json")
+        if validator is _MISSING:
+            return [f"response body: media type {media_type!r} is not documented"]
+        if validator is None or isinstance(body, bytes):
+            return []
+        return [f"response body: {error}" for error in validator.errors(body)]
+
+
+# Marks a missing value
+_MISSING = object()
@@ -15,6 +15,12 @@ install_requires=["PyYAML", "jsonschema", "requests"],
 
 python_requires=">=3.6",
 
+entry_points={
+
+"console_scripts": ["fountainai-openapi=fountainai_openapi_parser.cli:main"],
+
+},
+
 classifiers=[
 
 "License :: OSI Approved :: MIT License",
@@ -0,0 +1,118 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from fountainai_openapi_parser.aio import (
+    aload_openapi_from_file,
+    aparse_openapi,
+    aresolve_references,
+)
+from fountainai_openapi_parser.exceptions import ParsingError, ReferenceResolutionError
+
+SPEC = """openapi: 3.1.0
+info:
+  title: Session API
+  version: 1.0.0
+paths:
+  /sessions:
+    get:
+      responses:
+        '200':
+          description: OK
+"""
+
+
+class TestAsyncAPI(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.spec_path = self.dir / "openapi.yaml"
+        self.spec_path.write_text(SPEC)
+        (self.dir / "session.yaml").write_text(
+            "type: object\nproperties:\n  context:\n    $ref: 'context.yaml#/Context'\n"
+        )
+        (self.dir / "context.yaml").write_text("Context:\n  type: string\n")
+
+    async def test_load_from_file(self):
+        openapi = await aload_openapi_from_file(self.spec_path)
+        self.assertEqual(openapi.info.title, "Session API")
+        sections = await aload_openapi_from_file(str(self.spec_path), select=["/info"])
+        self.assertEqual(sections.paths, {})
+
+    async def test_load_missing_file(self):
+        with self.assertRaises(ParsingError):
+            await aload_openapi_from_file(self.dir / "missing.yaml")
+
+    async def test_parse(self):
+        openapi = await aparse_openapi(
+            {"openapi": "3.1.0", "info": {"title": "T", "version": "1"}, "paths": {}}
+        )
+        self.assertEqual(openapi.info.title, "T")
+        with self.assertRaises(ParsingError):
+            await aparse_openapi({"openapi": "3.1.0", "paths": {}})
+
+    async def test_resolve_external_references(self):
+        document = {"components": {"schemas": {"Session": {"$ref": "session.yaml"}}}}
+        resolved = await aresolve_references(document, self.spec_path)
+        self.assertEqual(resolved["components"]["schemas"]["Session"]["properties"]["context"],
+                         {"type": "string"})
+
+    async def test_custom_fetcher_replaces_filesystem(self):
+        store = {
+            "session.yaml": b'{"type": "object", "properties": {"id": {"$ref": "id.json"}}}',
+            "id.json": "type: integer\n",
+        }
+        fetched = []
+
+        async def fetch_from_store(path):
+            fetched.append(path.name)
+            await asyncio.sleep(0)
+            return store[path.name]
+
+        document = {"a": {"$ref": "session.yaml"}, "b": {"$ref": "session.yaml"}}
+        resolved = await aresolve_references(document, "virtual/openapi.yaml",
+                                             fetcher=fetch_from_store)
+        self.assertEqual(resolved["b"]["properties"]["id"], {"type": "integer"})
+        self.assertEqual(sorted(fetched), ["id.json", "session.yaml"])
+
+    async def test_fetch_failure_is_reported_with_location(self):
+        async def failing_fetcher(path):
+            raise IOError("connection reset")
+
+        with self.assertRaises(ReferenceResolutionError) as error:
+            await aresolve_references({"a": [{"$ref": "x.yaml"}]}, fetcher=failing_fetcher)
+        self.assertIn("at /a/0", error.exception.message)
+        self.assertIn("connection reset", error.exception.message)
+
+    async def test_concurrency_is_bounded(self):
+        in_flight = []
+        peak = []
+
+        async def slow_fetcher(path):
+            in_flight.append(path)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(path)
+            return "type: string\n"
+
+        document = {f"s{i}": {"$ref": f"s{i}.yaml"} for i in range(20)}
+        resolved = await aresolve_references(document, fetcher=slow_fetcher, max_concurrency=5)
+        self.assertEqual(resolved["s19"], {"type": "string"})
+        self.assertEqual(max(peak), 5)
+
+    async def test_concurrent_resolutions(self):
+        documents = [
+            {"components": {"schemas": {f"S{i}": {"$ref": "session.yaml"}}}} for i in range(10)
+        ]
+        results = await asyncio.gather(
+            *(aresolve_references(document, self.spec_path) for document in documents)
+        )
+        for i, resolved in enumerate(results):
+            self.assertEqual(resolved["components"]["schemas"][f"S{i}"]["type"], "object")
+
+
+if __name__ == '__main__':
+    unittest.main()
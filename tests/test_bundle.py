@@ -0,0 +1,171 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from fountainai_openapi_parser.bundle import bundle
+from fountainai_openapi_parser.exceptions import ReferenceResolutionError
+from fountainai_openapi_parser.parser import parse_openapi
+from fountainai_openapi_parser.utils import resolve_references
+
+
+class TestBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.base_path = self.dir / "openapi.yaml"
+        self.write("character.yaml", """
+Character:
+  type: object
+  properties:
+    id:
+      $ref: '#/Id'
+    actions:
+      type: array
+      items:
+        $ref: 'action.yaml'
+    friend:
+      $ref: '#/Character'
+Id:
+  type: integer
+""")
+        self.write("action.yaml", "type: object\nproperties:\n  name:\n    type: string\n")
+        self.write("copy/action.yaml", "type: object\nproperties:\n  name:\n    type: string\n")
+        self.write("params.yaml", """
+CharacterId:
+  name: id
+  in: path
+  required: true
+  schema:
+    $ref: 'character.yaml#/Id'
+""")
+
+    def write(self, name, text):
+        path = self.dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+    def document(self):
+        return {
+            "openapi": "3.1.0",
+            "info": {"title": "Character API", "version": "1.0.0"},
+            "paths": {
+                "/characters/{id}": {
+                    "parameters": [{"$ref": "params.yaml#/CharacterId"}],
+                    "get": {
+                        "responses": {
+                            "200": {
+                                "description": "OK",
+                                "content": {
+                                    "application/json": {
+                                        "schema": {"$ref": "character.yaml#/Character"}
+                                    }
+                                },
+                            }
+                        }
+                    },
+                    "post": {
+                        "requestBody": {
+                            "content": {
+                                "application/json": {
+                                    "schema": {"$ref": "copy/action.yaml"}
+                                }
+                            }
+                        },
+                        "responses": {"201": {"$ref": "#/components/responses/Created"}},
+                    },
+                }
+            },
+            "components": {
+                "schemas": {"Action": {"type": "string"}},
+                "responses": {"Created": {"description": "Created"}},
+            },
+        }
+
+    def test_hoists_targets_into_components(self):
+        bundled = bundle(self.document(), self.base_path)
+        item = bundled["paths"]["/characters/{id}"]
+        self.assertEqual(item["parameters"], [{"$ref": "#/components/parameters/CharacterId"}])
+        schema = item["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        self.assertEqual(schema, {"$ref": "#/components/schemas/Character"})
+        schemas = bundled["components"]["schemas"]
+        character = schemas["Character"]
+        self.assertEqual(character["properties"]["id"], {"$ref": "#/components/schemas/Id"})
+        self.assertEqual(character["properties"]["friend"],
+                         {"$ref": "#/components/schemas/Character"})
+        self.assertEqual(schemas["Id"], {"type": "integer"})
+        self.assertEqual(bundled["components"]["parameters"]["CharacterId"]["schema"],
+                         {"$ref": "#/components/schemas/Id"})
+        # Local references of the main document are kept
+        self.assertEqual(item["post"]["responses"]["201"],
+                         {"$ref": "#/components/responses/Created"})
+
+    def test_names_do_not_collide_and_duplicates_are_merged(self):
+        bundled = bundle(self.document(), self.base_path)
+        schemas = bundled["components"]["schemas"]
+        self.assertEqual(schemas["Action"], {"type": "string"})
+        self.assertEqual(schemas["action"]["properties"]["name"], {"type": "string"})
+        # copy/action.yaml would be 'action_2', but its content is identical
+        self.assertNotIn("action_2", schemas)
+        post = bundled["paths"]["/characters/{id}"]["post"]
+        self.assertEqual(post["requestBody"]["content"]["application/json"]["schema"],
+                         {"$ref": "#/components/schemas/action"})
+        self.assertEqual(schemas["Character"]["properties"]["actions"]["items"],
+                         {"$ref": "#/components/schemas/action"})
+
+    def test_output_is_valid_and_equivalent(self):
+        document = self.document()
+        bundled = bundle(document, self.base_path)
+        parse_openapi(bundled)
+        # Resolving the bundle gives the same result as resolving the sources (up to cycles)
+        path = "/characters/{id}"
+        self.assertEqual(
+            resolve_references(bundled)["paths"][path]["parameters"],
+            resolve_references(document, self.base_path)["paths"][path]["parameters"],
+        )
+        self.assertNotIn("action.yaml", json.dumps(bundled))
+        self.assertEqual(document["components"]["schemas"], {"Action": {"type": "string"}})
+
+    def test_output_grows_linearly(self):
+        document = self.document()
+        operations = document["paths"]["/characters/{id}"]
+        for i in range(50):
+            operations[f"x-copy{i}"] = {"$ref": "character.yaml#/Character"}
+        bundled = json.dumps(bundle(document, self.base_path))
+        inlined = json.dumps(resolve_references(document, self.base_path))
+        self.assertLess(len(bundled) * 2, len(inlined))
+
+    def test_reference_back_into_main_document(self):
+        self.write("pet.yaml", "Pet:\n  $ref: 'openapi.yaml#/components/schemas/Action'\n")
+        document = {"components": {"schemas": {"Action": {"type": "string"},
+                                               "Pet": {"$ref": "pet.yaml#/Pet"}}}}
+        bundled = bundle(document, self.base_path)
+        self.assertEqual(bundled["components"]["schemas"]["Pet"],
+                         {"$ref": "#/components/schemas/Pet_2"})
+        self.assertEqual(bundled["components"]["schemas"]["Pet_2"],
+                         {"$ref": "#/components/schemas/Action"})
+
+    def test_reference_back_into_main_document_without_base_path(self):
+        self.write("pet.yaml", "Pet:\n  $ref: 'openapi.yaml#/components/schemas/Action'\n")
+        document = {"components": {"schemas": {"Action": {"type": "string"},
+                                               "Pet": {"$ref": "pet.yaml#/Pet"}}}}
+        self.write("openapi.yaml", json.dumps(document))
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.dir)
+        schemas = bundle(document)["components"]["schemas"]
+        self.assertEqual(sorted(schemas), ["Action", "Pet", "Pet_2"])
+        self.assertEqual(schemas["Pet_2"], {"$ref": "#/components/schemas/Action"})
+
+    def test_missing_target_reports_location(self):
+        document = {"paths": {"/a": {"get": {"x-schema": {"$ref": "character.yaml#/Nope"}}}}}
+        with self.assertRaises(ReferenceResolutionError) as error:
+            bundle(document, self.base_path)
+        self.assertIn("/paths/~1a/get/x-schema", error.exception.message)
+        self.assertIn("'Nope' not found", error.exception.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
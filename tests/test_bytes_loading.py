@@ -0,0 +1,107 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from fountainai_openapi_parser.loader import (
+    detect_encoding,
+    load_bytes,
+    load_selected,
+    load_source,
+    open_buffer,
+)
+from fountainai_openapi_parser.parser import load_openapi_from_file, OpenAPI
+from fountainai_openapi_parser.utils import load_file
+
+YAML_DOCUMENT = "openapi: 3.1.0\ninfo:\n  title: Café API\n  version: 1.0.0\npaths: {}\n"
+JSON_DOCUMENT = json.dumps(
+    {"openapi": "3.1.0", "info": {"title": "Café API", "version": "1.0.0"}, "paths": {}}
+)
+EXPECTED = {"openapi": "3.1.0", "info": {"title": "Café API", "version": "1.0.0"}, "paths": {}}
+
+
+class TestBytesLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, data):
+        path = Path(self.tmp.name) / name
+        path.write_bytes(data)
+        return path
+
+    def test_detect_encoding(self):
+        cases = {
+            "utf-8-sig": ("utf-8", 3),
+            "utf-16": ("utf-16-le", 2),
+            "utf-32": ("utf-32-le", 4),
+            "utf-16-be": ("utf-16-be", 0),
+            "utf-16-le": ("utf-16-le", 0),
+            "utf-32-be": ("utf-32-be", 0),
+            "utf-32-le": ("utf-32-le", 0),
+            "utf-8": ("utf-8", 0),
+        }
+        for codec, expected in cases.items():
+            with self.subTest(codec=codec):
+                self.assertEqual(detect_encoding(YAML_DOCUMENT.encode(codec)), expected)
+
+    def test_load_bytes_in_all_encodings(self):
+        codecs = ("utf-8", "utf-8-sig", "utf-16", "utf-16-le", "utf-32", "utf-32-be")
+        for document in (YAML_DOCUMENT, JSON_DOCUMENT):
+            for codec in codecs:
+                with self.subTest(document=document[:1], codec=codec):
+                    self.assertEqual(load_bytes(document.encode(codec)), EXPECTED)
+
+    def test_load_bytes_from_buffers(self):
+        data = YAML_DOCUMENT.encode("utf-8")
+        self.assertEqual(load_bytes(memoryview(data)), EXPECTED)
+        self.assertEqual(load_bytes(bytearray(data)), EXPECTED)
+        self.assertEqual(load_bytes(memoryview(JSON_DOCUMENT.encode("utf-8"))), EXPECTED)
+
+    def test_load_bytes_empty(self):
+        self.assertIsNone(load_bytes(b""))
+
+    def test_open_buffer_memory_maps_files(self):
+        path = self.write("openapi.yaml", YAML_DOCUMENT.encode("utf-8-sig"))
+        self.assertEqual(load_source(path), EXPECTED)
+        self.assertEqual(load_source(str(path)), EXPECTED)
+        empty = self.write("empty.yaml", b"")
+        with open_buffer(empty) as buffer:
+            self.assertEqual(bytes(buffer), b"")
+
+    def test_binary_file_objects(self):
+        self.assertEqual(load_source(io.BytesIO(JSON_DOCUMENT.encode("utf-16"))), EXPECTED)
+        path = self.write("openapi.json", b"garbage\n" + JSON_DOCUMENT.encode("utf-8"))
+        with open(path, "rb") as file:
+            file.readline()
+            # Only what is left after the current position is used
+            self.assertEqual(load_source(file), EXPECTED)
+
+    def test_text_file_object_is_rejected(self):
+        with self.assertRaises(TypeError):
+            load_source(io.StringIO(YAML_DOCUMENT))
+
+    def test_load_selected_from_bytes(self):
+        selected = load_selected(YAML_DOCUMENT.encode("utf-32"), ["/info/title"])
+        self.assertEqual(selected, {"info": {"title": "Café API"}})
+
+    def test_load_file_accepts_bytes_sources(self):
+        self.assertEqual(load_file(YAML_DOCUMENT.encode("utf-16")), YAML_DOCUMENT)
+        self.assertEqual(load_file(memoryview(YAML_DOCUMENT.encode("utf-8-sig"))), YAML_DOCUMENT)
+        self.assertEqual(load_file(io.BytesIO(YAML_DOCUMENT.encode("utf-8"))), YAML_DOCUMENT)
+        path = self.write("openapi.yaml", YAML_DOCUMENT.encode("utf-8-sig"))
+        self.assertEqual(load_file(path), YAML_DOCUMENT)
+
+    def test_load_openapi_from_file(self):
+        path = self.write("openapi.json", JSON_DOCUMENT.encode("utf-16"))
+        parsed = load_openapi_from_file(str(path))
+        self.assertIsInstance(parsed, OpenAPI)
+        self.assertEqual(parsed.info.title, "Café API")
+        with open(path, "rb") as file:
+            self.assertEqual(load_openapi_from_file(file).info.title, "Café API")
+
+
+if __name__ == '__main__':
+    unittest.main()
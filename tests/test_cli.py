@@ -0,0 +1,102 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fountainai_openapi_parser import cli
+from fountainai_openapi_parser.cache import shared_document_cache
+from fountainai_openapi_parser.cli import find_specs, main
+from fountainai_openapi_parser.remote import shared_http_fetcher
+
+VALID_SPEC = """openapi: 3.1.0
+info:
+  title: {title}
+  version: 1.0.0
+paths:
+  /characters:
+    get:
+      responses:
+        '200':
+          $ref: 'shared/responses.yaml#/{response}'
+"""
+
+
+class TestValidateCommand(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        (self.dir / "shared").mkdir()
+        (self.dir / "shared" / "responses.yaml").write_text("Ok:\n  description: OK\n")
+        for title in ("Character Service", "Action Service", "Story Factory API"):
+            name = title.lower().replace(" ", "_") + ".yaml"
+            (self.dir / name).write_text(VALID_SPEC.format(title=title, response="Ok"))
+        (self.dir / "notes.txt").write_text("not a spec")
+
+    def run_command(self, *args):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            code = main(["validate", *args])
+        return code, json.loads(stdout.getvalue())
+
+    def test_find_specs(self):
+        names = [path.name for path in find_specs([str(self.dir)])]
+        self.assertEqual(names, ["action_service.yaml", "character_service.yaml",
+                                 "responses.yaml", "story_factory_api.yaml"])
+
+    def test_valid_directory(self):
+        for jobs in ("1", "2"):
+            with self.subTest(jobs=jobs):
+                code, output = self.run_command(str(self.dir), "--jobs", jobs, "--resolve")
+                self.assertEqual(code, 0)
+                summary = output["summary"]
+                self.assertEqual((summary["total"], summary["ok"], summary["skipped"]), (4, 3, 1))
+                skipped = [item for item in output["files"] if item["status"] == "skipped"]
+                self.assertEqual(Path(skipped[0]["path"]).name, "responses.yaml")
+                self.assertTrue(all(item["seconds"] >= 0 for item in output["files"]))
+
+    def test_workers_share_decoded_documents(self):
+        cache_dir = self.dir / "cache"
+        code, _ = self.run_command(str(self.dir), "-j", "2", "--resolve",
+                                   "--cache-dir", str(cache_dir))
+        self.assertEqual(code, 0)
+        self.assertEqual(len(list(cache_dir.glob("*.document"))), 1)
+        # A later run finds shared/responses.yaml already decoded
+        with mock.patch("fountainai_openapi_parser.parse_cache.load_bytes") as load_bytes:
+            code, _ = self.run_command(str(self.dir), "-j", "1", "--resolve",
+                                       "--cache-dir", str(cache_dir))
+        self.assertEqual(code, 0)
+        load_bytes.assert_not_called()
+
+    def test_in_process_run_restores_the_caches(self):
+        cache_dir = shared_http_fetcher.cache_dir
+        code, _ = self.run_command(str(self.dir), "-j", "1", "--resolve",
+                                   "--http-cache", str(self.dir / "http"),
+                                   "--cache-dir", str(self.dir / "cache"))
+        self.assertEqual(code, 0)
+        self.assertEqual(shared_http_fetcher.cache_dir, cache_dir)
+        self.assertIs(cli._documents, shared_document_cache)
+
+    def test_failures_set_the_exit_code(self):
+        (self.dir / "broken.yaml").write_text("openapi: 3.1.0\npaths: {}\n")
+        (self.dir / "dangling.yaml").write_text(
+            VALID_SPEC.format(title="Session API", response="Missing")
+        )
+        code, output = self.run_command(str(self.dir), "-j", "2")
+        self.assertEqual(code, 1)
+        results = {Path(item["path"]).name: item for item in output["files"]}
+        self.assertEqual(results["broken.yaml"]["status"], "invalid")
+        self.assertIn("ParsingError", results["broken.yaml"]["error"])
+        # Unresolvable references are only reported with --resolve
+        self.assertEqual(results["dangling.yaml"]["status"], "ok")
+        code, output = self.run_command(str(self.dir / "dangling.yaml"), "--resolve")
+        self.assertEqual(code, 1)
+        self.assertIn("'Missing' not found", output["files"][0]["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
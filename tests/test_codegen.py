@@ -0,0 +1,159 @@
+import tempfile
+import unittest
+
+from test_validators import CASES
+
+from fountainai_openapi_parser.codegen import GeneratedValidators, generate_source
+from fountainai_openapi_parser.exceptions import ParsingError
+from fountainai_openapi_parser.parser import parse_openapi, parse_openapi_lazy
+from fountainai_openapi_parser.validators import SchemaCompiler, compile_schema
+
+# Schemas that report several errors, at nested locations
+DETAILED = {
+    "Character": {
+        "type": "object",
+        "required": ["id", "name"],
+        "properties": {
+            "id": {"type": "integer", "minimum": 1, "multipleOf": 2},
+            "name": {"type": "string", "maxLength": 5, "pattern": "^[A-Z]"},
+            "tags": {"type": "array", "uniqueItems": True, "items": {"enum": ["a", "b"]}},
+            "scores": {"type": "array", "prefixItems": [{"type": "string"}],
+                       "items": {"type": "number", "exclusiveMaximum": 10}},
+            "friend": {"$ref": "#/components/schemas/Character"},
+            "nickname": {"type": "string", "nullable": True},
+        },
+        "patternProperties": {"^x-": {"type": "string"}},
+        "additionalProperties": False,
+        "propertyNames": {"maxLength": 8},
+        "dependentSchemas": {"tags": {"required": ["scores"]}},
+    },
+    "Shape": {
+        "oneOf": [{"$ref": "#/components/schemas/Circle"}, {"type": "object",
+                                                          "required": ["side"]}],
+        "not": {"const": {}},
+        "if": {"required": ["kind"]},
+        "then": {"properties": {"kind": {"enum": ["circle", 2]}}},
+        "else": {"minProperties": 1, "contains": {"type": "string"}},
+    },
+    "Circle": {"type": "object", "required": ["radius"],
+               "properties": {"radius": {"$ref": "#/components/schemas/Character/properties/id"}}},
+}
+
+INSTANCES = [
+    {"id": 2, "name": "Ann"},
+    {"id": 3, "name": "annabelle", "tags": ["a", "a", "c"], "x-a": 1, "surname": "B",
+     "friend": {"id": 0, "friend": {"name": 7}}, "scores": [1, 2, 10.5], "nickname": None},
+    {"id": 1.5, "name": None, "nickname": 3, "averyverylongname": 1},
+    {"radius": 4, "side": 1}, {"radius": 3}, {"kind": "square"}, {}, [], 7, None,
+]
+
+
+def make_document(schemas):
+    return {"openapi": "3.1.0", "info": {"title": "Character API", "version": "1.0.0"},
+            "paths": {}, "components": {"schemas": schemas}}
+
+
+class TestGeneratedValidators(unittest.TestCase):
+
+    def assertSameResults(self, document, generated, instances):
+        compiler = SchemaCompiler(document)
+        for name in generated:
+            interpreted = compiler.compile({"$ref": f"#/components/schemas/{name}"})
+            for instance in instances:
+                with self.subTest(schema=name, instance=instance):
+                    self.assertEqual(generated[name].errors(instance),
+                                     interpreted.errors(instance))
+
+    def test_keywords_match_compiled_validators(self):
+        schemas = {f"Case{index}": schema for index, (schema, _, _) in enumerate(CASES)}
+        generated = GeneratedValidators(make_document(schemas))
+        self.assertEqual(len(generated), len(CASES))
+        for index, (schema, valid, invalid) in enumerate(CASES):
+            for instance in valid + invalid:
+                with self.subTest(schema=schema, instance=instance):
+                    self.assertEqual(generated[f"Case{index}"].errors(instance),
+                                     compile_schema(schema).errors(instance))
+                    self.assertEqual(generated[f"Case{index}"].is_valid(instance),
+                                     any(instance is value for value in valid))
+
+    def test_errors_match_for_every_document_form(self):
+        content = make_document(DETAILED)
+        for document in (content, parse_openapi(content), parse_openapi_lazy(content)):
+            with self.subTest(document=type(document).__name__):
+                generated = GeneratedValidators(document)
+                self.assertSameResults(document, generated, INSTANCES)
+        self.assertEqual(GeneratedValidators(content)["Character"].errors(INSTANCES[1]), [
+            "3 is not a multiple of 2 at /id",
+            "'annabelle' is too long at /name",
+            "'annabelle' does not match '^[A-Z]' at /name",
+            "'c' is not one of ['a', 'b'] at /tags/2",
+            "['a', 'a', 'c'] has non-unique elements at /tags",
+            "1 is not of type 'string' at /scores/0",
+            "10.5 is greater than or equal to the maximum of 10 at /scores/2",
+            "'name' is a required property at /friend",
+            "0 is less than the minimum of 1 at /friend/id",
+            "'id' is a required property at /friend/friend",
+            "7 is not of type 'string' at /friend/friend/name",
+            "1 is not of type 'string' at /x-a",
+            "Additional properties are not allowed ('surname' was unexpected)",
+        ])
+
+    def test_deeply_nested_schemas(self):
+        schema = {"type": "integer"}
+        for depth in range(60):
+            schema = {"type": "array", "items": schema} if depth % 2 else {
+                "properties": {"a": schema}}
+        instance = 1.5
+        for depth in range(60):
+            instance = [instance] if depth % 2 else {"a": instance}
+        document = make_document({"Deep": schema})
+        generated = GeneratedValidators(document)
+        self.assertEqual(len(generated["Deep"].errors(instance)), 1)
+        self.assertSameResults(document, generated, [instance, [], {"a": [[]]}])
+
+    def test_source(self):
+        source = generate_source(make_document(DETAILED))
+        self.assertIn("def _schema0(value, location, errors):", source)
+        self.assertIn("'#/components/schemas/Character/properties/id'", source)
+        compile(source, "<generated>", "exec")
+        with self.assertRaises(ParsingError):
+            generate_source(make_document({"Bad": {"properties": {"a": {"type": "text"}}}}))
+
+    def test_cache_directory(self):
+        content = make_document(DETAILED)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = GeneratedValidators(content, cache_dir)
+            self.assertFalse(first.cached)
+            self.assertTrue(first.path.exists())
+            second = GeneratedValidators(parse_openapi_lazy(content), cache_dir)
+            self.assertTrue(second.cached)
+            self.assertEqual(second.key, first.key)
+            self.assertSameResults(content, second, INSTANCES)
+
+            # A changed schema gets a module of its own
+            changed = make_document(dict(DETAILED, Circle={"type": "object"}))
+            self.assertNotEqual(GeneratedValidators(changed, cache_dir).key, first.key)
+            # References outside the schemas are checked when the module is loaded
+            changed = make_document(dict(DETAILED, Circle={
+                "properties": {"radius": {"$ref": "#/x-id"}}}))
+            changed["x-id"] = {"type": "string"}
+            stale = GeneratedValidators(changed, cache_dir)
+            changed["x-id"] = {"type": "integer"}
+            fresh = GeneratedValidators(changed, cache_dir)
+            self.assertEqual(fresh.key, stale.key)
+            self.assertFalse(fresh.cached)
+            self.assertEqual(fresh["Circle"].errors({"radius": "r"}),
+                             ["'r' is not of type 'integer' at /radius"])
+
+    def test_schema_compiler_uses_generated_validators(self):
+        document = parse_openapi(make_document(DETAILED))
+        generated = GeneratedValidators(document)
+        compiler = SchemaCompiler(document, generated=generated)
+        validator = compiler.compile({"type": "array",
+                                      "items": {"$ref": "#/components/schemas/Character"}})
+        self.assertEqual(validator.errors([{"id": 2, "name": "Ann"}, {"id": 2}]),
+                         ["'name' is a required property at /1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import json
+import pickle
+import unittest
+
+from fountainai_openapi_parser.compact import (
+    CompactMap,
+    CompactSchema,
+    compact_schema,
+    compact_schemas,
+)
+from fountainai_openapi_parser.exceptions import ParsingError
+from fountainai_openapi_parser.models import Schema
+from fountainai_openapi_parser.parser import parse_openapi, parse_openapi_lazy
+
+CHARACTER = {
+    "type": "object",
+    "description": "A character",
+    "required": ["id", "name"],
+    "properties": {
+        "id": {"type": "integer", "minimum": 1},
+        "name": {"type": ["string", "null"], "maxLength": 20},
+        "tags": {"type": "array", "items": {"type": "string"}, "default": []},
+        "kind": {"oneOf": [{"const": "hero"}, {"$ref": "#/components/schemas/Kind"}]},
+        "mood": {"not": {"enum": ["angry", {"level": 3}]}, "example": {"level": 1}},
+    },
+    "additionalProperties": False,
+    "discriminator": {"propertyName": "kind"},
+    "xml": {"name": "character"},
+}
+
+SPEC = {
+    "openapi": "3.1.0",
+    "info": {"title": "Character API", "version": "1.0.0"},
+    "paths": {},
+    "components": {"schemas": {
+        "Character": CHARACTER,
+        "Kind": {"type": "string", "enum": ["hero", "villain"]},
+        "Villain": {"$ref": "#/components/schemas/Character"},
+        "Name": {"type": "string"},
+    }},
+}
+
+
+class TestCompactSchema(unittest.TestCase):
+
+    def test_round_trip(self):
+        model = Schema.model_validate(CHARACTER)
+        compact = compact_schema(model)
+        self.assertIsInstance(compact, CompactSchema)
+        self.assertEqual(compact.to_model(), model)
+        self.assertEqual(compact_schema(CHARACTER).to_model(), model)
+        self.assertEqual(compact.to_dict(), json.loads(json.dumps(
+            model.model_dump(by_alias=True, exclude_unset=True))))
+        self.assertEqual(compact_schema(CHARACTER).to_dict(), CHARACTER)
+
+    def test_only_set_keywords_are_stored(self):
+        compact = compact_schema(Schema.model_validate({"type": "string", "default": None}))
+        self.assertEqual(list(compact), ["default", "type"])
+        self.assertEqual(len(compact), 2)
+        self.assertIsNone(compact["default"])
+        self.assertNotIn("format", compact)
+        self.assertIsNone(compact.get("format"))
+        with self.assertRaises(KeyError):
+            compact["format"]
+
+    def test_nested_values(self):
+        compact = compact_schema(CHARACTER)
+        properties = compact["properties"]
+        self.assertIsInstance(properties, CompactMap)
+        self.assertNotIsInstance(properties, CompactSchema)
+        self.assertIsInstance(properties["tags"]["items"], CompactSchema)
+        self.assertEqual(properties["tags"]["default"], ())
+        self.assertEqual(properties["name"]["type"], ("string", "null"))
+        self.assertEqual(properties["kind"]["oneOf"][1]["$ref"], "#/components/schemas/Kind")
+        self.assertIsInstance(properties["mood"]["not"], CompactSchema)
+        self.assertIsInstance(properties["mood"]["example"], CompactMap)
+        self.assertIs(compact["additionalProperties"], False)
+        self.assertEqual(compact["discriminator"], {"propertyName": "kind"})
+
+    def test_keys_and_strings_are_shared(self):
+        schemas = compact_schemas(json.loads(json.dumps(SPEC)))
+        character = schemas["Character"]
+        tags = character["properties"]["tags"]
+        # Subschemas with the same keywords share their key index
+        self.assertIs(tags["items"]._index, schemas["Name"]._index)
+        self.assertIsNot(tags._index, schemas["Name"]._index)
+        self.assertIs(tags["items"]["type"], schemas["Kind"]["type"])
+        self.assertIs(character["properties"]["kind"]["oneOf"][0]["const"],
+                      schemas["Kind"]["enum"][0])
+        self.assertIs(character["required"][0],
+                      next(iter(character["properties"])))
+
+    def test_read_only(self):
+        compact = compact_schema(CHARACTER)
+        with self.assertRaises(AttributeError):
+            compact.title = "Character"
+        with self.assertRaises(AttributeError):
+            compact._values = ()
+        with self.assertRaises(TypeError):
+            compact["title"] = "Character"
+        with self.assertRaises(TypeError):
+            CompactSchema()
+
+    def test_pickle(self):
+        compact = compact_schema(CHARACTER)
+        copy = pickle.loads(pickle.dumps(compact))
+        self.assertIsInstance(copy, CompactSchema)
+        self.assertEqual(copy, compact)
+
+    def test_document_forms(self):
+        expected = compact_schemas(SPEC)
+        self.assertEqual(list(expected), ["Character", "Kind", "Villain", "Name"])
+        for document in (parse_openapi(SPEC), parse_openapi_lazy(SPEC)):
+            with self.subTest(document=type(document).__name__):
+                schemas = compact_schemas(document)
+                self.assertEqual(schemas, expected)
+        self.assertEqual(compact_schemas({"openapi": "3.1.0", "paths": {}}), {})
+
+    def test_invalid_schema(self):
+        with self.assertRaises(ParsingError):
+            compact_schema({"properties": {"id": 1}})
+        with self.assertRaises(ParsingError):
+            compact_schema({"properties": []})
+
+
+if __name__ == '__main__':
+    unittest.main()
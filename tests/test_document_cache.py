@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from fountainai_openapi_parser.cache import DocumentCache
+from fountainai_openapi_parser.utils import resolve_references
+
+
+class TestDocumentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.common = self.dir / "common.yaml"
+        self.common.write_text("type: object\nproperties:\n  name:\n    type: string\n")
+        self.base_path = self.dir / "openapi.yaml"
+
+    def make_document(self, count):
+        return {
+            "components": {
+                "schemas": {f"Schema{i}": {"$ref": "common.yaml"} for i in range(count)}
+            }
+        }
+
+    def test_external_document_loaded_once_per_resolution(self):
+        cache = DocumentCache(max_entries=None, check_stat=False)
+        resolved = resolve_references(self.make_document(300), self.base_path, cache=cache)
+        self.assertEqual(len(resolved["components"]["schemas"]), 300)
+        self.assertEqual(resolved["components"]["schemas"]["Schema299"]["type"], "object")
+        # One load by the prefetch phase, then every reference is a hit
+        self.assertEqual(cache.stats(), {"hits": 300, "misses": 1, "evictions": 0, "entries": 1})
+
+    def test_resolved_copies_do_not_alias_cached_document(self):
+        cache = DocumentCache()
+        resolved = resolve_references(self.make_document(2), self.base_path, cache=cache)
+        resolved["components"]["schemas"]["Schema0"]["type"] = "string"
+        self.assertEqual(resolved["components"]["schemas"]["Schema1"]["type"], "object")
+        self.assertEqual(cache.get(self.common)["type"], "object")
+
+    def test_shared_cache_persists_across_calls(self):
+        cache = DocumentCache()
+        resolve_references(self.make_document(3), self.base_path, cache=cache)
+        resolve_references(self.make_document(3), self.base_path, cache=cache)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 7)
+
+    def test_stat_check_reloads_changed_files(self):
+        cache = DocumentCache()
+        self.assertEqual(cache.get(self.common)["type"], "object")
+        self.common.write_text("type: array\nitems: {}\n")
+        stat = self.common.stat()
+        os.utime(self.common, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(cache.get(str(self.common))["type"], "array")
+        self.assertEqual(cache.misses, 2)
+
+    def test_lru_eviction(self):
+        cache = DocumentCache(max_entries=2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = self.dir / f"{name}.json"
+            path.write_text(f'{{"name": "{name}"}}')
+            paths.append(path)
+        cache.get(paths[0])
+        cache.get(paths[1])
+        cache.get(paths[0])  # "a" becomes most recently used
+        cache.get(paths[2])  # evicts "b"
+        self.assertIn(paths[0], cache)
+        self.assertNotIn(paths[1], cache)
+        self.assertIn(paths[2], cache)
+        self.assertEqual(cache.evictions, 1)
+        cache.clear()
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 0, "evictions": 0, "entries": 0})
+
+    def test_missing_file_is_not_cached(self):
+        cache = DocumentCache()
+        with self.assertRaises(FileNotFoundError):
+            cache.get(self.dir / "missing.yaml")
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import copy
+import unittest
+
+from fountainai_openapi_parser.exceptions import JsonPointerError
+from fountainai_openapi_parser.fingerprint import Fingerprints, diff, fingerprint, fingerprints
+from fountainai_openapi_parser.parser import parse_openapi
+
+
+def make_document():
+    character = {
+        "type": "object",
+        "required": ["id"],
+        "properties": {"id": {"type": "integer"}, "name": {"type": "string"}},
+    }
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Character API", "version": "1.0.0"},
+        "paths": {
+            "/characters": {
+                "get": {
+                    "operationId": "listCharacters",
+                    "responses": {"200": {"description": "OK"}},
+                }
+            }
+        },
+        "components": {
+            "schemas": {"Character": character, "Copy": copy.deepcopy(character)},
+            "responses": {"NotFound": {"description": "Not found"}},
+        },
+    }
+
+
+class TestFingerprints(unittest.TestCase):
+
+    def setUp(self):
+        self.document = make_document()
+
+    def test_equal_content_has_equal_fingerprints(self):
+        prints = Fingerprints(self.document)
+        self.assertEqual(prints["/components/schemas/Character"],
+                         prints["/components/schemas/Copy"])
+        self.assertNotEqual(prints["/components/schemas/Character"],
+                            prints["/components/schemas/Character/properties/id"])
+        # Key order does not matter, array order does
+        reordered = dict(reversed(list(self.document.items())))
+        self.assertEqual(fingerprint(reordered), prints[""])
+        changed = copy.deepcopy(self.document)
+        changed["components"]["schemas"]["Character"]["required"].append("name")
+        self.assertNotEqual(fingerprint(changed), prints[""])
+        self.assertEqual(fingerprint(changed, "/paths"), prints["/paths"])
+
+    def test_scalars_are_typed(self):
+        self.assertNotEqual(fingerprint({"a": 1}), fingerprint({"a": "1"}))
+        self.assertNotEqual(fingerprint({"a": True}), fingerprint({"a": 1}))
+        self.assertNotEqual(fingerprint({"a": []}), fingerprint({"a": {}}))
+        self.assertNotEqual(fingerprint(["ab", "c"]), fingerprint(["a", "bc"]))
+        self.assertEqual(fingerprint({"a": 1}, "/a"), fingerprint([1], "/0"))
+        # Numbers are compared by value, as in JSON
+        self.assertEqual(fingerprint({"a": 1}), fingerprint({"a": 1.0}))
+        self.assertNotEqual(fingerprint({"a": 1}), fingerprint({"a": 1.5}))
+
+    def test_model_matches_raw_document(self):
+        # The model stores the bounds as floats
+        self.document["components"]["schemas"]["Character"]["properties"]["id"].update(
+            {"minimum": 0, "maximum": 1000, "multipleOf": 2, "exclusiveMaximum": 999.5})
+        model = parse_openapi(self.document)
+        prints = Fingerprints(self.document)
+        for pointer in ("/components/schemas/Character", "/components/responses/NotFound",
+                        "/components/schemas/Character/properties/id", "/paths/~1characters/get",
+                        "/info"):
+            with self.subTest(pointer=pointer):
+                self.assertEqual(fingerprint(model, pointer), prints[pointer])
+
+    def test_edits_after_hashing(self):
+        model = parse_openapi(self.document)
+        prints = fingerprints(model)
+        # Every object and array node is hashed once
+        self.assertGreater(len(prints), 10)
+        before = prints["/components/schemas/Character"]
+        character = model.components.schemas["Character"]
+        character.required.append("name")
+        self.assertNotEqual(fingerprint(model, "/components/schemas/Character"), before)
+        character.description = "A character"
+        character.model_fields_set.add("description")
+        character.properties["id"].examples = [1]
+        character.properties["id"].model_fields_set.add("examples")
+        with self.assertRaises(ValueError):
+            prints.digest("/components/schemas/Character/properties/id/examples")
+        self.assertEqual(fingerprints(model)["/components/schemas/Character/description"],
+                         fingerprint({"a": "A character"}, "/a"))
+
+    def test_shared_nodes_and_cycles(self):
+        shared = {"type": "string"}
+        document = {"a": shared, "b": [shared, shared]}
+        self.assertEqual(fingerprint(document, "/a"), fingerprint(document, "/b/1"))
+        document["c"] = document
+        with self.assertRaises(ValueError):
+            fingerprint(document)
+
+    def test_invalid_pointer(self):
+        with self.assertRaises(JsonPointerError):
+            fingerprint(self.document, "/components/schemas/Missing")
+        with self.assertRaises(JsonPointerError):
+            fingerprint(parse_openapi(self.document), "/components/pathItems")
+
+    def test_diff(self):
+        new = copy.deepcopy(self.document)
+        new["components"]["schemas"]["Character"]["properties"]["id"]["minimum"] = 0
+        del new["components"]["responses"]
+        new["paths"]["/scenes"] = {}
+        new["components"]["schemas"]["Copy"]["required"].append("name")
+        self.assertEqual(diff(self.document, new), [
+            "/paths/~1scenes",
+            "/components/schemas/Character/properties/id/minimum",
+            "/components/schemas/Copy/required/1",
+            "/components/responses",
+        ])
+        self.assertEqual(diff(self.document, copy.deepcopy(self.document)), [])
+        self.assertEqual(diff(parse_openapi(self.document), parse_openapi(new)),
+                         diff(self.document, new))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from fountainai_openapi_parser.utils import resolve_references
+
+
+class TestIdentityResolution(unittest.TestCase):
+
+    def setUp(self):
+        self.document = {
+            "paths": {
+                f"/characters{i}": {
+                    "get": {"responses": {"200": {"$ref": "#/components/schemas/Character"}}}
+                }
+                for i in range(1000)
+            },
+            "components": {
+                "schemas": {
+                    "Character": {"type": "object", "properties": {"name": {"type": "string"}}},
+                    "Node": {
+                        "type": "object",
+                        "properties": {
+                            "value": {"type": "string"},
+                            "children": {
+                                "type": "array",
+                                "items": {"$ref": "#/components/schemas/Node"},
+                            },
+                        },
+                    },
+                }
+            },
+        }
+
+    def test_references_share_one_object(self):
+        resolved = resolve_references(self.document, preserve_identity=True)
+        character = resolved["components"]["schemas"]["Character"]
+        targets = {
+            id(item["get"]["responses"]["200"]) for item in resolved["paths"].values()
+        }
+        self.assertEqual(targets, {id(character)})
+
+    def test_copy_mode_inlines_independent_copies(self):
+        resolved = resolve_references(self.document)
+        first = resolved["paths"]["/characters0"]["get"]["responses"]["200"]
+        second = resolved["paths"]["/characters1"]["get"]["responses"]["200"]
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    def test_recursive_schema_becomes_cyclic_graph(self):
+        resolved = resolve_references(self.document, preserve_identity=True)
+        node = resolved["components"]["schemas"]["Node"]
+        self.assertIs(node["properties"]["children"]["items"], node)
+
+    def test_recursive_schema_in_copy_mode_leaves_back_reference(self):
+        resolved = resolve_references(self.document)
+        node = resolved["components"]["schemas"]["Node"]
+        items = node["properties"]["children"]["items"]
+        self.assertEqual(items["type"], "object")
+        self.assertEqual(
+            items["properties"]["children"]["items"], {"$ref": "#/components/schemas/Node"}
+        )
+
+    def test_reference_chain_cycle_terminates(self):
+        document = {"a": {"$ref": "#/b"}, "b": {"$ref": "#/a"}}
+        for preserve_identity in (False, True):
+            with self.subTest(preserve_identity=preserve_identity):
+                resolved = resolve_references(document, preserve_identity=preserve_identity)
+                self.assertEqual(resolved["a"], {"$ref": "#/b"})
+
+    def test_cycle_across_external_documents(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            (directory / "story.yaml").write_text(
+                "Story:\n"
+                "  type: object\n"
+                "  properties:\n"
+                "    scenes:\n"
+                "      type: array\n"
+                "      items:\n"
+                "        $ref: 'scene.yaml#/Scene'\n"
+            )
+            (directory / "scene.yaml").write_text(
+                "Scene:\n"
+                "  type: object\n"
+                "  properties:\n"
+                "    story:\n"
+                "      $ref: 'story.yaml#/Story'\n"
+            )
+            document = {"components": {"schemas": {"Story": {"$ref": "story.yaml#/Story"}}}}
+            resolved = resolve_references(
+                document, directory / "openapi.yaml", preserve_identity=True
+            )
+        story = resolved["components"]["schemas"]["Story"]
+        scene = story["properties"]["scenes"]["items"]
+        self.assertEqual(scene["type"], "object")
+        self.assertIs(scene["properties"]["story"], story)
+
+    def test_local_reference_inside_external_document(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            (directory / "common.yaml").write_text(
+                "Error:\n  $ref: '#/Base'\nBase:\n  type: object\n"
+            )
+            document = {"error": {"$ref": "common.yaml#/Error"}}
+            resolved = resolve_references(document, directory / "openapi.yaml")
+        self.assertEqual(resolved["error"], {"type": "object"})
+
+    def test_back_reference_inside_external_document(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            (directory / "schemas").mkdir()
+            (directory / "schemas" / "tree.yaml").write_text(
+                "Node:\n"
+                "  type: object\n"
+                "  properties:\n"
+                "    children:\n"
+                "      type: array\n"
+                "      items:\n"
+                "        $ref: '#/Node'\n"
+            )
+            document = {"tree": {"$ref": "schemas/tree.yaml#/Node"},
+                        "local": {"$ref": "#/tree"}}
+            resolved = resolve_references(document, directory / "openapi.yaml")
+            # The marker is valid in the root document
+            marker = {"$ref": "schemas/tree.yaml#/Node"}
+            self.assertEqual(resolved["tree"]["properties"]["children"]["items"], marker)
+            self.assertEqual(resolved["local"]["properties"]["children"]["items"], marker)
+            again = resolve_references(resolved, directory / "openapi.yaml")
+        self.assertEqual(again["tree"]["properties"]["children"]["items"]["type"], "object")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import copy
+import unittest
+from unittest import mock
+
+from fountainai_openapi_parser import incremental
+from fountainai_openapi_parser.exceptions import ParsingError
+from fountainai_openapi_parser.incremental import reparse
+from fountainai_openapi_parser.models import PathItem
+from fountainai_openapi_parser.parser import parse_openapi
+
+
+def make_document(path_count=20, schema_count=10):
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Character API", "version": "1.0.0"},
+        "paths": {
+            f"/characters{i}": {
+                "get": {
+                    "operationId": f"getCharacter{i}",
+                    "responses": {"200": {"description": "OK"}},
+                }
+            }
+            for i in range(path_count)
+        },
+        "components": {
+            "schemas": {
+                f"Character{i}": {"type": "object", "properties": {"id": {"type": "integer"}}}
+                for i in range(schema_count)
+            },
+            "responses": {"NotFound": {"description": "Not found"}},
+        },
+    }
+
+
+class TestReparse(unittest.TestCase):
+
+    def setUp(self):
+        self.document = make_document()
+        self.previous = parse_openapi(self.document, track_changes=True)
+
+    def reparse_counting(self, previous, content):
+        with mock.patch.object(PathItem, "model_validate",
+                               wraps=PathItem.model_validate) as validate:
+            result = reparse(previous, content)
+        return result, validate.call_count
+
+    def test_result_equals_full_parse(self):
+        new = copy.deepcopy(self.document)
+        new["paths"]["/characters3"]["get"]["summary"] = "Changed"
+        new["paths"]["/scenes"] = {"post": {"responses": {"201": {"description": "Created"}}}}
+        del new["paths"]["/characters5"]
+        new["components"]["schemas"]["Character1"]["properties"]["name"] = {"type": "string"}
+        del new["components"]["schemas"]["Character2"]
+        new["components"]["schemas"]["Scene"] = {"type": "string"}
+        new["info"]["version"] = "1.1.0"
+        self.assertEqual(reparse(self.previous, new), parse_openapi(new))
+
+    def test_only_changed_path_items_are_validated(self):
+        new = copy.deepcopy(self.document)
+        new["paths"]["/characters3"]["get"]["summary"] = "Changed"
+        new["paths"]["/scenes"] = {"get": {"responses": {"200": {"description": "OK"}}}}
+        result, count = self.reparse_counting(self.previous, new)
+        self.assertEqual(count, 2)
+        self.assertEqual(result.paths["/characters3"]["get"]["summary"], "Changed")
+
+    def test_unchanged_components_are_reused(self):
+        new = copy.deepcopy(self.document)
+        new["components"]["schemas"]["Character1"]["type"] = "array"
+        previous_schemas = self.previous.components.schemas
+        # A copy of the parsed model has no recorded digests and is compared in dumped form
+        for previous in (self.previous, self.previous.model_copy()):
+            with self.subTest(recorded=id(previous) in incremental._sources):
+                schemas = reparse(previous, new).components.schemas
+                self.assertIs(schemas["Character0"], previous_schemas["Character0"])
+                self.assertIs(schemas["Character9"], previous_schemas["Character9"])
+                self.assertIsNot(schemas["Character1"], previous_schemas["Character1"])
+                self.assertEqual(schemas["Character1"].type, "array")
+
+    def test_chained_reparses_compare_raw_content(self):
+        result = reparse(self.previous, copy.deepcopy(self.document))
+        with mock.patch("pydantic.BaseModel.model_dump") as dump:
+            new = copy.deepcopy(self.document)
+            new["paths"]["/characters0"]["get"]["summary"] = "Changed"
+            result, count = self.reparse_counting(result, new)
+        dump.assert_not_called()
+        self.assertEqual(count, 1)
+        self.assertIn(id(result), incremental._sources)
+
+    def test_recording_is_opt_in(self):
+        self.assertNotIn(id(parse_openapi(self.document)), incremental._sources)
+        self.assertIn(id(self.previous), incremental._sources)
+        untracked = parse_openapi(self.document)
+        incremental.record_content(untracked, self.document)
+        self.assertIn(id(untracked), incremental._sources)
+
+    def test_untracked_previous(self):
+        previous = parse_openapi(self.document)
+        new = copy.deepcopy(self.document)
+        new["paths"]["/characters3"]["get"]["summary"] = "Changed"
+        result, count = self.reparse_counting(previous, new)
+        self.assertEqual(count, 1)
+        self.assertEqual(result, parse_openapi(new))
+        # Path items shared with the previous content may have been edited in place
+        self.document["paths"]["/characters2"]["get"] = {"responses": "garbage"}
+        with self.assertRaises(ParsingError):
+            reparse(previous, self.document)
+
+    def test_invalid_change_raises(self):
+        new = copy.deepcopy(self.document)
+        new["paths"]["/characters2"]["get"]["responses"] = "nope"
+        with self.assertRaises(ParsingError) as error:
+            reparse(self.previous, new)
+        self.assertIn("/paths/~1characters2", error.exception.message)
+        new = copy.deepcopy(self.document)
+        new["components"]["responses"]["NotFound"] = {"content": 1}
+        with self.assertRaises(ParsingError) as error:
+            reparse(self.previous, new)
+        self.assertIn("/components/responses/NotFound", error.exception.message)
+        with self.assertRaises(ParsingError):
+            reparse(self.previous, {"openapi": "3.1.0", "paths": {}})
+
+    def test_in_place_edits_are_detected(self):
+        # OpenAPI.paths shares the raw path items with the content that was parsed
+        self.document["paths"]["/characters2"]["get"] = {"responses": "garbage"}
+        with self.assertRaises(ParsingError):
+            parse_openapi(self.document)
+        with self.assertRaises(ParsingError):
+            reparse(self.previous, self.document)
+
+        content = make_document()
+        result = reparse(self.previous, content)
+        content["paths"]["/characters2"]["get"] = {"responses": "garbage"}
+        with self.assertRaises(ParsingError):
+            reparse(result, content)
+        content = make_document()
+        result = reparse(self.previous, content)
+        content["components"]["schemas"]["Character3"]["type"] = 3
+        with self.assertRaises(ParsingError):
+            reparse(result, content)
+        content["components"]["schemas"]["Character3"]["type"] = "array"
+        schemas = reparse(result, content).components.schemas
+        self.assertEqual(schemas["Character3"].type, "array")
+        self.assertIs(schemas["Character4"], result.components.schemas["Character4"])
+
+    def test_removed_components(self):
+        new = copy.deepcopy(self.document)
+        del new["components"]
+        self.assertIsNone(reparse(self.previous, new).components)
+        new = copy.deepcopy(self.document)
+        del new["components"]["responses"]
+        self.assertIsNone(reparse(self.previous, new).components.responses)
+
+
+if __name__ == '__main__':
+    unittest.main()
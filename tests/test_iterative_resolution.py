@@ -0,0 +1,66 @@
+import sys
+import unittest
+
+from fountainai_openapi_parser.exceptions import ReferenceResolutionError
+from fountainai_openapi_parser.utils import resolve_references
+
+
+def nested_schema(depth):
+    schema = {"$ref": "#/components/schemas/Leaf"}
+    for level in range(depth):
+        schema = {"type": "object", "properties": {f"level{level}": schema}}
+    return schema
+
+
+class TestIterativeResolution(unittest.TestCase):
+
+    def test_deep_document_beyond_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 2
+        document = {
+            "components": {
+                "schemas": {"Deep": nested_schema(depth), "Leaf": {"type": "string"}}
+            }
+        }
+        resolved = resolve_references(document)
+        node = resolved["components"]["schemas"]["Deep"]
+        for level in reversed(range(depth)):
+            node = node["properties"][f"level{level}"]
+        self.assertEqual(node, {"type": "string"})
+
+    def test_key_and_item_order_is_preserved(self):
+        document = {
+            "b": 1,
+            "a": [{"$ref": "#/c"}, 2, [3, {"x": 4}]],
+            "c": {"z": 1, "y": 2},
+        }
+        resolved = resolve_references(document)
+        self.assertEqual(list(resolved), ["b", "a", "c"])
+        self.assertEqual(resolved["a"], [{"z": 1, "y": 2}, 2, [3, {"x": 4}]])
+        self.assertEqual(list(resolved["a"][0]), ["z", "y"])
+
+    def test_input_is_not_modified(self):
+        document = {"a": {"$ref": "#/b"}, "b": {"c": [1, 2]}}
+        resolve_references(document)
+        self.assertEqual(document, {"a": {"$ref": "#/b"}, "b": {"c": [1, 2]}})
+
+    def test_error_reports_location(self):
+        document = {
+            "paths": {
+                "/pets/{id}": {
+                    "get": {"parameters": [{"$ref": "#/components/parameters/id/name"}]}
+                }
+            },
+            "components": {"parameters": {"id": {"name": "id", "in": "path"}}},
+        }
+        with self.assertRaises(ReferenceResolutionError) as error:
+            resolve_references(document)
+        self.assertIn("/paths/~1pets~1{id}/get/parameters/0", error.exception.message)
+
+    def test_missing_external_document(self):
+        with self.assertRaises(ReferenceResolutionError) as error:
+            resolve_references({"a": {"$ref": "does-not-exist.yaml"}})
+        self.assertIn("at /a", error.exception.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
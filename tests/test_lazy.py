@@ -0,0 +1,112 @@
+import unittest
+
+from fountainai_openapi_parser.exceptions import ParsingError
+from fountainai_openapi_parser.lazy import LazyOpenAPI, LazyPathItem
+from fountainai_openapi_parser.models import Operation, PathItem, Reference, Schema
+from fountainai_openapi_parser.parser import parse_openapi, parse_openapi_lazy, OpenAPI
+
+
+class TestLazyOpenAPI(unittest.TestCase):
+
+    def setUp(self):
+        self.content = {
+            "openapi": "3.1.0",
+            "info": {"title": "Action Service", "version": "1.0.0"},
+            "paths": {
+                "/actions": {
+                    "summary": "Actions",
+                    "get": {
+                        "operationId": "listActions",
+                        "responses": {"200": {"description": "A list of actions"}},
+                    },
+                    # Invalid: operations must declare their responses
+                    "post": {"operationId": "createAction"},
+                },
+                "/actions/{id}": {
+                    "get": {
+                        "operationId": "getAction",
+                        "responses": {"200": {"description": "A single action"}},
+                    }
+                },
+            },
+            "components": {
+                "schemas": {
+                    "Action": {"type": "object"},
+                    "ActionRef": {"$ref": "#/components/schemas/Action"},
+                    "Broken": {"type": "object", "properties": "not-a-mapping"},
+                }
+            },
+        }
+
+    def test_top_level_fields_are_validated_up_front(self):
+        lazy = parse_openapi_lazy(self.content)
+        self.assertIsInstance(lazy, LazyOpenAPI)
+        self.assertEqual(lazy.info.title, "Action Service")
+        self.assertEqual(lazy.paths.loaded, 0)
+        self.content["info"] = "Invalid structure"
+        with self.assertRaises(ParsingError):
+            parse_openapi_lazy(self.content)
+
+    def test_non_mapping_paths_rejected_up_front(self):
+        self.content["paths"] = "invalid_content"
+        with self.assertRaises(ParsingError):
+            parse_openapi_lazy(self.content)
+
+    def test_path_items_are_validated_on_access(self):
+        lazy = parse_openapi_lazy(self.content)
+        self.assertEqual(sorted(lazy.paths), ["/actions", "/actions/{id}"])
+        item = lazy.paths["/actions"]
+        self.assertIsInstance(item, LazyPathItem)
+        self.assertIs(lazy.paths["/actions"], item)
+        self.assertEqual(lazy.paths.loaded, 1)
+        self.assertEqual(item.summary, "Actions")
+        self.assertEqual(list(item.methods()), ["get", "post"])
+        operation = item.get
+        self.assertIsInstance(operation, Operation)
+        self.assertIs(item.get, operation)
+        self.assertIsNone(item.put)
+
+    def test_invalid_operation_raises_same_error_every_time(self):
+        item = parse_openapi_lazy(self.content).paths["/actions"]
+        with self.assertRaises(ParsingError) as first:
+            item.post
+        with self.assertRaises(ParsingError) as second:
+            item.post
+        self.assertEqual(first.exception.message, second.exception.message)
+        self.assertIn("/paths/~1actions/post", first.exception.message)
+        # Valid siblings are unaffected
+        self.assertEqual(item.get.operationId, "listActions")
+
+    def test_components_are_validated_on_access(self):
+        lazy = parse_openapi_lazy(self.content)
+        schemas = lazy.components.schemas
+        self.assertIsNone(lazy.components.responses)
+        self.assertIsInstance(schemas["Action"], Schema)
+        self.assertIsInstance(schemas["ActionRef"], (Schema, Reference))
+        self.assertEqual(schemas.loaded, 2)
+        with self.assertRaises(ParsingError) as error:
+            schemas["Broken"]
+        self.assertIn("/components/schemas/Broken", error.exception.message)
+
+    def test_to_openapi_matches_eager_parse(self):
+        del self.content["paths"]["/actions"]["post"]
+        del self.content["components"]["schemas"]["Broken"]
+        lazy = parse_openapi_lazy(self.content)
+        cached = lazy.components.schemas["Action"]
+        full = lazy.to_openapi()
+        eager = parse_openapi(self.content)
+        self.assertIsInstance(full, OpenAPI)
+        self.assertEqual(full.paths, eager.paths)
+        self.assertEqual(full.components, eager.components)
+        self.assertIs(full.components.schemas["Action"], cached)
+        self.assertIsInstance(lazy.paths["/actions"].to_path_item(), PathItem)
+
+    def test_to_openapi_reports_first_invalid_entry(self):
+        lazy = parse_openapi_lazy(self.content)
+        with self.assertRaises(ParsingError) as error:
+            lazy.to_openapi()
+        self.assertIn("/paths/~1actions/post", error.exception.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
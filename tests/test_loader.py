@@ -0,0 +1,51 @@
+import unittest
+from unittest import mock
+
+import yaml
+
+from fountainai_openapi_parser import loader
+
+
+class TestLoader(unittest.TestCase):
+
+    def test_load_yaml_document(self):
+        content = loader.load_content("openapi: 3.1.0\ninfo:\n  title: Sample API\n")
+        self.assertEqual(content["info"]["title"], "Sample API")
+
+    def test_json_document_uses_json_decoder(self):
+        with mock.patch.object(loader, "load_yaml") as load_yaml:
+            content = loader.load_content('  {"openapi": "3.1.0", "paths": {}}')
+        load_yaml.assert_not_called()
+        self.assertEqual(content, {"openapi": "3.1.0", "paths": {}})
+
+    def test_json_document_with_bom(self):
+        content = loader.load_content('\ufeff{"openapi": "3.1.0"}')
+        self.assertEqual(content, {"openapi": "3.1.0"})
+
+    def test_yaml_flow_mapping_falls_back_to_yaml(self):
+        # Starts with '{' but is YAML, not JSON
+        content = loader.load_content("{openapi: 3.1.0, info: {title: Flow}}")
+        self.assertEqual(content["info"]["title"], "Flow")
+
+    def test_invalid_document_raises_yaml_error(self):
+        with self.assertRaises(yaml.YAMLError):
+            loader.load_content("{openapi: [unterminated")
+
+    def test_looks_like_json(self):
+        self.assertTrue(loader.looks_like_json('\n\t {"a": 1}'))
+        self.assertFalse(loader.looks_like_json("openapi: 3.1.0"))
+        self.assertFalse(loader.looks_like_json("   "))
+
+    def test_falls_back_without_libyaml(self):
+        with mock.patch.object(loader, "SafeLoader", yaml.SafeLoader), \
+                mock.patch.object(yaml.SafeLoader, "__init__", autospec=True,
+                                  side_effect=yaml.SafeLoader.__init__) as init:
+            self.assertEqual(loader.load_content("a: 1"), {"a": 1})
+            self.assertEqual(loader.load_bytes(b"a: [1, 2]"), {"a": [1, 2]})
+            self.assertEqual(loader.load_selected("a: 1\nb: 2\n", ["/b"]), {"b": 2})
+        # Every document went through the pure-Python loader
+        self.assertEqual(init.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
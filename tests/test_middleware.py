@@ -0,0 +1,250 @@
+import asyncio
+import io
+import json
+import unittest
+from wsgiref.util import setup_testing_defaults
+
+from fountainai_openapi_parser.middleware import (
+    ASGIValidationMiddleware,
+    WSGIValidationMiddleware,
+)
+from fountainai_openapi_parser.parser import parse_openapi_lazy
+
+CHARACTER = {"$ref": "#/components/schemas/Character"}
+
+SPEC = {
+    "openapi": "3.1.0",
+    "info": {"title": "Character API", "version": "1.0.0"},
+    "paths": {
+        "/characters/{id}": {
+            "parameters": [{"name": "id", "in": "path", "required": True,
+                            "schema": {"type": "integer"}}],
+            "get": {
+                "operationId": "getCharacter",
+                "parameters": [{"name": "verbose", "in": "query",
+                                "schema": {"type": "boolean"}}],
+                "responses": {"200": {"description": "OK", "content": {
+                    "application/json": {"schema": CHARACTER}}}},
+            },
+            "put": {
+                "operationId": "updateCharacter",
+                "requestBody": {"required": True, "content": {
+                    "application/json": {"schema": CHARACTER}}},
+                "responses": {"204": {"description": "Updated"}},
+            },
+        }
+    },
+    "components": {"schemas": {"Character": {
+        "type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}}}},
+}
+
+
+def wsgi_app(environ, start_response):
+    # Echoes the request body, or returns a character named after the query string
+    length = environ.get("CONTENT_LENGTH")
+    body = environ["wsgi.input"].read(int(length) if length else -1)
+    if environ["REQUEST_METHOD"] == "PUT":
+        start_response("204 No Content", [])
+        return [body]
+    name = environ.get("QUERY_STRING") == "broken" and 7 or "Ann"
+    start_response("200 OK", [("Content-Type", "application/json")])
+    return [b'{"name": ', json.dumps(name).encode("utf-8"), b"}"]
+
+
+async def asgi_app(scope, receive, send):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    if scope["method"] == "PUT":
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+        return
+    name = 7 if scope["query_string"] == b"broken" else "Ann"
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b'{"name": ', "more_body": True})
+    await send({"type": "http.response.body", "body": json.dumps(name).encode() + b"}"})
+
+
+class TestWSGIValidationMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.violations = []
+        self.document = parse_openapi_lazy(SPEC)
+
+    def middleware(self, **options):
+        return WSGIValidationMiddleware(wsgi_app, self.document,
+                                        on_violation=self.violations.append, **options)
+
+    def call(self, app, method, path, query="", body=b"", **environ):
+        environ.update({"REQUEST_METHOD": method, "PATH_INFO": path, "QUERY_STRING": query,
+                        "CONTENT_TYPE": "application/json", "wsgi.input": io.BytesIO(body)})
+        environ.setdefault("CONTENT_LENGTH", str(len(body)))
+        if environ["CONTENT_LENGTH"] is None:
+            del environ["CONTENT_LENGTH"]
+        setup_testing_defaults(environ)
+        statuses = []
+        result = app(environ, lambda status, headers, exc_info=None: statuses.append(status))
+        content = b"".join(result)
+        getattr(result, "close", lambda: None)()
+        return statuses[0], content
+
+    def test_valid_traffic(self):
+        app = self.middleware()
+        self.assertEqual(self.call(app, "GET", "/characters/1", "verbose=true"),
+                         ("200 OK", b'{"name": "Ann"}'))
+        # The application still receives the body that was validated
+        self.assertEqual(self.call(app, "PUT", "/characters/1", body=b'{"name": "Bo"}'),
+                         ("204 No Content", b'{"name": "Bo"}'))
+        self.assertEqual(self.call(app, "GET", "/scenes/1"), ("200 OK", b'{"name": "Ann"}'))
+        self.assertEqual(self.violations, [])
+
+    def test_request_violations(self):
+        app = self.middleware()
+        self.call(app, "GET", "/characters/x", "verbose=maybe")
+        self.call(app, "PUT", "/characters/1", body=b'{"name": 1}')
+        self.call(app, "PUT", "/characters/1", body=b"{")
+        self.call(app, "PUT", "/characters/1")
+        self.assertEqual([violation.errors for violation in self.violations], [
+            ["path parameter 'id': 'x' is not of type 'integer'",
+             "query parameter 'verbose': 'maybe' is not of type 'boolean'"],
+            ["request body: 1 is not of type 'string' at /name"],
+            ["request body is not valid JSON"],
+            ["request body is required"],
+        ])
+        violation = self.violations[0]
+        self.assertEqual((violation.phase, violation.method, violation.path, violation.template,
+                          violation.operation_id),
+                         ("request", "get", "/characters/x", "/characters/{id}", "getCharacter"))
+
+    def test_body_without_length(self):
+        # A chunked upload: the server marks the end of the input instead of giving a length
+        chunked = {"CONTENT_LENGTH": None, "wsgi.input_terminated": True}
+        body = b'{"name": "Bo"}'
+        for app in (self.middleware(), self.middleware(max_body_size=4)):
+            self.assertEqual(self.call(app, "PUT", "/characters/1", body=body, **chunked),
+                             ("204 No Content", body))
+        self.call(self.middleware(), "PUT", "/characters/1", body=b'{"name": 1}', **chunked)
+        self.assertEqual([violation.errors for violation in self.violations],
+                         [["request body: 1 is not of type 'string' at /name"]])
+        # Without either, the body is left to the application unvalidated
+        self.assertEqual(self.call(self.middleware(), "PUT", "/characters/1", body=body,
+                                   CONTENT_LENGTH=None), ("204 No Content", body))
+        self.assertEqual(len(self.violations), 1)
+
+    def test_body_read_ahead_is_replayed(self):
+        def app(environ, start_response):
+            stream = environ["wsgi.input"]
+            parts = [stream.read(1), stream.readline(), stream.readline(3), stream.read(2)]
+            start_response("204 No Content", [])
+            return parts + list(stream)
+
+        middleware = WSGIValidationMiddleware(app, self.document, max_body_size=4,
+                                              on_violation=self.violations.append)
+        status, content = self.call(middleware, "PUT", "/characters/1", body=b"ab\ncdef\ngh",
+                                    CONTENT_LENGTH=None, **{"wsgi.input_terminated": True})
+        self.assertEqual(content, b"ab\ncdef\ngh")
+        self.assertEqual(self.violations, [])
+
+    def test_path_info_is_decoded_once(self):
+        # PATH_INFO of a request for /characters/x%2541
+        self.call(self.middleware(), "GET", "/characters/x%41")
+        self.assertEqual(self.violations[0].errors,
+                         ["path parameter 'id': 'x%41' is not of type 'integer'"])
+
+    def test_reject_invalid(self):
+        status, content = self.call(self.middleware(reject_invalid=True), "PUT",
+                                    "/characters/1", body=b"{}")
+        self.assertEqual(status, "400 Bad Request")
+        self.assertEqual(json.loads(content),
+                         {"errors": ["request body: 'name' is a required property"]})
+
+    def test_response_violations(self):
+        self.call(self.middleware(), "GET", "/characters/1", "broken")
+        self.assertEqual(len(self.violations), 1)
+        self.assertEqual((self.violations[0].phase, self.violations[0].status,
+                          self.violations[0].errors),
+                         ("response", 200, ["response body: 7 is not of type 'string' at /name"]))
+        self.call(self.middleware(validate_responses=False), "GET", "/characters/1", "broken")
+        self.call(self.middleware(max_body_size=4), "GET", "/characters/1", "broken")
+        self.assertEqual(len(self.violations), 1)
+
+    def test_sampling(self):
+        app = self.middleware(sample_rate=0)
+        for _ in range(20):
+            self.call(app, "GET", "/characters/x", "broken")
+        self.assertEqual(self.violations, [])
+        app = self.middleware(sample_rate=0.5)
+        for _ in range(200):
+            self.call(app, "GET", "/characters/x")
+        self.assertTrue(40 < len(self.violations) < 160)
+        with self.assertRaises(ValueError):
+            self.middleware(sample_rate=1.5)
+
+
+class TestASGIValidationMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.violations = []
+        self.app = ASGIValidationMiddleware(asgi_app, parse_openapi_lazy(SPEC),
+                                            on_violation=self.violations.append)
+
+    def call(self, method, path, query=b"", chunks=(), raw_path=None):
+        messages = [{"type": "http.request", "body": chunk, "more_body": True}
+                    for chunk in chunks] + [{"type": "http.request", "body": b""}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": method, "path": path, "query_string": query,
+                 "headers": [(b"content-type", b"application/json")]}
+        if raw_path is not None:
+            scope["raw_path"] = raw_path
+        asyncio.run(self.app(scope, receive, send))
+        return sent[0]["status"], b"".join(message.get("body", b"") for message in sent[1:])
+
+    def test_valid_traffic(self):
+        self.assertEqual(self.call("GET", "/characters/1"), (200, b'{"name": "Ann"}'))
+        self.assertEqual(self.call("PUT", "/characters/1", chunks=[b'{"name"', b': "Bo"}']),
+                         (204, b'{"name": "Bo"}'))
+        self.assertEqual(self.violations, [])
+
+    def test_violations(self):
+        self.call("PUT", "/characters/1", chunks=[b'{"name"', b": 3}"])
+        self.call("GET", "/characters/1", b"broken")
+        self.assertEqual([(violation.phase, violation.errors) for violation in self.violations], [
+            ("request", ["request body: 3 is not of type 'string' at /name"]),
+            ("response", ["response body: 7 is not of type 'string' at /name"]),
+        ])
+
+    def test_raw_path_is_decoded_once(self):
+        self.call("GET", "/characters/x%41", raw_path=b"/characters/x%2541")
+        self.assertEqual(self.call("GET", "/characters/x/y", raw_path=b"/characters/x%2Fy"),
+                         (200, b'{"name": "Ann"}'))
+        self.call("GET", "/characters/x%41")
+        self.assertEqual([violation.errors for violation in self.violations], [
+            ["path parameter 'id': 'x%41' is not of type 'integer'"],
+            ["path parameter 'id': 'x/y' is not of type 'integer'"],
+            ["path parameter 'id': 'x%41' is not of type 'integer'"],
+        ])
+
+    def test_other_scopes_pass_through(self):
+        calls = []
+
+        async def app(scope, receive, send):
+            calls.append(scope["type"])
+
+        middleware = ASGIValidationMiddleware(app, parse_openapi_lazy(SPEC))
+        asyncio.run(middleware({"type": "lifespan"}, None, None))
+        self.assertEqual(calls, ["lifespan"])
+
+
+if __name__ == '__main__':
+    unittest.main()
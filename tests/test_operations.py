@@ -0,0 +1,153 @@
+import gc
+import unittest
+
+from fountainai_openapi_parser.exceptions import ParsingError
+from fountainai_openapi_parser.operations import OperationIndex, operation_index
+from fountainai_openapi_parser.parser import parse_openapi, parse_openapi_lazy
+
+
+def make_document():
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Character API", "version": "1.0.0"},
+        "servers": [{"url": "https://api.fountain.coach"}],
+        "security": [{"apiKey": []}],
+        "paths": {
+            "/characters": {
+                "get": {
+                    "operationId": "listCharacters",
+                    "tags": ["characters"],
+                    "responses": {"200": {"description": "OK"}},
+                },
+                "post": {
+                    "operationId": "createCharacter",
+                    "tags": ["characters", "admin"],
+                    "security": [],
+                    "responses": {"201": {"description": "Created"}},
+                },
+            },
+            "/characters/{id}": {
+                "servers": [{"url": "https://characters.fountain.coach"}],
+                "parameters": [
+                    {"name": "id", "in": "path", "required": True, "description": "Shared"},
+                    {"name": "verbose", "in": "query"},
+                ],
+                "get": {
+                    "operationId": "getCharacter",
+                    "tags": ["characters"],
+                    "parameters": [
+                        {"name": "id", "in": "path", "required": True, "description": "Own"},
+                        {"name": "id", "in": "header"},
+                    ],
+                    "responses": {"200": {"description": "OK"}},
+                },
+                "delete": {
+                    "operationId": "deleteCharacter",
+                    "responses": {"204": {"description": "Deleted"}},
+                },
+            },
+        },
+    }
+
+
+class TestOperationIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.document = parse_openapi(make_document())
+        self.index = operation_index(self.document)
+
+    def test_lookups(self):
+        entry = self.index.by_id("getCharacter")
+        self.assertEqual((entry.method, entry.path), ("get", "/characters/{id}"))
+        self.assertIs(self.index.get("GET", "/characters/{id}"), entry)
+        self.assertEqual(entry.operation.operationId, "getCharacter")
+        self.assertEqual(entry.pointer, "/paths/~1characters~1{id}/get")
+        self.assertIsNone(self.index.by_id("missing"))
+        self.assertIsNone(self.index.get("put", "/characters"))
+        self.assertEqual([e.operation_id for e in self.index.by_tag("characters")],
+                         ["listCharacters", "createCharacter", "getCharacter"])
+        self.assertEqual(self.index.by_tag("unknown"), [])
+        self.assertEqual(self.index.tags(), ["characters", "admin"])
+        self.assertEqual(len(self.index), 4)
+
+    def test_index_is_cached(self):
+        self.assertIs(operation_index(self.document), self.index)
+        self.assertIs(self.index.document, self.document)
+
+    def test_merged_context(self):
+        entry = self.index.by_id("getCharacter")
+        parameters = [(p.name, p.in_.value, p.description) for p in entry.parameters]
+        self.assertEqual(parameters, [("verbose", "query", None), ("id", "path", "Own"),
+                                      ("id", "header", None)])
+        self.assertEqual([server.url for server in entry.servers],
+                         ["https://characters.fountain.coach"])
+        self.assertEqual(entry.security, [{"apiKey": []}])
+        self.assertEqual([p.name for p in self.index.by_id("deleteCharacter").parameters],
+                         ["id", "verbose"])
+        created = self.index.by_id("createCharacter")
+        self.assertEqual([server.url for server in created.servers],
+                         ["https://api.fountain.coach"])
+        self.assertEqual(created.security, [])
+
+    def test_mutations_are_detected(self):
+        paths = self.document.paths
+        paths["/characters"]["get"] = dict(paths["/characters"]["get"], operationId="renamed")
+        self.assertIsNone(self.index.by_id("listCharacters"))
+        self.assertEqual(self.index.by_id("renamed").path, "/characters")
+        paths["/scenes"] = {"get": {"operationId": "listScenes",
+                                    "responses": {"200": {"description": "OK"}}}}
+        self.assertEqual(self.index.by_id("listScenes").path, "/scenes")
+        self.document.paths = {}
+        self.assertIsNone(self.index.get("get", "/scenes"))
+        self.assertEqual(len(self.index), 0)
+
+    def test_in_place_edits_need_invalidate(self):
+        paths = self.document.paths
+        entry = self.index.by_id("getCharacter")
+        self.assertEqual(len(entry.parameters), 3)
+        paths["/characters"]["put"] = {
+            "operationId": "replaceCharacters", "responses": {"200": {"description": "OK"}}
+        }
+        self.assertIsNone(self.index.by_id("replaceCharacters"))
+        paths["/characters"]["get"]["tags"].append("public")
+        del paths["/characters"]["post"]
+        paths["/characters/{id}"]["parameters"][1]["in"] = "header"
+        paths["/characters/{id}"]["servers"].append({"url": "https://backup.fountain.coach"})
+        self.index.invalidate()
+        self.assertEqual(self.index.by_id("replaceCharacters").method, "put")
+        self.assertEqual([entry.operation_id for entry in self.index.by_tag("public")],
+                         ["listCharacters"])
+        self.assertIsNone(self.index.get("post", "/characters"))
+        self.assertEqual(self.index.by_tag("admin"), [])
+        self.assertEqual(len(self.index), 4)
+        entry = self.index.by_id("getCharacter")
+        self.assertEqual([(parameter.name, parameter.in_.value) for parameter in entry.parameters],
+                         [("verbose", "header"), ("id", "path"), ("id", "header")])
+        self.assertEqual(len(self.index.by_id("deleteCharacter").servers), 2)
+
+    def test_lazy_document(self):
+        document = parse_openapi_lazy(make_document())
+        index = OperationIndex(document)
+        entry = index.by_id("getCharacter")
+        self.assertIs(entry.path_item, document.paths["/characters/{id}"])
+        self.assertIs(entry.operation, document.paths["/characters/{id}"].get)
+
+    def test_invalid_operation_is_reported_on_access(self):
+        content = make_document()
+        content["paths"]["/characters"]["get"]["responses"] = "nope"
+        index = OperationIndex(parse_openapi_lazy(content))
+        entry = index.by_id("listCharacters")
+        with self.assertRaises(ParsingError):
+            entry.operation
+
+    def test_cache_does_not_keep_documents_alive(self):
+        document = parse_openapi(make_document())
+        index = operation_index(document)
+        del document
+        gc.collect()
+        with self.assertRaises(ReferenceError):
+            index.document
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fountainai_openapi_parser import parser
+from fountainai_openapi_parser.exceptions import ParsingError
+from fountainai_openapi_parser.parse_cache import ParseCache
+from fountainai_openapi_parser.parser import load_openapi_from_file
+
+SPEC = """openapi: 3.1.0
+info:
+  title: Character API
+  version: 1.0.0
+paths:
+  /characters:
+    get:
+      responses:
+        '200':
+          description: OK
+          content:
+            application/json:
+              schema:
+                $ref: 'schemas/character.yaml'
+components:
+  schemas:
+    Action:
+      type: object
+"""
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.cache_dir = self.dir / "cache"
+        self.spec = self.dir / "openapi.yaml"
+        self.spec.write_text(SPEC)
+        (self.dir / "schemas").mkdir()
+        self.dependency = self.dir / "schemas" / "character.yaml"
+        self.dependency.write_text("type: object\nproperties:\n  name:\n    $ref: 'name.yaml'\n")
+        self.nested_dependency = self.dir / "schemas" / "name.yaml"
+        self.nested_dependency.write_text("type: string\n")
+
+    def load_counting_validations(self, **kwargs):
+        with mock.patch.object(parser, "parse_openapi", wraps=parser.parse_openapi) as parse:
+            model = load_openapi_from_file(self.spec, cache_dir=self.cache_dir, **kwargs)
+        return model, parse.call_count
+
+    def test_hit_skips_validation(self):
+        first, validations = self.load_counting_validations()
+        self.assertEqual(validations, 1)
+        second, validations = self.load_counting_validations()
+        self.assertEqual(validations, 0)
+        self.assertEqual(second, first)
+        self.assertEqual(second.info.title, "Character API")
+        self.assertEqual(second.components.schemas["Action"].type, "object")
+
+    def test_changed_file_is_a_miss(self):
+        self.load_counting_validations()
+        self.spec.write_text(SPEC.replace("Character API", "Session API"))
+        model, validations = self.load_counting_validations()
+        self.assertEqual(validations, 1)
+        self.assertEqual(model.info.title, "Session API")
+
+    def test_changed_dependency_is_a_miss(self):
+        self.load_counting_validations()
+        for dependency in (self.nested_dependency, self.dependency):
+            dependency.write_text(dependency.read_text() + "description: changed\n")
+            _, validations = self.load_counting_validations()
+            self.assertEqual(validations, 1)
+            _, validations = self.load_counting_validations()
+            self.assertEqual(validations, 0)
+
+    def test_selected_sections_have_their_own_entry(self):
+        self.load_counting_validations()
+        model, validations = self.load_counting_validations(select=["/components"])
+        self.assertEqual(validations, 1)
+        self.assertEqual(model.paths, {})
+
+    def test_corrupt_entry_is_ignored(self):
+        self.load_counting_validations()
+        for path in self.cache_dir.glob("*.model"):
+            path.write_bytes(b"not a pickle")
+        model, validations = self.load_counting_validations()
+        self.assertEqual(validations, 1)
+        self.assertEqual(model.info.title, "Character API")
+
+    def test_invalid_document_is_not_cached(self):
+        self.spec.write_text("openapi: 3.1.0\npaths: {}\n")
+        with self.assertRaises(ParsingError):
+            load_openapi_from_file(self.spec, cache_dir=self.cache_dir)
+        self.assertEqual(list(self.cache_dir.glob("*")) if self.cache_dir.exists() else [], [])
+
+    def test_size_bounded_eviction(self):
+        cache = ParseCache(self.cache_dir, max_bytes=0)
+        cache.put("a" * 64, {}, self.spec, load_openapi_from_file(self.spec))
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+        cache = ParseCache(self.cache_dir)
+        for title in ("One", "Two", "Three"):
+            self.spec.write_text(SPEC.replace("Character API", title))
+            load_openapi_from_file(self.spec, cache_dir=self.cache_dir)
+        files = sorted(self.cache_dir.iterdir(), key=lambda path: path.stat().st_mtime_ns)
+        sizes = sum(path.stat().st_size for path in files)
+        self.assertEqual(len(files), 6)
+        # Keep only the newest entry (a model and its manifest)
+        cache.max_bytes = sum(path.stat().st_size for path in files[-2:])
+        os.utime(files[-1])
+        self.assertEqual(cache.evict(), 4)
+        self.assertLess(sum(path.stat().st_size for path in self.cache_dir.iterdir()), sizes)
+        model, validations = self.load_counting_validations()
+        self.assertEqual((model.info.title, validations), ("Three", 0))
+
+    def test_concurrent_writers(self):
+        errors = []
+
+        def load():
+            try:
+                load_openapi_from_file(self.spec, cache_dir=self.cache_dir)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=load) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(path.suffix for path in self.cache_dir.iterdir()),
+                         [".manifest", ".model"])
+        _, validations = self.load_counting_validations()
+        self.assertEqual(validations, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from fountainai_openapi_parser.exceptions import JsonPointerError, ReferenceResolutionError
+from fountainai_openapi_parser.pointer import (
+    PointerIndex,
+    escape_token,
+    format_pointer,
+    parse_fragment,
+    parse_pointer,
+    resolve_pointer,
+)
+from fountainai_openapi_parser.utils import resolve_references
+
+DOCUMENT = {
+    "paths": {
+        "/pets/{id}": {"get": {"operationId": "getPet"}},
+        "/a~b": {"get": {"operationId": "tilde"}},
+    },
+    "responses": {200: {"description": "OK"}},
+    "tags": [{"name": "pets"}, {"name": "store"}],
+}
+
+
+class TestPointer(unittest.TestCase):
+
+    def test_parse_unescapes_tokens(self):
+        self.assertEqual(parse_pointer(""), ())
+        self.assertEqual(parse_pointer("/paths/~1pets~1{id}/get"), ("paths", "/pets/{id}", "get"))
+        self.assertEqual(parse_pointer("/~01"), ("~1",))
+        self.assertEqual(parse_pointer("/"), ("",))
+
+    def test_parse_is_cached(self):
+        self.assertIs(parse_pointer("/paths/~1pets"), parse_pointer("/paths/~1pets"))
+
+    def test_invalid_pointers(self):
+        for pointer in ("paths", "/a~2", "/a~", "/~~01", "/a~~1"):
+            with self.assertRaises(JsonPointerError):
+                parse_pointer(pointer)
+
+    def test_fragment_is_percent_decoded(self):
+        self.assertEqual(parse_fragment("/paths/~1pets~1%7Bid%7D"), ("paths", "/pets/{id}"))
+
+    def test_format_round_trip(self):
+        tokens = ("paths", "/a~b", 0)
+        self.assertEqual(format_pointer(tokens), "/paths/~1a~0b/0")
+        self.assertEqual(parse_pointer(format_pointer(tokens)), ("paths", "/a~b", "0"))
+        self.assertEqual(escape_token("a/b~c"), "a~1b~0c")
+
+    def test_resolve(self):
+        self.assertEqual(resolve_pointer(DOCUMENT, "/paths/~1a~0b/get/operationId"), "tilde")
+        self.assertEqual(resolve_pointer(DOCUMENT, "/tags/1/name"), "store")
+        self.assertEqual(resolve_pointer(DOCUMENT, "/responses/200/description"), "OK")
+        self.assertIs(resolve_pointer(DOCUMENT, ""), DOCUMENT)
+
+    def test_missing_segment_raises(self):
+        with self.assertRaises(JsonPointerError) as context:
+            resolve_pointer(DOCUMENT, "/paths/~1pets~1{id}/post")
+        self.assertIn("'post' not found at /paths/~1pets~1{id}", context.exception.message)
+        self.assertEqual(context.exception.pointer, "/paths/~1pets~1{id}/post")
+        for pointer in ("/tags/2", "/tags/01", "/tags/-", "/tags/0/name/x"):
+            with self.assertRaises(JsonPointerError):
+                resolve_pointer(DOCUMENT, pointer)
+        # Only ASCII digits are indices: str.isdigit() also accepts '²', which int() rejects
+        for document in ([1, 2], {"a": 1}, {2: "two"}):
+            with self.assertRaises(JsonPointerError):
+                resolve_pointer(document, "/²")
+
+    def test_index_memoizes_prefixes(self):
+        index = PointerIndex(DOCUMENT)
+        self.assertEqual(index.resolve("/paths/~1pets~1{id}/get/operationId"), "getPet")
+        walked = len(index)
+        self.assertEqual(index.resolve_fragment("/paths/~1pets~1%7Bid%7D/get"),
+                         {"operationId": "getPet"})
+        self.assertEqual(len(index), walked)
+        with self.assertRaises(JsonPointerError):
+            index.resolve("/paths/~1pets~1{id}/put")
+
+    def test_resolver_uses_escaped_pointers(self):
+        document = dict(DOCUMENT, op={"$ref": "#/paths/~1pets~1%7Bid%7D/get"})
+        self.assertEqual(resolve_references(document)["op"], {"operationId": "getPet"})
+
+    def test_resolver_reports_missing_segment(self):
+        document = {"components": {"schemas": {}}, "op": {"$ref": "#/components/schemas/Pet"}}
+        with self.assertRaises(ReferenceResolutionError) as context:
+            resolve_references(document)
+        self.assertIn("at /op", context.exception.message)
+        self.assertIn("'Pet' not found at /components/schemas", context.exception.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
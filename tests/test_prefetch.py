@@ -0,0 +1,82 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from fountainai_openapi_parser.cache import DocumentCache
+from fountainai_openapi_parser.exceptions import ReferenceResolutionError
+from fountainai_openapi_parser.source import Source
+from fountainai_openapi_parser.utils import prefetch_documents, resolve_references
+
+
+class TestPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        (self.dir / "schemas").mkdir()
+        for i in range(8):
+            # Each schema file refers to a shared file next to it
+            (self.dir / "schemas" / f"s{i}.yaml").write_text(
+                f"type: object\nproperties:\n  common:\n    $ref: 'common.yaml#/Common{i % 2}'\n"
+            )
+        (self.dir / "schemas" / "common.yaml").write_text(
+            "Common0:\n  type: string\nCommon1:\n  type: integer\n"
+        )
+        self.base_path = self.dir / "openapi.yaml"
+        self.document = {
+            "components": {
+                "schemas": {f"S{i}": {"$ref": f"schemas/s{i}.yaml"} for i in range(8)}
+            }
+        }
+
+    def test_discovers_nested_documents(self):
+        cache = DocumentCache()
+        loaded = prefetch_documents(self.document, self.base_path, cache, max_workers=4)
+        self.assertEqual(len(loaded), 9)
+        self.assertIn(self.dir / "schemas" / "common.yaml", loaded)
+        self.assertEqual(cache.misses, 9)
+
+    def test_resolution_runs_against_warmed_cache(self):
+        cache = DocumentCache()
+        resolved = resolve_references(self.document, self.base_path, cache=cache)
+        self.assertEqual(resolved["components"]["schemas"]["S3"]["properties"]["common"],
+                         {"type": "integer"})
+        # Everything was loaded by the prefetch phase; the walk itself only hit the cache
+        self.assertEqual(cache.misses, 9)
+
+    def test_documents_load_concurrently(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_loader(path):
+            with lock:
+                active.append(path)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(path)
+            return Source.from_path(path).load()
+
+        cache = DocumentCache(loader=slow_loader)
+        prefetch_documents(self.document, self.base_path, cache, max_workers=4)
+        self.assertEqual(max(peak), 4)
+
+    def test_no_threads_without_external_references(self):
+        before = threading.active_count()
+        self.assertEqual(prefetch_documents({"a": {"$ref": "#/b"}, "b": {}}), [])
+        self.assertEqual(threading.active_count(), before)
+
+    def test_missing_document_is_reported_by_resolution(self):
+        document = {"a": {"$ref": "schemas/missing.yaml"}}
+        self.assertEqual(prefetch_documents(document, self.base_path, DocumentCache()), [])
+        with self.assertRaises(ReferenceResolutionError) as error:
+            resolve_references(document, self.base_path)
+        self.assertIn("at /a", error.exception.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
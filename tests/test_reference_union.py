@@ -0,0 +1,119 @@
+import unittest
+
+from pydantic import ValidationError
+
+from fountainai_openapi_parser.models import (
+    Components,
+    Encoding,
+    Header,
+    Link,
+    MediaType,
+    Operation,
+    Parameter,
+    PathItem,
+    Reference,
+    RequestBody,
+    Response,
+    Schema,
+)
+
+
+def ref(name):
+    return {"$ref": f"#/components/{name}"}
+
+
+class TestReferenceUnion(unittest.TestCase):
+
+    def test_components(self):
+        components = Components.model_validate({
+            "schemas": {"Ref": ref("schemas/A"), "Inline": {"type": "string"}},
+            "responses": {"Ref": ref("responses/A"), "Inline": {"description": "OK"}},
+            "parameters": {"Ref": ref("parameters/A"),
+                           "Inline": {"name": "id", "in": "path", "required": True}},
+            "requestBodies": {"Ref": ref("requestBodies/A"), "Inline": {"content": {}}},
+            "headers": {"Ref": ref("headers/A"), "Inline": {"required": True}},
+            "links": {"Ref": ref("links/A"), "Inline": {"operationId": "getA"}},
+            "pathItems": {"Ref": ref("pathItems/A"), "Inline": {"summary": "A"}},
+        })
+        for name, model in (("schemas", Schema), ("responses", Response),
+                            ("parameters", Parameter), ("requestBodies", RequestBody),
+                            ("headers", Header), ("links", Link), ("pathItems", PathItem)):
+            with self.subTest(section=name):
+                section = getattr(components, name)
+                self.assertIsInstance(section["Ref"], Reference)
+                self.assertIsInstance(section["Inline"], model)
+
+    def test_operation(self):
+        operation = Operation.model_validate({
+            "parameters": [ref("parameters/A"), {"name": "q", "in": "query"}],
+            "requestBody": ref("requestBodies/A"),
+            "responses": {
+                "200": {"description": "OK", "headers": {"X-Rate": ref("headers/A")},
+                        "links": {"next": ref("links/A")},
+                        "content": {"multipart/form-data": MediaType.model_validate({
+                            "schema": ref("schemas/A"),
+                            "examples": {"a": ref("examples/A")},
+                            "encoding": {"file": {"headers": {"X-Size": ref("headers/B")}}},
+                        })}},
+                "404": ref("responses/NotFound"),
+            },
+            "callbacks": {"onEvent": {"{$request.body#/url}": ref("pathItems/A")},
+                          "onOther": ref("callbacks/A")},
+        })
+        self.assertIsInstance(operation.parameters[0], Reference)
+        self.assertIsInstance(operation.parameters[1], Parameter)
+        self.assertIsInstance(operation.requestBody, Reference)
+        self.assertIsInstance(operation.responses["404"], Reference)
+        response = operation.responses["200"]
+        self.assertIsInstance(response.headers["X-Rate"], Reference)
+        self.assertIsInstance(response.links["next"], Reference)
+        media_type = response.content["multipart/form-data"]
+        self.assertIsInstance(media_type.schema_data, Reference)
+        self.assertIsInstance(media_type.examples["a"], Reference)
+        self.assertIsInstance(media_type.encoding["file"], Encoding)
+        self.assertIsInstance(media_type.encoding["file"].headers["X-Size"], Reference)
+        self.assertIsInstance(operation.callbacks["onEvent"].root["{$request.body#/url}"],
+                              Reference)
+        self.assertIsInstance(operation.callbacks["onOther"], Reference)
+
+    def test_ref_with_other_keywords(self):
+        components = Components.model_validate({
+            "schemas": {
+                "Described": {"$ref": "#/components/schemas/A", "description": "An A"},
+                "Narrowed": {"$ref": "#/components/schemas/A", "maxLength": 3},
+            },
+            "pathItems": {"Extended": {"$ref": "#/components/pathItems/A",
+                                       "get": {"responses": {}}}},
+            "responses": {"Described": {"$ref": "#/components/responses/A", "content": {}}},
+        })
+        self.assertIsInstance(components.schemas["Described"], Reference)
+        self.assertEqual(components.schemas["Described"].description, "An A")
+        # Schema and PathItem keep the keywords next to their $ref
+        self.assertIsInstance(components.schemas["Narrowed"], Schema)
+        self.assertEqual(components.schemas["Narrowed"].maxLength, 3)
+        self.assertIsInstance(components.pathItems["Extended"], PathItem)
+        # Anything else with a $ref is a Reference
+        self.assertIsInstance(components.responses["Described"], Reference)
+
+    def test_models_are_accepted(self):
+        schema = Schema(type="string")
+        reference = Reference.model_validate(ref("schemas/A"))
+        components = Components(schemas={"A": schema, "B": reference})
+        self.assertIs(components.schemas["A"], schema)
+        self.assertIs(components.schemas["B"], reference)
+
+    def test_errors_name_one_member(self):
+        with self.assertRaises(ValidationError) as raised:
+            Components.model_validate({
+                "responses": {"Inline": {"content": {}}, "Ref": {"$ref": 3}},
+                "schemas": {"Bad": 3},
+            })
+        self.assertEqual(sorted(error["loc"] for error in raised.exception.errors()), [
+            ("responses", "Inline", "Response", "description"),
+            ("responses", "Ref", "Reference", "$ref"),
+            ("schemas", "Bad", "Schema"),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
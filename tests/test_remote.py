@@ -0,0 +1,188 @@
+import hashlib
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from fountainai_openapi_parser.cache import DocumentCache
+from fountainai_openapi_parser.exceptions import ReferenceResolutionError
+from fountainai_openapi_parser.remote import HttpFetcher, is_url
+from fountainai_openapi_parser.utils import resolve_references
+
+DOCUMENTS = {
+    "/common.yaml": (
+        b"Character:\n  type: object\n  properties:\n    name:\n      $ref: 'types.json#/Name'\n"
+    ),
+    "/types.json": b'{"Name": {"type": "string"}}',
+}
+
+
+class RevalidatingHandler(BaseHTTPRequestHandler):
+    # Serves DOCUMENTS with an ETag (or only Last-Modified for .json) and counts requests
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    hits = []
+    conditional = []
+    in_flight = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        with self.lock:
+            self.hits.append(self.path)
+            self.in_flight.append(self.path)
+            self.peak[0] = max(self.peak[0], len(self.in_flight))
+        try:
+            time.sleep(self.delay)
+            body = DOCUMENTS.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+            last_modified = "Mon, 01 Jan 2024 00:00:00 GMT"
+            use_etag = not self.path.endswith(".json")
+            if (use_etag and self.headers.get("If-None-Match") == etag) or (
+                not use_etag and self.headers.get("If-Modified-Since") == last_modified
+            ):
+                self.conditional.append(self.path)
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            if use_etag:
+                self.send_header("ETag", etag)
+            else:
+                self.send_header("Last-Modified", last_modified)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with self.lock:
+                self.in_flight.remove(self.path)
+
+
+class TestRemoteReferences(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), RevalidatingHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        RevalidatingHandler.hits.clear()
+        RevalidatingHandler.conditional.clear()
+        RevalidatingHandler.peak[0] = 0
+        RevalidatingHandler.delay = 0.0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def fetcher(self, **kwargs):
+        fetcher = HttpFetcher(**kwargs)
+        self.addCleanup(fetcher.close)
+        return fetcher
+
+    def test_is_url(self):
+        self.assertTrue(is_url("https://example.com/a.yaml"))
+        self.assertFalse(is_url("common.yaml"))
+
+    def test_resolves_remote_and_relative_references(self):
+        document = {"schema": {"$ref": f"{self.base}/common.yaml#/Character"}}
+        cache = DocumentCache(http=self.fetcher())
+        resolved = resolve_references(document, cache=cache)
+        self.assertEqual(resolved["schema"]["properties"]["name"], {"type": "string"})
+        self.assertEqual(sorted(RevalidatingHandler.hits), ["/common.yaml", "/types.json"])
+
+    def test_url_base_path(self):
+        document = {"schema": {"$ref": "types.json#/Name"}}
+        cache = DocumentCache(http=self.fetcher())
+        resolved = resolve_references(document, f"{self.base}/openapi.yaml", cache=cache)
+        self.assertEqual(resolved["schema"], {"type": "string"})
+
+    def test_revalidation_with_etag_and_last_modified(self):
+        fetcher = self.fetcher()
+        first = fetcher.load(f"{self.base}/common.yaml")
+        self.assertIs(fetcher.load(f"{self.base}/common.yaml"), first)
+        fetcher.load(f"{self.base}/types.json")
+        fetcher.load(f"{self.base}/types.json")
+        self.assertEqual(RevalidatingHandler.conditional, ["/common.yaml", "/types.json"])
+        self.assertEqual(fetcher.revalidated, 2)
+
+    def test_memory_is_bounded(self):
+        fetcher = self.fetcher(max_entries=1)
+        common = fetcher.load(f"{self.base}/common.yaml")
+        fetcher.load(f"{self.base}/types.json")
+        fetcher.load(f"{self.base}/types.json")
+        self.assertEqual(list(fetcher._memory), [f"{self.base}/types.json"])
+        # The evicted response is downloaded again, without validators
+        self.assertEqual(fetcher.load(f"{self.base}/common.yaml"), common)
+        self.assertEqual(RevalidatingHandler.conditional, ["/types.json"])
+        self.assertEqual(list(fetcher._memory), [f"{self.base}/common.yaml"])
+
+    def test_document_cache_revalidates_after_ttl(self):
+        url = f"{self.base}/common.yaml"
+        cache = DocumentCache(http=self.fetcher())
+        document = cache.get(url)
+        self.assertIs(cache.get(url), document)
+        self.assertEqual(RevalidatingHandler.hits, ["/common.yaml"])
+        cache.url_ttl = 0
+        self.assertIs(cache.get(url), document)
+        self.assertEqual(RevalidatingHandler.conditional, ["/common.yaml"])
+
+    def test_disk_cache_survives_new_fetcher(self):
+        url = f"{self.base}/common.yaml"
+        self.fetcher(cache_dir=self.tmp.name).fetch(url)
+        fetcher = self.fetcher(cache_dir=self.tmp.name)
+        self.assertEqual(fetcher.fetch(url), DOCUMENTS["/common.yaml"])
+        self.assertEqual(RevalidatingHandler.conditional, ["/common.yaml"])
+        self.assertEqual(fetcher.revalidated, 1)
+
+    def test_unwritable_disk_cache(self):
+        blocker = Path(self.tmp.name) / "file"
+        blocker.write_text("")
+        fetcher = self.fetcher(cache_dir=blocker / "cache")
+        with self.assertLogs("fountainai_openapi_parser.remote", "WARNING"):
+            body = fetcher.fetch(f"{self.base}/common.yaml")
+        self.assertEqual(body, DOCUMENTS["/common.yaml"])
+
+    def test_concurrency_limit(self):
+        RevalidatingHandler.delay = 0.05
+        fetcher = self.fetcher(max_concurrency=2)
+        threads = [
+            threading.Thread(target=fetcher.fetch, args=(f"{self.base}/types.json",))
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(RevalidatingHandler.peak[0], 2)
+        self.assertEqual(fetcher.requests, 6)
+
+    def test_timeout_and_errors_are_reported(self):
+        RevalidatingHandler.delay = 0.5
+        cache = DocumentCache(http=self.fetcher(timeout=0.1))
+        with self.assertRaises(ReferenceResolutionError) as error:
+            resolve_references({"a": {"$ref": f"{self.base}/types.json#/Name"}}, cache=cache)
+        self.assertIn("at /a", error.exception.message)
+        RevalidatingHandler.delay = 0.0
+        with self.assertRaises(ReferenceResolutionError) as error:
+            resolve_references({"b": {"$ref": f"{self.base}/missing.yaml"}}, cache=cache)
+        self.assertIn("404", error.exception.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+from fountainai_openapi_parser.parser import parse_openapi, parse_openapi_lazy
+from fountainai_openapi_parser.router import Router
+
+OK = {"responses": {"200": {"description": "OK"}}}
+
+
+def make_document(*templates):
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Character API", "version": "1.0.0"},
+        "paths": {
+            template: {"get": dict(OK, operationId=f"get {template}")} for template in templates
+        },
+    }
+
+
+class TestRouter(unittest.TestCase):
+
+    def setUp(self):
+        document = make_document(
+            "/",
+            "/characters",
+            "/characters/me",
+            "/characters/{id}",
+            "/characters/{id}/actions",
+            "/characters/{characterId}/actions/{actionId}",
+            "/characters/me/settings/{name}",
+            "/files/{name}.{ext}",
+        )
+        document["paths"]["/characters/{id}"]["delete"] = OK
+        self.router = Router(parse_openapi(document))
+
+    def template(self, path, method="get"):
+        match = self.router.match(method, path)
+        return match.template if match is not None else None
+
+    def test_literal_segments_win(self):
+        self.assertEqual(self.template("/characters/me"), "/characters/me")
+        self.assertEqual(self.template("/characters/42"), "/characters/{id}")
+        self.assertEqual(self.template("/characters"), "/characters")
+        self.assertEqual(self.template("/"), "/")
+
+    def test_backtracks_to_templated_segments(self):
+        # '/characters/me' exists, but has no 'actions' below it
+        match = self.router.match("GET", "/characters/me/actions")
+        self.assertEqual(match.template, "/characters/{id}/actions")
+        self.assertEqual(match.path_params, {"id": "me"})
+        match = self.router.match("get", "/characters/7/actions/3")
+        self.assertEqual(match.path_params, {"characterId": "7", "actionId": "3"})
+        self.assertEqual(self.router.match("get", "/characters/me/settings/theme").path_params,
+                         {"name": "theme"})
+
+    def test_parameters(self):
+        match = self.router.match("get", "/files/report.final.pdf?download=1")
+        self.assertEqual(match.template, "/files/{name}.{ext}")
+        self.assertEqual(match.path_params, {"name": "report", "ext": "final.pdf"})
+        self.assertEqual(self.router.match("get", "/characters/a%2Fb").path_params,
+                         {"id": "a/b"})
+        self.assertEqual(self.router.match("get", "/characters/a%41?b", decoded=True).path_params,
+                         {"id": "a%41?b"})
+        self.assertEqual(self.router.allowed_methods("/characters/a?b", decoded=True),
+                         ["get", "delete"])
+        self.assertEqual(match.operation.operationId, "get /files/{name}.{ext}")
+
+    def test_no_match(self):
+        self.assertIsNone(self.template("/characters/"))
+        self.assertIsNone(self.template("/characters//actions"))
+        self.assertIsNone(self.template("/scenes"))
+        self.assertIsNone(self.template("/files/report"))
+        self.assertIsNone(self.template("characters"))
+        self.assertIsNone(self.template("/characters", "post"))
+
+    def test_allowed_methods(self):
+        self.assertEqual(self.router.allowed_methods("/characters/42"), ["get", "delete"])
+        self.assertEqual(self.router.allowed_methods("/scenes"), [])
+
+    def test_base_path(self):
+        router = Router(parse_openapi_lazy(make_document("/characters/{id}")), base_path="/v1/")
+        self.assertEqual(router.match("get", "/v1/characters/3").path_params, {"id": "3"})
+        self.assertIsNone(router.match("get", "/characters/3"))
+        self.assertIsNone(router.match("get", "/v10/characters/3"))
+        self.assertEqual(len(router), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
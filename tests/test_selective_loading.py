@@ -0,0 +1,100 @@
+import unittest
+from pathlib import Path
+
+import yaml
+
+from fountainai_openapi_parser.loader import load_selected, split_selector
+from fountainai_openapi_parser.parser import load_openapi_from_file, OpenAPI
+from fountainai_openapi_parser.exceptions import ParsingError
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+class TestSelectiveLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.spec_path = DATA_DIR / "selective_openapi.yaml"
+        self.yaml_content = self.spec_path.read_text()
+
+    def test_split_selector_unescapes_tokens(self):
+        self.assertEqual(split_selector("/paths/~1pets~1{id}/get"), ("paths", "/pets/{id}", "get"))
+        self.assertEqual(split_selector("/a~0b"), ("a~b",))
+        self.assertEqual(split_selector(""), ())
+        with self.assertRaises(ValueError):
+            split_selector("paths")
+
+    def test_selected_subtree_matches_full_load(self):
+        full = yaml.safe_load(self.yaml_content)
+        selected = load_selected(self.yaml_content, ["/components/schemas/Character"])
+        self.assertEqual(
+            selected,
+            {"components": {"schemas": {"Character": full["components"]["schemas"]["Character"]}}},
+        )
+
+    def test_prefix_selector(self):
+        selected = load_selected(self.yaml_content, ["/paths/~1characters*"])
+        self.assertEqual(sorted(selected["paths"]), ["/characters", "/characters/{id}"])
+
+    def test_alias_into_skipped_section_resolves(self):
+        selected = load_selected(self.yaml_content, ["/paths/~1characters/get/responses"])
+        responses = selected["paths"]["/characters"]["get"]["responses"]
+        self.assertEqual(responses["default"], {"description": "Unexpected error"})
+
+    def test_scalar_keys_are_constructed(self):
+        selected = load_selected(self.yaml_content, ["/paths/~1characters~1{id}/get/responses/200"])
+        self.assertIn(200, selected["paths"]["/characters/{id}"]["get"]["responses"])
+
+    def test_merge_keys_in_partly_selected_mappings(self):
+        content = (
+            "base: &base\n  description: OK\n  content: {a: 1, b: 2}\n"
+            "other: &other\n  description: Other\n  headers: {X: 1}\n"
+            "responses:\n"
+            "  '200':\n    <<: [*base, *other]\n    description: Overridden\n"
+            "  '404':\n    <<: *other\n"
+        )
+        full = yaml.safe_load(content)["responses"]
+        for selector, expected in (
+            ("/responses/200/content/b", {"200": {"content": {"b": 2}}}),
+            ("/responses/200/description", {"200": {"description": "Overridden"}}),
+            ("/responses/200/headers", {"200": {"headers": {"X": 1}}}),
+            ("/responses/404/description", {"404": {"description": "Other"}}),
+            ("/responses/*/*", full),
+        ):
+            with self.subTest(selector=selector):
+                selected = load_selected(content, [selector])["responses"]
+                self.assertEqual(selected, expected)
+                for code, response in selected.items():
+                    self.assertEqual(list(response), [key for key in full[code] if key in response])
+        with self.assertRaises(yaml.YAMLError):
+            load_selected("a:\n  <<: 3\n  b: 1\n", ["/a/b"])
+
+    def test_sequence_selection(self):
+        selected = load_selected("servers:\n  - url: a\n  - url: b\n", ["/servers/1"])
+        self.assertEqual(selected, {"servers": [{"url": "b"}]})
+
+    def test_nothing_selected(self):
+        self.assertIsNone(load_selected(self.yaml_content, ["/webhooks"]))
+
+    def test_load_openapi_from_file_with_select(self):
+        parsed = load_openapi_from_file(
+            str(self.spec_path),
+            select=["/paths/~1actions", "/components/schemas/Action"],
+        )
+        self.assertIsInstance(parsed, OpenAPI)
+        self.assertEqual(parsed.info.title, "Character Service")
+        self.assertEqual(list(parsed.paths), ["/actions"])
+        self.assertEqual(list(parsed.components.schemas), ["Action"])
+
+    def test_select_without_paths_yields_empty_paths(self):
+        parsed = load_openapi_from_file(
+            str(self.spec_path), select=["/components/schemas/Character"]
+        )
+        self.assertEqual(parsed.paths, {})
+
+    def test_invalid_selector_raises_parsing_error(self):
+        with self.assertRaises(ParsingError):
+            load_openapi_from_file(str(self.spec_path), select=["components"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from fountainai_openapi_parser.parser import parse_openapi, OpenAPI
+from fountainai_openapi_parser.exceptions import ParsingError
+
+
+class TestSinglePassParsing(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_openapi = {
+            "openapi": "3.1.0",
+            "info": {"title": "Character Service", "version": "1.0.0"},
+            "paths": {
+                "/characters": {
+                    "get": {
+                        "operationId": "listCharacters",
+                        "responses": {"200": {"description": "A list of characters"}},
+                    }
+                }
+            },
+            "components": {
+                "schemas": {
+                    "Character": {
+                        "type": "object",
+                        "properties": {"name": {"type": "string"}},
+                    }
+                }
+            },
+        }
+
+    def test_single_pass_returns_openapi(self):
+        parsed = parse_openapi(self.valid_openapi)
+        self.assertIsInstance(parsed, OpenAPI)
+        self.assertEqual(parsed.openapi, "3.1.0")
+        self.assertEqual(parsed.info.title, "Character Service")
+        self.assertEqual(
+            parsed.paths["/characters"]["get"]["operationId"], "listCharacters"
+        )
+        self.assertEqual(parsed.components.schemas["Character"].type, "object")
+
+    def test_modes_agree_on_valid_document(self):
+        single = parse_openapi(self.valid_openapi)
+        legacy = parse_openapi(self.valid_openapi, single_pass=False)
+        self.assertEqual(single.info, legacy.info)
+        self.assertEqual(single.components, legacy.components)
+        self.assertEqual(set(single.paths), set(legacy.paths))
+
+    def test_invalid_path_item_raises_in_both_modes(self):
+        # Operations must declare their responses
+        self.valid_openapi["paths"]["/characters"]["get"].pop("responses")
+        for single_pass in (True, False):
+            with self.subTest(single_pass=single_pass):
+                with self.assertRaises(ParsingError):
+                    parse_openapi(self.valid_openapi, single_pass=single_pass)
+
+    def test_invalid_info_raises_in_both_modes(self):
+        self.valid_openapi["info"] = "Invalid structure"
+        for single_pass in (True, False):
+            with self.subTest(single_pass=single_pass):
+                with self.assertRaises(ParsingError):
+                    parse_openapi(self.valid_openapi, single_pass=single_pass)
+
+    def test_non_dict_paths_raises(self):
+        self.valid_openapi["paths"] = "invalid_content"
+        with self.assertRaises(ParsingError):
+            parse_openapi(self.valid_openapi)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import io
+import tempfile
+import threading
+import unittest
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+from unittest import mock
+
+from fountainai_openapi_parser.parser import load_openapi_from_source
+from fountainai_openapi_parser.source import Source
+from fountainai_openapi_parser.utils import load_file
+
+YAML_DOCUMENT = "openapi: 3.1.0\ninfo:\n  title: Story Factory API\n  version: 1.0.0\npaths: {}\n"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestSource(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "openapi.yaml"
+        self.path.write_text(YAML_DOCUMENT, encoding="utf-8")
+
+    def test_explicit_constructors(self):
+        sources = [
+            Source.from_path(self.path),
+            Source.from_path(str(self.path)),
+            Source.from_text(YAML_DOCUMENT),
+            Source.from_bytes(YAML_DOCUMENT.encode("utf-16")),
+            Source.from_bytes(memoryview(YAML_DOCUMENT.encode("utf-8"))),
+            Source.from_file(io.BytesIO(YAML_DOCUMENT.encode("utf-8"))),
+            Source.from_file(io.StringIO(YAML_DOCUMENT)),
+        ]
+        for source in sources:
+            with self.subTest(source=source):
+                self.assertEqual(source.load()["info"]["title"], "Story Factory API")
+
+    def test_read_text(self):
+        self.assertEqual(Source.from_path(self.path).read_text(), YAML_DOCUMENT)
+        data = YAML_DOCUMENT.encode("utf-8-sig")
+        self.assertEqual(Source.from_bytes(data).read_text(), YAML_DOCUMENT)
+
+    def test_iter_chunks(self):
+        for source in (
+            Source.from_path(self.path),
+            Source.from_bytes(YAML_DOCUMENT.encode("utf-8")),
+            Source.from_file(io.BytesIO(YAML_DOCUMENT.encode("utf-8"))),
+        ):
+            with self.subTest(source=source):
+                chunks = list(source.iter_chunks(chunk_size=16))
+                self.assertTrue(all(len(chunk) <= 16 for chunk in chunks))
+                self.assertEqual(b"".join(chunks).decode("utf-8"), YAML_DOCUMENT)
+        text_chunks = list(Source.from_text(YAML_DOCUMENT).iter_chunks(chunk_size=16))
+        self.assertEqual("".join(text_chunks), YAML_DOCUMENT)
+
+    def test_url_source(self):
+        handler = partial(QuietHandler, directory=self.tmp.name)
+        server = HTTPServer(("127.0.0.1", 0), handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_port}/openapi.yaml"
+        parsed = load_openapi_from_source(Source.from_url(url))
+        self.assertEqual(parsed.info.title, "Story Factory API")
+
+    def test_guess_skips_stat_for_content(self):
+        long_line = "description: " + "x" * 10000
+        with mock.patch.object(Path, "exists") as exists:
+            self.assertEqual(Source.guess(YAML_DOCUMENT).kind, Source.TEXT)
+            self.assertEqual(Source.guess(long_line).kind, Source.TEXT)
+        exists.assert_not_called()
+        self.assertEqual(Source.guess(str(self.path)).kind, Source.PATH)
+        self.assertEqual(Source.guess("missing.yaml").kind, Source.TEXT)
+
+    def test_load_file_wrapper(self):
+        long_content = "a: " + "x" * 10000
+        self.assertEqual(load_file(long_content), long_content)
+        self.assertEqual(load_file(self.path), YAML_DOCUMENT)
+        self.assertEqual(load_file(str(self.path)), YAML_DOCUMENT)
+        with self.assertRaises(FileNotFoundError):
+            load_file(Path(self.tmp.name) / "missing.yaml")
+
+    def test_load_openapi_from_source_with_select(self):
+        parsed = load_openapi_from_source(Source.from_path(self.path), select=["/paths"])
+        self.assertEqual(parsed.info.version, "1.0.0")
+
+
+if __name__ == '__main__':
+    unittest.main()
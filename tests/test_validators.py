@@ -0,0 +1,205 @@
+import unittest
+
+import jsonschema
+
+from fountainai_openapi_parser.exceptions import (
+    ParsingError,
+    ReferenceResolutionError,
+    ValidationError,
+)
+from fountainai_openapi_parser.models import Schema
+from fountainai_openapi_parser.operations import operation_index
+from fountainai_openapi_parser.parser import parse_openapi
+from fountainai_openapi_parser.validators import SchemaCompiler, compile_schema
+
+# (schema, valid instances, invalid instances)
+CASES = [
+    ({"type": "string"}, ["", "a"], [1, None, True, []]),
+    ({"type": "integer"}, [1, -3, 2.0], [1.5, "1", True]),
+    ({"type": "number"}, [1, 1.5], ["1", False, None]),
+    ({"type": ["string", "null"]}, ["a", None], [0]),
+    ({"type": "string", "nullable": True}, ["a", None], [0]),
+    ({"enum": ["draft", "active"]}, ["draft"], ["other", 1, None]),
+    ({"enum": [1, None, [1]]}, [1, 1.0, None, [1]], [True, "1", [2]]),
+    ({"const": False}, [False], [0, None]),
+    ({"minimum": 0, "maximum": 10}, [0, 10, "x"], [-1, 10.5]),
+    ({"exclusiveMinimum": 0, "exclusiveMaximum": 10}, [1, 9.9], [0, 10]),
+    ({"minimum": 0, "exclusiveMinimum": True}, [0.1], [0]),
+    ({"multipleOf": 0.5}, [1, 1.5], [1.2]),
+    ({"minLength": 2, "maxLength": 3, "pattern": "^a"}, ["ab", "abc", 5], ["a", "abcd", "ba"]),
+    ({"type": "array", "items": {"type": "integer"}, "minItems": 1, "maxItems": 2},
+     [[1], [1, 2]], [[], [1, 2, 3], ["a"]]),
+    ({"prefixItems": [{"type": "string"}], "items": {"type": "integer"}},
+     [["a"], ["a", 1]], [[1], ["a", "b"]]),
+    ({"uniqueItems": True}, [[1, 2], [{"a": 1}, {"a": 2}], [1, True]],
+     [[1, 1], [{"a": 1}, {"a": 1}], [1, 1.0]]),
+    ({"contains": {"type": "string"}, "maxContains": 1}, [["a", 1]], [[1], ["a", "b"]]),
+    ({"type": "object", "required": ["id"],
+      "properties": {"id": {"type": "integer"}, "name": {"type": "string"}}},
+     [{"id": 1}, {"id": 1, "name": "Ann", "other": None}],
+     [{}, {"id": "1"}, {"id": 1, "name": 2}, []]),
+    ({"properties": {"id": {}}, "additionalProperties": False}, [{"id": 1}], [{"x": 1}]),
+    ({"additionalProperties": {"type": "string"}, "patternProperties": {"^x-": {}}},
+     [{"a": "b", "x-n": 1}], [{"a": 1}]),
+    ({"minProperties": 1, "maxProperties": 1, "propertyNames": {"maxLength": 2}},
+     [{"ab": 1}], [{}, {"a": 1, "b": 2}, {"abc": 1}]),
+    ({"dependentRequired": {"a": ["b"]}}, [{"a": 1, "b": 2}, {"b": 1}], [{"a": 1}]),
+    ({"allOf": [{"type": "integer"}, {"minimum": 2}]}, [2], [1, "a"]),
+    ({"anyOf": [{"type": "integer"}, {"type": "string"}]}, [1, "a"], [None]),
+    ({"oneOf": [{"type": "integer"}, {"minimum": 2}]}, [1, 2.5, "a"], [3]),
+    ({"not": {"type": "string"}}, [1], ["a"]),
+    ({"if": {"type": "integer"}, "then": {"minimum": 1}, "else": {"type": "string"}},
+     [1, "a"], [0, None]),
+    (True, [1, None], []),
+    (False, [], [1, None]),
+]
+
+
+class TestCompiledSchemas(unittest.TestCase):
+
+    def test_agrees_with_jsonschema(self):
+        for schema, valid, invalid in CASES:
+            validator = compile_schema(schema)
+            reference = jsonschema.Draft202012Validator(
+                {key: value for key, value in schema.items() if key != "nullable"}
+                if isinstance(schema, dict) else schema
+            )
+            cases = [(instance, True) for instance in valid]
+            cases += [(instance, False) for instance in invalid]
+            for instance, expected in cases:
+                with self.subTest(schema=schema, instance=instance):
+                    self.assertEqual(validator.is_valid(instance), expected)
+                    if "nullable" not in str(schema) and "exclusiveMinimum': True" not in str(
+                            schema):
+                        self.assertEqual(reference.is_valid(instance), expected)
+
+    def test_error_messages(self):
+        validator = compile_schema({
+            "type": "object",
+            "required": ["id"],
+            "properties": {"tags": {"type": "array", "items": {"type": "string"}}},
+        })
+        self.assertEqual(validator.errors({"tags": ["a", 2]}), [
+            "'id' is a required property",
+            "2 is not of type 'string' at /tags/1",
+        ])
+        with self.assertRaises(ValidationError) as error:
+            validator.validate([])
+        self.assertIn("is not of type 'object'", error.exception.message)
+
+    def test_models_and_references(self):
+        document = {
+            "components": {
+                "schemas": {
+                    "Node": {
+                        "type": "object",
+                        "properties": {
+                            "value": {"type": "integer"},
+                            "children": {"type": "array",
+                                         "items": {"$ref": "#/components/schemas/Node"}},
+                        },
+                    }
+                }
+            }
+        }
+        for source in (document, {"components": {"schemas": {
+                "Node": Schema.model_validate(document["components"]["schemas"]["Node"])}}}):
+            with self.subTest(model=source is not document):
+                validator = SchemaCompiler(source).compile({"$ref": "#/components/schemas/Node"})
+                self.assertTrue(validator.is_valid({"value": 1, "children": [{"value": 2}]}))
+                self.assertEqual(validator.errors({"children": [{"children": [{"value": "x"}]}]}),
+                                 ["'x' is not of type 'integer' at /children/0/children/0/value"])
+
+    def test_invalid_schemas(self):
+        with self.assertRaises(ParsingError):
+            compile_schema({"type": "text"})
+        with self.assertRaises(ParsingError):
+            compile_schema({"pattern": "("})
+        with self.assertRaises(ReferenceResolutionError):
+            compile_schema({"$ref": "other.yaml#/Node"}, {})
+        with self.assertRaises(ReferenceResolutionError):
+            compile_schema({"$ref": "#/components/schemas/Missing"}, {"components": {}})
+
+
+class TestOperationValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.document = parse_openapi({
+            "openapi": "3.1.0",
+            "info": {"title": "Character API", "version": "1.0.0"},
+            "paths": {
+                "/characters/{id}": {
+                    "parameters": [{"$ref": "#/components/parameters/Id"}],
+                    "put": {
+                        "operationId": "updateCharacter",
+                        "parameters": [
+                            {"name": "tags", "in": "query", "schema": {
+                                "type": "array", "items": {"type": "integer"}}},
+                            {"name": "X-Trace", "in": "header", "required": True,
+                             "schema": {"type": "string", "minLength": 3}},
+                            {"name": "dryRun", "in": "query", "schema": {"type": "boolean"}},
+                        ],
+                        "requestBody": {
+                            "required": True,
+                            "content": {"application/json": {
+                                "schema": {"$ref": "#/components/schemas/Character"}}},
+                        },
+                        "responses": {
+                            "200": {"description": "OK", "content": {"application/json": {
+                                "schema": {"$ref": "#/components/schemas/Character"}}}},
+                            "4XX": {"description": "Client error"},
+                        },
+                    },
+                }
+            },
+            "components": {
+                "parameters": {"Id": {"name": "id", "in": "path", "required": True,
+                                      "schema": {"type": "integer", "minimum": 1}}},
+                "schemas": {"Character": {"type": "object", "required": ["name"],
+                                          "properties": {"name": {"type": "string"}}}},
+            },
+        })
+        self.compiler = SchemaCompiler(self.document)
+        self.entry = operation_index(self.document).by_id("updateCharacter")
+        self.validator = self.compiler.operation(self.entry)
+
+    def test_validators_are_cached_per_operation(self):
+        self.assertIs(self.compiler.operation(self.entry), self.validator)
+
+    def test_valid_request(self):
+        errors = self.validator.validate_request(
+            path_params={"id": "42"}, query={"tags": ["1", "2"], "dryRun": "true"},
+            headers={"x-trace": "abcd"}, body={"name": "Ann"},
+            media_type="application/json; charset=utf-8")
+        self.assertEqual(errors, [])
+
+    def test_invalid_request(self):
+        errors = self.validator.validate_request(
+            path_params={"id": "0"}, query={"tags": "1,x", "dryRun": "maybe"},
+            body={"name": 3})
+        self.assertEqual(errors, [
+            "path parameter 'id': 0 is less than the minimum of 1",
+            "query parameter 'tags': 'x' is not of type 'integer' at /1",
+            "header parameter 'X-Trace' is required",
+            "query parameter 'dryRun': 'maybe' is not of type 'boolean'",
+            "request body: 3 is not of type 'string' at /name",
+        ])
+        self.assertEqual(self.validator.validate_request(path_params={"id": "1"},
+                                                         headers={"X-Trace": "abc"}),
+                         ["request body is required"])
+        self.assertEqual(
+            self.validator.validate_request(path_params={"id": "1"}, headers={"X-Trace": "abc"},
+                                            body="<a/>", media_type="text/xml"),
+            ["request body: media type 'text/xml' is not allowed"])
+
+    def test_responses(self):
+        self.assertEqual(self.validator.validate_response(200, {"name": "Ann"}), [])
+        self.assertEqual(self.validator.validate_response(200, {}),
+                         ["response body: 'name' is a required property"])
+        self.assertEqual(self.validator.validate_response(404, {"anything": 1}), [])
+        self.assertEqual(self.validator.validate_response(500),
+                         ["response status 500 is not documented"])
+
+
+if __name__ == '__main__':
+    unittest.main()